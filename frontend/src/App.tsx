@@ -209,6 +209,8 @@ Try asking me things like:
   const [loading, setLoading] = React.useState(false);
   const messagesEndRef = React.useRef<HTMLDivElement>(null);
   const autoSentRef = React.useRef(false);
+  // Server-assigned chat session, so follow-up messages continue the conversation
+  const sessionIdRef = React.useRef<string | null>(null);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -238,24 +240,53 @@ Try asking me things like:
     setMessages(prev => [...prev, { role: 'user', content: messageText }]);
     setLoading(true);
 
+    // Append streamed text to the assistant message opened for this reply
+    const appendToReply = (text: string) => {
+      setMessages(prev => {
+        const last = prev[prev.length - 1];
+        return [...prev.slice(0, -1), { ...last, content: last.content + text }];
+      });
+    };
+
+    let replyOpened = false;
     try {
-      const response = await fetch('http://localhost:8000/api/chat', {
+      const response = await fetch('http://localhost:8000/api/chat/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message: messageText }),
+        body: JSON.stringify({ message: messageText, session_id: sessionIdRef.current }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error('Chat service unavailable');
       }
 
-      const data = await response.json();
-      setMessages(prev => [...prev, { role: 'assistant', content: data.response }]);
+      setMessages(prev => [...prev, { role: 'assistant', content: '' }]);
+      replyOpened = true;
+
+      // Server-sent events: "data:" chunks of {text}, then "done" or "error"
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop() ?? '';
+        for (const event of events) {
+          const lines = event.split('\n');
+          const type = lines.find(l => l.startsWith('event: '))?.slice(7) ?? 'message';
+          const data = lines.find(l => l.startsWith('data: '))?.slice(6);
+          if (type === 'error') throw new Error('Chat stream failed');
+          if (type === 'message' && data) appendToReply(JSON.parse(data).text);
+          if (type === 'done' && data) sessionIdRef.current = JSON.parse(data).session_id;
+        }
+      }
     } catch (error) {
-      setMessages(prev => [...prev, {
-        role: 'assistant',
-        content: 'Sorry, I encountered an error. Make sure the ANTHROPIC_API_KEY environment variable is set on the server.'
-      }]);
+      const content = 'Sorry, I encountered an error. Make sure the ANTHROPIC_API_KEY environment variable is set on the server.';
+      setMessages(prev => replyOpened
+        ? [...prev.slice(0, -1), { role: 'assistant', content }]
+        : [...prev, { role: 'assistant', content }]);
     } finally {
       setLoading(false);
     }
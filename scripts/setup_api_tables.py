@@ -147,6 +147,27 @@ def setup_tables():
     except sqlite3.OperationalError:
         pass  # Column already exists
 
+    try:
+        cursor.execute("""
+            ALTER TABLE review_items ADD COLUMN decision_action TEXT
+            GENERATED ALWAYS AS (json_extract(decision, '$.action')) VIRTUAL
+        """)
+        print("Added decision_action column")
+    except sqlite3.OperationalError:
+        pass  # Column already exists
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_review_items_campaign_action
+        ON review_items(campaign_id, decision_action) WHERE decision_action IS NOT NULL
+    """)
+
+    # Decision counters, kept up to date by triggers the API creates
+    for column in ("certified_count", "revoked_count"):
+        try:
+            cursor.execute(f"ALTER TABLE campaigns ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+            print(f"Added {column} column")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
     # Insert default proximity weights
     cursor.execute("SELECT COUNT(*) FROM proximity_weights")
     if cursor.fetchone()[0] == 0:
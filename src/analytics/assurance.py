@@ -15,10 +15,13 @@ Author: Chiradeep Chhaya
 
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 from enum import Enum
 import numpy as np
 
+if TYPE_CHECKING:
+    from .clustering import ConsensusResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -98,6 +101,68 @@ class AssuranceScore:
     explanations: List[str] = field(default_factory=list)
 
 
+# Classification labels in code order for AssuranceArrays.classification
+CLASSIFICATIONS = ("high_assurance", "medium_assurance", "low_assurance")
+
+
+@dataclass
+class AssuranceArrays:
+    """
+    Struct-of-arrays view of a Dict[str, AssuranceScore], one row per grant.
+
+    Rows follow the dict's order. Employee IDs are interned: employee_idx
+    indexes into employee_ids. classification holds an index into
+    CLASSIFICATIONS (-1 for anything else).
+    """
+    grant_ids: List[str]
+    employee_ids: List[str]
+    employee_idx: np.ndarray  # int32
+    overall_score: np.ndarray  # float32
+    classification: np.ndarray  # int8
+    auto_certify_eligible: np.ndarray  # bool
+    _employee_positions: Optional[Dict[str, int]] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_scores(cls, scores: Dict[str, AssuranceScore]) -> "AssuranceArrays":
+        """Build the arrays in one pass over the score objects."""
+        n = len(scores)
+        employee_idx = np.empty(n, dtype=np.int32)
+        overall_score = np.empty(n, dtype=np.float32)
+        classification = np.empty(n, dtype=np.int8)
+        auto_certify_eligible = np.empty(n, dtype=bool)
+
+        codes = {label: i for i, label in enumerate(CLASSIFICATIONS)}
+        positions: Dict[str, int] = {}
+        for i, score in enumerate(scores.values()):
+            employee_idx[i] = positions.setdefault(score.employee_id, len(positions))
+            overall_score[i] = score.overall_score
+            classification[i] = codes.get(score.classification, -1)
+            auto_certify_eligible[i] = score.auto_certify_eligible
+
+        arrays = cls(
+            grant_ids=list(scores),
+            employee_ids=list(positions),
+            employee_idx=employee_idx,
+            overall_score=overall_score,
+            classification=classification,
+            auto_certify_eligible=auto_certify_eligible
+        )
+        arrays._employee_positions = positions
+        return arrays
+
+    def employee_position(self, employee_id: str) -> Optional[int]:
+        """Interned index of employee_id, or None if it has no grants."""
+        if self._employee_positions is None:
+            self._employee_positions = {e: i for i, e in enumerate(self.employee_ids)}
+        return self._employee_positions.get(employee_id)
+
+    def classification_counts(self) -> Dict[str, int]:
+        """Number of grants per classification label."""
+        known = self.classification[self.classification >= 0]
+        counts = np.bincount(known, minlength=len(CLASSIFICATIONS))
+        return {label: int(counts[i]) for i, label in enumerate(CLASSIFICATIONS)}
+
+
 @dataclass
 class AssuranceConfig:
     """Configuration for assurance scoring."""
@@ -167,6 +232,19 @@ class AssuranceScorer:
 
         return typicality, peers_with_access, total_peers
 
+    # Usage buckets past the "active" window, indexed by searchsorted over
+    # (active, occasional, stale) day thresholds; bucket 0 is graded by 30d count
+    USAGE_BUCKET_FACTORS = np.array([np.nan, 0.6, 0.3, 0.1])
+    USAGE_BUCKET_LABELS = np.array(["active", "occasional", "stale", "dormant"])
+
+    def _usage_thresholds(self) -> np.ndarray:
+        """Get the (active, occasional, stale) day thresholds as a sorted array."""
+        return np.array([
+            self.config.active_days_threshold,
+            self.config.occasional_days_threshold,
+            self.config.stale_days_threshold
+        ])
+
     def calculate_usage_factor(self, usage: UsagePattern) -> Tuple[float, str]:
         """
         Calculate usage factor and classify usage pattern.
@@ -174,35 +252,44 @@ class AssuranceScorer:
         Returns:
             Tuple of (usage_factor, usage_pattern_label)
         """
-        # Never used
-        if usage.total_access_count == 0:
-            return 0.1, "dormant"
-
-        # Check recency
-        if usage.last_accessed_days_ago is None:
-            return 0.1, "dormant"
-
-        if usage.last_accessed_days_ago <= self.config.active_days_threshold:
-            # Active: used in last 30 days
-            # Score based on frequency
-            if usage.access_count_30d >= 10:
-                return 1.0, "active"
-            elif usage.access_count_30d >= 3:
-                return 0.9, "active"
-            else:
-                return 0.8, "active"
+        factors, labels = self.calculate_usage_factors(
+            np.array([usage.total_access_count]),
+            np.array([usage.last_accessed_days_ago], dtype=float),
+            np.array([usage.access_count_30d])
+        )
+        return float(factors[0]), str(labels[0])
 
-        elif usage.last_accessed_days_ago <= self.config.occasional_days_threshold:
-            # Occasional: used in last 90 days
-            return 0.6, "occasional"
+    def calculate_usage_factors(
+        self,
+        total_access_count: np.ndarray,
+        last_accessed_days_ago: np.ndarray,
+        access_count_30d: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized calculate_usage_factor() over many grants.
 
-        elif usage.last_accessed_days_ago <= self.config.stale_days_threshold:
-            # Stale: used in last year
-            return 0.3, "stale"
+        Args:
+            total_access_count: Lifetime access counts
+            last_accessed_days_ago: Days since last use (NaN = never used)
+            access_count_30d: Access counts over the last 30 days
 
-        else:
-            # Dormant: not used in over a year
-            return 0.1, "dormant"
+        Returns:
+            Tuple of (usage_factor array, usage_pattern label array)
+        """
+        # Never used (or no recency data) sorts past every threshold = dormant
+        never_used = (total_access_count == 0) | np.isnan(last_accessed_days_ago)
+        days = np.where(never_used, np.inf, last_accessed_days_ago)
+
+        # Thresholds are inclusive ("used within N days"), hence side='left'
+        bucket = np.searchsorted(self._usage_thresholds(), days, side="left")
+
+        # Active: score based on frequency
+        active_factor = np.select(
+            [access_count_30d >= 10, access_count_30d >= 3], [1.0, 0.9], default=0.8
+        )
+        factors = np.where(bucket == 0, active_factor, self.USAGE_BUCKET_FACTORS[bucket])
+
+        return factors, self.USAGE_BUCKET_LABELS[bucket]
 
     def calculate_score(
         self,
@@ -213,7 +300,9 @@ class AssuranceScorer:
         resource_name: str,
         peer_ids: List[str],
         access_by_employee: Dict[str, set],
-        usage: UsagePattern
+        usage: UsagePattern,
+        peer_context: Optional[Tuple[float, int, int]] = None,
+        usage_context: Optional[Tuple[float, str]] = None
     ) -> AssuranceScore:
         """
         Calculate complete assurance score for an access grant.
@@ -227,16 +316,26 @@ class AssuranceScorer:
             peer_ids: List of peer employee IDs
             access_by_employee: Mapping of employee_id to set of resource_ids
             usage: Usage pattern data
+            peer_context: Optional precomputed (typicality, peers_with_access, total_peers);
+                skips calculate_typicality() when provided
+            usage_context: Optional precomputed (usage_factor, usage_pattern);
+                skips calculate_usage_factor() when provided
 
         Returns:
             Complete AssuranceScore object
         """
         # Calculate components
-        typicality, peers_with, total_peers = self.calculate_typicality(
-            employee_id, resource_id, peer_ids, access_by_employee
-        )
+        if peer_context is not None:
+            typicality, peers_with, total_peers = peer_context
+        else:
+            typicality, peers_with, total_peers = self.calculate_typicality(
+                employee_id, resource_id, peer_ids, access_by_employee
+            )
 
-        usage_factor, usage_pattern = self.calculate_usage_factor(usage)
+        if usage_context is not None:
+            usage_factor, usage_pattern = usage_context
+        else:
+            usage_factor, usage_pattern = self.calculate_usage_factor(usage)
 
         # Get sensitivity ceiling
         sensitivity_ceiling = self.config.sensitivity.get_ceiling(resource_sensitivity)
@@ -371,12 +470,116 @@ class AssuranceScorer:
 
         return explanations
 
+    @staticmethod
+    def _get_peer_idx(
+        consensus: "ConsensusResult",
+        emp_id_to_idx: Dict[str, int]
+    ) -> Optional[np.ndarray]:
+        """
+        Get the int32 peer index array for a consensus result.
+
+        Results produced by analyze_consensus() already carry peer_idx; for
+        results built elsewhere it is derived from peer_ids once and cached
+        on the consensus object.
+        """
+        peer_idx = getattr(consensus, "peer_idx", None)
+        if peer_idx is not None and len(peer_idx) == len(consensus.peer_ids):
+            return peer_idx
+
+        peer_idx = np.fromiter(
+            (emp_id_to_idx[p] for p in consensus.peer_ids if p in emp_id_to_idx),
+            dtype=np.int32
+        )
+        if len(peer_idx) == len(consensus.peer_ids):
+            consensus.peer_idx = peer_idx
+            return peer_idx
+        # Some peers fall outside the scored employee set; use the ID path
+        return None
+
+    @staticmethod
+    def _count_peers_with_access(
+        access_grants: List[Dict],
+        access_by_employee: Dict[str, set],
+        emp_id_to_idx: Dict[str, int],
+        peer_idx_by_employee: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Count, for every grant, how many of the grantee's peers hold the same resource.
+
+        Employees whose peer set plus themselves is identical (e.g. members of
+        a cluster all strategies agree on) form one group. Grants are sorted
+        by (group, resource) so each group's per-resource holder counts are
+        computed once from a sparse employee x resource matrix and reused for
+        all of the group's grants.
+
+        Returns:
+            Array aligned with access_grants; -1 where no peer index is available
+        """
+        from scipy import sparse
+
+        peers_with = np.full(len(access_grants), -1, dtype=np.int64)
+        if not peer_idx_by_employee or not access_grants:
+            return peers_with
+
+        n_employees = len(emp_id_to_idx)
+        res_to_idx: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for emp_id, res_ids in access_by_employee.items():
+            idx = emp_id_to_idx.get(emp_id)
+            if idx is None:
+                continue
+            for res_id in res_ids:
+                rows.append(idx)
+                cols.append(res_to_idx.setdefault(res_id, len(res_to_idx)))
+        access_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(n_employees, len(res_to_idx))
+        )
+
+        # Group employees by their peer set including themselves
+        group_of_employee = np.full(n_employees + 1, -1, dtype=np.int64)  # last slot: unindexed
+        group_ids: Dict[bytes, int] = {}
+        group_members: List[np.ndarray] = []
+        for emp_id, peer_idx in peer_idx_by_employee.items():
+            idx = emp_id_to_idx[emp_id]
+            members = np.sort(np.append(peer_idx, idx).astype(np.int32))
+            key = members.tobytes()
+            if key not in group_ids:
+                group_ids[key] = len(group_members)
+                group_members.append(members)
+            group_of_employee[idx] = group_ids[key]
+
+        grant_emp = np.fromiter(
+            (emp_id_to_idx.get(g["employee_id"], n_employees) for g in access_grants),
+            dtype=np.int64, count=len(access_grants)
+        )
+        grant_res = np.fromiter(
+            (res_to_idx.get(g["resource_id"], 0) for g in access_grants),
+            dtype=np.int64, count=len(access_grants)
+        )
+        grant_group = group_of_employee[grant_emp]
+
+        order = np.lexsort((grant_res, grant_group))
+        boundaries = np.flatnonzero(np.diff(grant_group[order])) + 1
+        for run in np.split(order, boundaries):
+            group_id = grant_group[run[0]]
+            if group_id < 0:
+                continue
+            holder_counts = np.asarray(
+                access_matrix[group_members[group_id]].sum(axis=0)
+            ).ravel()
+            # The grantee is in its own group and holds the resource
+            peers_with[run] = holder_counts[grant_res[run]] - 1
+
+        return peers_with
+
     def score_all_grants(
         self,
         access_grants: List[Dict],
         resources: Dict[str, Dict],
         consensus_results: Dict[str, "ConsensusResult"],
-        activity_summaries: Dict[str, Dict]
+        activity_summaries: Dict[Tuple[int, int], Dict]
     ) -> Dict[str, AssuranceScore]:
         """
         Score all access grants.
@@ -385,7 +588,8 @@ class AssuranceScorer:
             access_grants: List of access grant records
             resources: Dictionary mapping resource_id to resource record
             consensus_results: Dictionary mapping employee_id to ConsensusResult (from clustering)
-            activity_summaries: Dictionary mapping (employee_id, resource_id) to activity summary
+            activity_summaries: Dictionary mapping (employee_idx, resource_idx) to activity
+                summary, matching the interned ints on each grant record
 
         Returns:
             Dictionary mapping grant_id to AssuranceScore
@@ -401,8 +605,33 @@ class AssuranceScorer:
                 access_by_employee[emp_id] = set()
             access_by_employee[emp_id].add(res_id)
 
+        # Canonical employee index: consensus results are keyed in the same
+        # order as the employee_ids that produced ConsensusResult.peer_idx
+        emp_id_to_idx = {emp_id: i for i, emp_id in enumerate(consensus_results)}
+
+        peer_idx_by_employee: Dict[str, np.ndarray] = {}
+        for emp_id, emp_consensus in consensus_results.items():
+            peer_idx = self._get_peer_idx(emp_consensus, emp_id_to_idx)
+            if peer_idx is not None and len(peer_idx) > 0:
+                peer_idx_by_employee[emp_id] = peer_idx
+
+        peers_with_by_grant = self._count_peers_with_access(
+            access_grants, access_by_employee, emp_id_to_idx, peer_idx_by_employee
+        )
+
+        # Usage factors for all grants in one vectorized bucket lookup
+        grant_activity = [
+            activity_summaries.get((g["employee_idx"], g["resource_idx"]), {})
+            for g in access_grants
+        ]
+        usage_factors, usage_labels = self.calculate_usage_factors(
+            np.array([a.get("total_access_count", 0) or 0 for a in grant_activity]),
+            np.array([a.get("days_since_last_use") for a in grant_activity], dtype=float),
+            np.array([a.get("access_count_30d", 0) or 0 for a in grant_activity])
+        )
+
         scores = {}
-        for grant in access_grants:
+        for grant_pos, grant in enumerate(access_grants):
             grant_id = grant["id"]
             emp_id = grant["employee_id"]
             res_id = grant["resource_id"]
@@ -419,9 +648,14 @@ class AssuranceScorer:
             else:
                 peer_ids = []
 
+            peer_context = None
+            peers_with = int(peers_with_by_grant[grant_pos])
+            if peers_with >= 0:
+                total_peers = len(peer_idx_by_employee[emp_id])
+                peer_context = (peers_with / total_peers, peers_with, total_peers)
+
             # Get usage info
-            activity_key = f"{emp_id}:{res_id}"
-            activity = activity_summaries.get(activity_key, {})
+            activity = grant_activity[grant_pos]
 
             # Calculate days since last use
             last_accessed = activity.get("last_accessed")
@@ -444,7 +678,9 @@ class AssuranceScorer:
                 resource_name=resource_name,
                 peer_ids=peer_ids,
                 access_by_employee=access_by_employee,
-                usage=usage
+                usage=usage,
+                peer_context=peer_context,
+                usage_context=(float(usage_factors[grant_pos]), str(usage_labels[grant_pos]))
             )
 
             scores[grant_id] = score
@@ -13,14 +13,26 @@ When algorithms disagree, cases are flagged for human review.
 Author: Chiradeep Chhaya
 """
 
+import hashlib
 import logging
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Set
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Set
 from enum import Enum
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Rows gathered per silhouette pass; bounds the scratch buffer to
+# SILHOUETTE_BAND_ROWS x n regardless of how many employees are clustered
+SILHOUETTE_BAND_ROWS = 256
+
 
 class ClusteringStrategy(Enum):
     """Available clustering strategies."""
@@ -40,6 +52,77 @@ class ClusterAssignment:
     is_outlier: bool = False
 
 
+@dataclass
+class StrategyAssignments(Mapping):
+    """
+    All cluster assignments from one strategy, stored as parallel arrays.
+
+    Also behaves as a read-only Mapping[str, ClusterAssignment] (objects are
+    built on access) so callers written against the old per-employee dict
+    keep working; use as_dict() for a materialized copy.
+    """
+    strategy: ClusteringStrategy
+    employee_ids: List[str]
+    cluster_id: np.ndarray  # int32, -1 for outliers
+    confidence: np.ndarray  # float32
+    is_outlier: np.ndarray  # bool
+    _positions: Optional[Dict[str, int]] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_labels(
+        cls,
+        strategy: ClusteringStrategy,
+        employee_ids: List[str],
+        labels: np.ndarray,
+        confidence: np.ndarray
+    ) -> "StrategyAssignments":
+        """Build from a per-employee label array; label -1 marks an outlier."""
+        cluster_id = np.asarray(labels, dtype=np.int32)
+        return cls(
+            strategy=strategy,
+            employee_ids=list(employee_ids),
+            cluster_id=cluster_id,
+            confidence=np.asarray(confidence, dtype=np.float32),
+            is_outlier=cluster_id == -1
+        )
+
+    @classmethod
+    def empty(cls, strategy: ClusteringStrategy) -> "StrategyAssignments":
+        """Result for a strategy that produced no assignments."""
+        return cls.from_labels(strategy, [], np.empty(0), np.empty(0))
+
+    def position(self, employee_id: str) -> Optional[int]:
+        """Row of employee_id in the arrays, or None if absent."""
+        if self._positions is None:
+            self._positions = {emp_id: i for i, emp_id in enumerate(self.employee_ids)}
+        return self._positions.get(employee_id)
+
+    def __getitem__(self, employee_id: str) -> ClusterAssignment:
+        i = self.position(employee_id)
+        if i is None:
+            raise KeyError(employee_id)
+        return ClusterAssignment(
+            employee_id=employee_id,
+            strategy=self.strategy,
+            cluster_id=int(self.cluster_id[i]),
+            confidence=float(self.confidence[i]),
+            is_outlier=bool(self.is_outlier[i])
+        )
+
+    def __contains__(self, employee_id: object) -> bool:
+        return isinstance(employee_id, str) and self.position(employee_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.employee_ids)
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+    def as_dict(self) -> Dict[str, ClusterAssignment]:
+        """Materialize the old Dict[str, ClusterAssignment] mapping."""
+        return {emp_id: self[emp_id] for emp_id in self.employee_ids}
+
+
 @dataclass
 class ConsensusResult:
     """Result of multi-strategy clustering with consensus analysis."""
@@ -56,6 +139,8 @@ class ConsensusResult:
 
     # Peer information
     peer_ids: List[str] = field(default_factory=list)
+    # Same peers as int32 indices into the employee_ids passed to analyze_consensus()
+    peer_idx: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
     peer_count: int = 0
 
     # Flags
@@ -70,6 +155,8 @@ class ClusteringConfig:
     kmeans_n_clusters: int = 0  # 0 = auto-determine
     kmeans_max_clusters: int = 50
     kmeans_min_cluster_size: int = 5
+    kmeans_k_selection: str = "silhouette"  # silhouette, or knee (inertia elbow, silhouette on knee +/- 1; may pick another k)
+    kmeans_exact_silhouette: bool = True  # False = centroid-margin proxy in auto-k (faster; may pick another k)
 
     # Hierarchical config
     hierarchical_n_clusters: int = 0  # 0 = auto-determine
@@ -82,11 +169,239 @@ class ClusteringConfig:
     # Graph community config
     graph_resolution: float = 1.0  # Louvain resolution parameter
     graph_min_edge_weight: float = 0.2  # Minimum proximity to create edge
+    graph_min_component_size: int = 10  # Smaller connected components skip Louvain
 
     # Consensus config
     consensus_threshold: float = 0.7  # Min agreement to avoid human review
     min_strategies_for_consensus: int = 3
 
+    # Execution config
+    parallel_strategies: bool = True  # Run strategies in a process pool when more than one
+
+
+def _approx_silhouette(distances_to_centroids: np.ndarray, labels: np.ndarray) -> float:
+    """
+    Centroid-margin approximation of the silhouette score.
+
+    Uses each point's distance to its own centroid (a) and to the nearest
+    other centroid (b) instead of mean pairwise distances, so the cost is
+    O(n*k) from kmeans.transform() output rather than O(n^2).
+    """
+    n = len(labels)
+    rows = np.arange(n)
+    a = distances_to_centroids[rows, labels]
+    others = distances_to_centroids.copy()
+    others[rows, labels] = np.inf
+    b = others.min(axis=1)
+    denom = np.maximum(a, b)
+    scores = np.divide(b - a, denom, out=np.zeros(n), where=denom > 0)
+    return float(scores.mean())
+
+
+class _SilhouettePrecompute:
+    """
+    Reusable scratch space for silhouette scoring against one distance matrix.
+
+    Silhouette is computed from per-cluster row sums. The matrix is
+    symmetric, so every point's summed distance to cluster c is the column
+    sum over c's member rows: one pass over the members of each cluster
+    yields all of them in O(n^2) regardless of k, and a and b then come
+    from those sums in O(n*k). Member rows are gathered SILHOUETTE_BAND_ROWS
+    at a time into one reused buffer, and the sums buffer is sized for
+    max_k once, so every k of every auto-k sweep shares them. Assumes a
+    symmetric matrix with a zero diagonal and labels in 0..k-1.
+    """
+
+    def __init__(self, distance_matrix: np.ndarray, max_k: int):
+        n = distance_matrix.shape[0]
+        self.distance_matrix = distance_matrix
+        self.max_k = max_k
+        self._band = np.empty((min(n, SILHOUETTE_BAND_ROWS), n), dtype=distance_matrix.dtype)
+        self._cluster_sums = np.empty(max_k * n, dtype=np.float64)
+
+    def score(self, labels: np.ndarray) -> float:
+        """Mean silhouette of labels against the stored distance matrix."""
+        n = len(labels)
+        rows = np.arange(n)
+        n_clusters = int(labels.max()) + 1
+        sizes = np.bincount(labels, minlength=n_clusters)
+
+        # Row c holds every point's summed distance to cluster c
+        sums_by_cluster = self._cluster_sums[:n_clusters * n].reshape(n_clusters, n)
+        sums_by_cluster.fill(0)
+        members_by_cluster = np.split(np.argsort(labels, kind="stable"), np.cumsum(sizes)[:-1])
+        for c, members in enumerate(members_by_cluster):
+            for m0 in range(0, len(members), len(self._band)):
+                chunk = members[m0:m0 + len(self._band)]
+                band = self._band[:len(chunk)]
+                np.take(self.distance_matrix, chunk, axis=0, out=band)
+                sums_by_cluster[c] += band.sum(axis=0, dtype=np.float64)
+        cluster_sums = sums_by_cluster.T
+
+        cluster_sizes = sizes.astype(np.float64)
+        own_size = cluster_sizes[labels]
+
+        a = cluster_sums[rows, labels] / np.maximum(own_size - 1, 1)
+        mean_to_cluster = cluster_sums / np.maximum(cluster_sizes, 1)
+        mean_to_cluster[:, cluster_sizes == 0] = np.inf
+        mean_to_cluster[rows, labels] = np.inf
+        b = mean_to_cluster.min(axis=1)
+
+        denom = np.maximum(a, b)
+        scores = np.divide(b - a, denom, out=np.zeros(n), where=denom > 0)
+        # Singleton clusters score 0 by convention
+        scores[own_size == 1] = 0.0
+        return float(scores.mean())
+
+
+def _cluster_mean_silhouette(distance_matrix: np.ndarray, labels: np.ndarray) -> float:
+    """One-off silhouette score; see _SilhouettePrecompute."""
+    return _SilhouettePrecompute(distance_matrix, int(labels.max()) + 1).score(labels)
+
+
+def _mean_proximity_to_cluster(proximity_matrix: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """
+    Average proximity of each point to the other members of its cluster.
+
+    Per-cluster row sums come from one proximity_matrix @ membership product
+    instead of a Python gather per point. Points alone in their cluster get
+    1.0; outliers (label -1) get 0.0.
+    """
+    n = len(labels)
+    rows = np.arange(n)
+    clustered = labels >= 0
+    confidences = np.zeros(n)
+    if not clustered.any():
+        return confidences
+
+    n_clusters = int(labels.max()) + 1
+    # Match the matrix dtype so the product doesn't upcast a float32 (possibly
+    # memory-mapped) matrix into a float64 n x n copy
+    membership = np.zeros((n, n_clusters), dtype=proximity_matrix.dtype)
+    membership[rows[clustered], labels[clustered]] = 1
+    cluster_sums = proximity_matrix @ membership
+    cluster_sizes = np.bincount(labels[clustered], minlength=n_clusters)
+
+    own_labels = labels[clustered]
+    others = cluster_sizes[own_labels] - 1
+    own_sums = cluster_sums[rows[clustered], own_labels] - np.diagonal(proximity_matrix)[clustered]
+    confidences[clustered] = np.divide(
+        own_sums, others, out=np.ones(len(own_labels)), where=others > 0
+    )
+    return confidences
+
+
+def _peer_masks(labels: np.ndarray, i: int) -> np.ndarray:
+    """
+    Same-cluster masks for point i under each strategy row of labels.
+
+    Self is excluded, and a row is all-False when i is an outlier (-1) there.
+    """
+    own = labels[:, i:i + 1]
+    masks = (labels == own) & (own >= 0)
+    masks[:, i] = False
+    return masks
+
+
+def _consensus_scores(label_matrix: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """
+    Mean pairwise Jaccard similarity of peer sets for every employee at once.
+
+    For a strategy pair, an employee's peer sets are "same cluster, minus
+    self", so |A| and |A & B| come from cluster sizes and the joint
+    (cluster, cluster) contingency counts; no per-employee masks are needed.
+    Pairs where both peer sets are empty are skipped. Employees seen by
+    fewer than two strategies score 1.0; those whose every pair was skipped
+    score 0.0.
+    """
+    n_strategies, n = label_matrix.shape
+    valid = present & (label_matrix >= 0)
+    peer_sizes = np.zeros((n_strategies, n), dtype=np.int64)
+    for s in range(n_strategies):
+        labels = label_matrix[s]
+        sizes = np.bincount(labels[valid[s]], minlength=int(labels.max()) + 1)
+        peer_sizes[s, valid[s]] = sizes[labels[valid[s]]] - 1
+
+    total = np.zeros(n)
+    n_pairs = np.zeros(n, dtype=np.int64)
+    for s1 in range(n_strategies):
+        for s2 in range(s1 + 1, n_strategies):
+            both = valid[s1] & valid[s2]
+            n_other = int(label_matrix[s2].max()) + 1
+            joint_key = label_matrix[s1][both].astype(np.int64) * n_other + label_matrix[s2][both]
+            joint = np.bincount(joint_key)
+            intersection = np.zeros(n, dtype=np.int64)
+            intersection[both] = joint[joint_key] - 1
+
+            union = peer_sizes[s1] + peer_sizes[s2] - intersection
+            counted = present[s1] & present[s2] & (union > 0)
+            total += np.divide(intersection, union, out=np.zeros(n), where=counted)
+            n_pairs += counted
+
+    n_present = present.sum(axis=0)
+    scores = np.divide(total, n_pairs, out=np.zeros(n), where=n_pairs > 0)
+    scores[n_present < 2] = 1.0  # Single strategy = full consensus
+    return scores
+
+
+# Clusterer of a pool worker process, kept between tasks (while the config
+# is unchanged) so its distance buffer, silhouette scratch and k-sweep cache
+# carry over from one run to the next
+_worker_clusterer: Optional["MultiStrategyClusterer"] = None
+
+
+def _run_strategy_in_worker(
+    shm_name: str,
+    shape: Tuple[int, ...],
+    dtype: str,
+    employee_ids: List[str],
+    strategy: ClusteringStrategy,
+    config: ClusteringConfig
+) -> StrategyAssignments:
+    """
+    Process-pool entry point: run one strategy on a shared-memory proximity matrix.
+
+    The matrix is attached read-only in place, so workers never copy the
+    n x n array through pickling.
+    """
+    global _worker_clusterer
+    if _worker_clusterer is None or _worker_clusterer.config != config:
+        _worker_clusterer = MultiStrategyClusterer(config)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        proximity_matrix = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        proximity_matrix.flags.writeable = False
+        result = _worker_clusterer._run_strategy(
+            strategy, proximity_matrix, employee_ids
+        )
+        del proximity_matrix
+        return result
+    finally:
+        shm.close()
+
+
+def _inertia_knee(ks: np.ndarray, inertias: np.ndarray) -> int:
+    """
+    Knee of a decreasing, convex inertia-vs-k curve (Kneedle without smoothing).
+
+    Both axes are normalized to [0, 1]; the knee is the k whose point lies
+    farthest below the straight line joining the first and last points.
+    """
+    if len(ks) < 3:
+        return int(ks[0])
+    x = (ks - ks[0]) / (ks[-1] - ks[0])
+    span = inertias.max() - inertias.min()
+    y = (inertias - inertias.min()) / span if span > 0 else np.zeros_like(inertias)
+    return int(ks[np.argmax((1 - x) - y)])
+
+
+def _label_centroids(X: np.ndarray, labels: np.ndarray, n_clusters: int) -> np.ndarray:
+    """Mean row of X per label, shaped (n_clusters, n_features)."""
+    membership = np.zeros((n_clusters, len(labels)), dtype=X.dtype)
+    membership[labels, np.arange(len(labels))] = 1
+    counts = np.maximum(membership.sum(axis=1, keepdims=True), 1)
+    return (membership @ X) / counts
+
 
 class MultiStrategyClusterer:
     """
@@ -97,12 +412,69 @@ class MultiStrategyClusterer:
     def __init__(self, config: Optional[ClusteringConfig] = None):
         self.config = config or ClusteringConfig()
         self._results_cache: Dict[str, ConsensusResult] = {}
+        # strategy -> (assignments it was built from, cluster_id -> member ids)
+        self._cluster_index: Dict[
+            ClusteringStrategy, Tuple[StrategyAssignments, Dict[int, List[str]]]
+        ] = {}
+        # Reused (1 - proximity) buffer so strategies don't each allocate an n x n copy
+        self._dist_buf: Optional[np.ndarray] = None
+        self._silhouette: Optional[_SilhouettePrecompute] = None
+        # Auto-k sweep results for the proximity matrix with fingerprint _k_sweep_fp
+        self._k_sweep_fp: Optional[str] = None
+        self._k_sweep_cache: Dict[tuple, Any] = {}
+        # Single-process pools for parallel runs, started on first use and
+        # kept for the clusterer's lifetime; a strategy always runs in the
+        # same one, so that worker's caches serve its next run
+        self._pools: List[ProcessPoolExecutor] = []
+
+    def _get_distance(self, proximity_matrix: np.ndarray) -> np.ndarray:
+        """
+        Get 1 - proximity as a distance matrix, written into a persistent buffer.
+
+        The buffer is only valid until the next call; callers must not hold
+        on to it across strategies.
+        """
+        if (
+            self._dist_buf is None
+            or self._dist_buf.shape != proximity_matrix.shape
+            or self._dist_buf.dtype != proximity_matrix.dtype
+        ):
+            self._dist_buf = np.empty_like(proximity_matrix)
+        np.subtract(1, proximity_matrix, out=self._dist_buf)
+        return self._dist_buf
+
+    def _get_k_sweep_cache(self, proximity_matrix: np.ndarray) -> Optional[Dict[tuple, Any]]:
+        """
+        Get the per-(strategy, k) auto-k sweep cache for this proximity matrix.
+
+        Entries are keyed on a content hash of the matrix, so the cache is
+        dropped as soon as a different matrix comes in. Returns None for
+        inputs that can't be hashed cheaply (sparse matrices).
+        """
+        if not isinstance(proximity_matrix, np.ndarray):
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{proximity_matrix.shape}{proximity_matrix.dtype.str}".encode())
+        digest.update(np.ascontiguousarray(proximity_matrix).data)
+        fingerprint = digest.hexdigest()
+        if fingerprint != self._k_sweep_fp:
+            self._k_sweep_fp = fingerprint
+            self._k_sweep_cache = {}
+        return self._k_sweep_cache
+
+    def _get_silhouette(self, distance_matrix: np.ndarray, max_k: int) -> _SilhouettePrecompute:
+        """Get silhouette scratch space for distance_matrix, shared across strategies."""
+        pre = self._silhouette
+        if pre is None or pre.distance_matrix is not distance_matrix or pre.max_k < max_k:
+            pre = _SilhouettePrecompute(distance_matrix, max_k)
+            self._silhouette = pre
+        return pre
 
     def cluster_kmeans(
         self,
         proximity_matrix: np.ndarray,
         employee_ids: List[str]
-    ) -> Dict[str, ClusterAssignment]:
+    ) -> StrategyAssignments:
         """
         Perform K-means clustering.
 
@@ -111,81 +483,135 @@ class MultiStrategyClusterer:
             employee_ids: List of employee IDs (same order as matrix)
 
         Returns:
-            Dictionary mapping employee_id to ClusterAssignment
+            StrategyAssignments with one row per employee
         """
         from sklearn.cluster import KMeans
-        from sklearn.metrics import silhouette_score
 
         n_samples = len(employee_ids)
 
         # Convert proximity to distance (1 - proximity)
-        distance_matrix = 1 - proximity_matrix
+        distance_matrix = self._get_distance(proximity_matrix)
 
-        # Auto-determine number of clusters using silhouette score
+        # Auto-determine number of clusters: silhouette (default) or inertia knee
+        best_model = None
+        best_labels = None
         if self.config.kmeans_n_clusters == 0:
             max_k = min(self.config.kmeans_max_clusters, n_samples // self.config.kmeans_min_cluster_size)
             max_k = max(2, max_k)
             min_k = 2
 
-            best_k = min_k
-            best_score = -1
-
+            use_knee = self.config.kmeans_k_selection == "knee"
+            silhouette = (
+                self._get_silhouette(distance_matrix, max_k)
+                if use_knee or self.config.kmeans_exact_silhouette else None
+            )
+            labels_by_k: Dict[int, np.ndarray] = {}
+            inertia_by_k: Dict[int, float] = {}
+            score_by_k: Dict[int, float] = {}
+            models_by_k = {}
+
+            # Every k gets the n_init=10 k-means++ restarts (Elkan); per-k
+            # results for an unchanged matrix come from the sweep cache.
+            sweep_cache = self._get_k_sweep_cache(proximity_matrix)
             for k in range(min_k, max_k + 1):
                 try:
-                    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-                    labels = kmeans.fit_predict(distance_matrix)
-                    if len(set(labels)) > 1:
-                        score = silhouette_score(distance_matrix, labels, metric='precomputed')
-                        if score > best_score:
-                            best_score = score
-                            best_k = k
+                    cache_key = (
+                        ClusteringStrategy.KMEANS, k,
+                        self.config.kmeans_k_selection, self.config.kmeans_exact_silhouette
+                    )
+                    cached = sweep_cache.get(cache_key) if sweep_cache is not None else None
+                    if cached is not None:
+                        labels, score, inertia = cached
+                    else:
+                        kmeans = KMeans(n_clusters=k, algorithm='elkan', random_state=42, n_init=10)
+                        kmeans.fit(distance_matrix)
+                        labels = kmeans.labels_
+                        inertia = float(kmeans.inertia_)
+                        score = None
+                        if not use_knee and len(set(labels)) > 1:
+                            if silhouette is not None:
+                                score = silhouette.score(labels)
+                            else:
+                                score = _approx_silhouette(kmeans.transform(distance_matrix), labels)
+                        if sweep_cache is not None:
+                            sweep_cache[cache_key] = (labels, score, inertia)
+                        models_by_k[k] = kmeans
+                    labels_by_k[k] = labels
+                    inertia_by_k[k] = inertia
+                    if score is not None:
+                        score_by_k[k] = score
                 except Exception as e:
                     logger.warning(f"K-means with k={k} failed: {e}")
                     continue
 
-            n_clusters = best_k
+            if silhouette is not None and use_knee and labels_by_k:
+                # Validate the knee against its neighbours with the exact silhouette
+                ks = sorted(inertia_by_k)
+                knee = _inertia_knee(np.array(ks), np.array([inertia_by_k[k] for k in ks]))
+                for k in (knee - 1, knee, knee + 1):
+                    if k in labels_by_k and len(set(labels_by_k[k])) > 1:
+                        score_by_k[k] = silhouette.score(labels_by_k[k])
+
+            if score_by_k:
+                # First k wins ties, as in the original ascending sweep
+                n_clusters = max(score_by_k, key=lambda k: (score_by_k[k], -k))
+                best_score = score_by_k[n_clusters]
+                best_labels = labels_by_k[n_clusters]
+                best_model = models_by_k.get(n_clusters)
+            else:
+                n_clusters, best_score = min_k, -1
             logger.info(f"K-means auto-selected k={n_clusters} (silhouette={best_score:.3f})")
         else:
             n_clusters = self.config.kmeans_n_clusters
 
-        # Fit final model
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(distance_matrix)
+        # Fit final model (reuse the sweep's fit for the selected k)
+        kmeans = best_model
+        if kmeans is None and best_labels is not None:
+            # Selected k's model wasn't kept (sweep cache hit): one Lloyd pass
+            # from its label centroids reproduces the partition
+            init = _label_centroids(distance_matrix, best_labels, n_clusters)
+            kmeans = KMeans(n_clusters=n_clusters, algorithm='elkan', random_state=42, n_init=1, init=init)
+            kmeans.fit(distance_matrix)
+        elif kmeans is None:
+            kmeans = KMeans(n_clusters=n_clusters, algorithm='elkan', random_state=42, n_init=10)
+            kmeans.fit(distance_matrix)
+        labels = kmeans.labels_
 
         # Calculate confidence based on distance to centroid
         distances_to_centroid = kmeans.transform(distance_matrix)
 
-        assignments = {}
-        for i, emp_id in enumerate(employee_ids):
-            cluster_id = int(labels[i])
-            # Confidence = 1 - normalized distance to own centroid
-            dist = distances_to_centroid[i, cluster_id]
-            max_dist = distances_to_centroid[:, cluster_id].max()
-            confidence = 1 - (dist / max_dist) if max_dist > 0 else 1.0
-
-            assignments[emp_id] = ClusterAssignment(
-                employee_id=emp_id,
-                strategy=ClusteringStrategy.KMEANS,
-                cluster_id=cluster_id,
-                confidence=confidence,
-                is_outlier=False
-            )
+        # Confidence = 1 - distance to own centroid, normalized by the farthest member
+        rows = np.arange(n_samples)
+        own_dist = distances_to_centroid[rows, labels]
+        max_dist = distances_to_centroid.max(axis=0)[labels]
+        confidences = 1 - np.divide(
+            own_dist, max_dist, out=np.zeros_like(own_dist), where=max_dist > 0
+        )
 
-        return assignments
+        return StrategyAssignments.from_labels(
+            ClusteringStrategy.KMEANS, employee_ids, labels, confidences
+        )
 
     def cluster_hierarchical(
         self,
         proximity_matrix: np.ndarray,
         employee_ids: List[str]
-    ) -> Dict[str, ClusterAssignment]:
+    ) -> StrategyAssignments:
         """
         Perform hierarchical (agglomerative) clustering.
         """
-        from sklearn.cluster import AgglomerativeClustering
-        from sklearn.metrics import silhouette_score
+        from scipy.cluster.hierarchy import linkage, fcluster
+        from scipy.spatial.distance import squareform
 
         n_samples = len(employee_ids)
-        distance_matrix = 1 - proximity_matrix
+        distance_matrix = self._get_distance(proximity_matrix)
+
+        # Build the dendrogram once; every k is just a cut of the same tree.
+        # Ward assumes Euclidean inputs, so it falls back to average linkage.
+        method = self.config.hierarchical_linkage
+        if method not in ("average", "complete", "single", "weighted"):
+            method = "average"
+        tree = linkage(squareform(distance_matrix, checks=False), method=method)
 
         # Auto-determine number of clusters
         if self.config.hierarchical_n_clusters == 0:
@@ -194,21 +620,22 @@ class MultiStrategyClusterer:
             min_k = 2
 
             best_k = min_k
-            best_score = -1
+            best_score = -1.0
 
+            silhouette = self._get_silhouette(distance_matrix, max_k)
+            sweep_cache = self._get_k_sweep_cache(proximity_matrix)
             for k in range(min_k, max_k + 1):
                 try:
-                    clustering = AgglomerativeClustering(
-                        n_clusters=k,
-                        metric='precomputed',
-                        linkage='average'  # Ward doesn't work with precomputed
-                    )
-                    labels = clustering.fit_predict(distance_matrix)
-                    if len(set(labels)) > 1:
-                        score = silhouette_score(distance_matrix, labels, metric='precomputed')
-                        if score > best_score:
-                            best_score = score
-                            best_k = k
+                    cache_key = (ClusteringStrategy.HIERARCHICAL, k, method)
+                    score = sweep_cache.get(cache_key) if sweep_cache is not None else None
+                    if score is None:
+                        labels = fcluster(tree, t=k, criterion='maxclust') - 1
+                        score = silhouette.score(labels) if len(set(labels)) > 1 else -np.inf
+                        if sweep_cache is not None:
+                            sweep_cache[cache_key] = score
+                    if score > best_score:
+                        best_score = score
+                        best_k = k
                 except Exception as e:
                     logger.warning(f"Hierarchical with k={k} failed: {e}")
                     continue
@@ -218,43 +645,21 @@ class MultiStrategyClusterer:
         else:
             n_clusters = self.config.hierarchical_n_clusters
 
-        # Fit final model
-        clustering = AgglomerativeClustering(
-            n_clusters=n_clusters,
-            metric='precomputed',
-            linkage='average'
-        )
-        labels = clustering.fit_predict(distance_matrix)
+        # Cut the tree at the selected k
+        labels = fcluster(tree, t=n_clusters, criterion='maxclust') - 1
 
         # Calculate confidence based on average proximity to cluster members
-        assignments = {}
-        for i, emp_id in enumerate(employee_ids):
-            cluster_id = int(labels[i])
-
-            # Find cluster members
-            cluster_members = [j for j, l in enumerate(labels) if l == cluster_id and j != i]
-
-            if cluster_members:
-                avg_proximity = np.mean([proximity_matrix[i, j] for j in cluster_members])
-                confidence = avg_proximity
-            else:
-                confidence = 1.0
+        confidences = _mean_proximity_to_cluster(proximity_matrix, labels)
 
-            assignments[emp_id] = ClusterAssignment(
-                employee_id=emp_id,
-                strategy=ClusteringStrategy.HIERARCHICAL,
-                cluster_id=cluster_id,
-                confidence=confidence,
-                is_outlier=False
-            )
-
-        return assignments
+        return StrategyAssignments.from_labels(
+            ClusteringStrategy.HIERARCHICAL, employee_ids, labels, confidences
+        )
 
     def cluster_dbscan(
         self,
         proximity_matrix: np.ndarray,
         employee_ids: List[str]
-    ) -> Dict[str, ClusterAssignment]:
+    ) -> StrategyAssignments:
         """
         Perform DBSCAN clustering with outlier detection.
 
@@ -265,79 +670,185 @@ class MultiStrategyClusterer:
         """
         from sklearn.cluster import DBSCAN
 
-        distance_matrix = 1 - proximity_matrix
-
-        # DBSCAN with distance matrix
+        # DBSCAN on a sparse eps-neighbor graph: only pairs within eps are stored,
+        # so the neighbor search never walks the full n x n matrix
+        neighbor_graph = self._eps_neighbor_graph(proximity_matrix, self.config.dbscan_eps)
         clustering = DBSCAN(
             eps=self.config.dbscan_eps,
             min_samples=self.config.dbscan_min_samples,
             metric='precomputed'
         )
-        labels = clustering.fit_predict(distance_matrix)
+        labels = clustering.fit_predict(neighbor_graph)
 
         n_clusters = len(set(labels)) - (1 if -1 in labels else 0)
         n_outliers = list(labels).count(-1)
         logger.info(f"DBSCAN found {n_clusters} clusters, {n_outliers} outliers")
 
-        assignments = {}
-        for i, emp_id in enumerate(employee_ids):
-            cluster_id = int(labels[i])
-            is_outlier = cluster_id == -1
+        # Confidence = average proximity to cluster members (0 for outliers)
+        confidences = _mean_proximity_to_cluster(proximity_matrix, labels)
 
-            if is_outlier:
-                confidence = 0.0
-            else:
-                # Confidence = average proximity to cluster members
-                cluster_members = [j for j, l in enumerate(labels) if l == cluster_id and j != i]
-                if cluster_members:
-                    confidence = np.mean([proximity_matrix[i, j] for j in cluster_members])
-                else:
-                    confidence = 1.0
-
-            assignments[emp_id] = ClusterAssignment(
-                employee_id=emp_id,
-                strategy=ClusteringStrategy.DBSCAN,
-                cluster_id=cluster_id,
-                confidence=confidence,
-                is_outlier=is_outlier
-            )
+        return StrategyAssignments.from_labels(
+            ClusteringStrategy.DBSCAN, employee_ids, labels, confidences
+        )
 
-        return assignments
+    def _eps_neighbor_graph(self, proximity_matrix: np.ndarray, eps: float):
+        """
+        Build a sparse CSR distance matrix holding only pairs with distance <= eps.
+
+        Zero distances (including the diagonal) are kept as explicit entries so
+        DBSCAN still counts them as neighbors.
+        """
+        from scipy import sparse
+
+        n = proximity_matrix.shape[0]
+        if sparse.issparse(proximity_matrix):
+            coo = sparse.coo_matrix(proximity_matrix)
+            dist = 1.0 - coo.data
+            keep = dist <= eps
+            rows, cols, data = coo.row[keep], coo.col[keep], dist[keep]
+        else:
+            distance_matrix = self._get_distance(proximity_matrix)
+            rows, cols = np.nonzero(distance_matrix <= eps)
+            data = distance_matrix[rows, cols]
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n, n))
 
     def cluster_graph_community(
         self,
         proximity_matrix: np.ndarray,
         employee_ids: List[str]
-    ) -> Dict[str, ClusterAssignment]:
+    ) -> StrategyAssignments:
         """
         Perform graph-based community detection using Louvain algorithm.
+
+        Uses igraph's C implementation of Louvain (community_multilevel) when
+        python-igraph is installed, falling back to NetworkX otherwise.
         """
+        from scipy import sparse
+        from scipy.sparse.csgraph import connected_components
+
+        # Edges where proximity exceeds threshold (upper triangle, no Python pair loop)
+        threshold = self.config.graph_min_edge_weight
+        if sparse.issparse(proximity_matrix):
+            upper = sparse.triu(proximity_matrix, k=1).tocoo()
+            keep = upper.data >= threshold
+            rows, cols, weights = upper.row[keep], upper.col[keep], upper.data[keep]
+        else:
+            rows, cols = np.nonzero(np.triu(proximity_matrix >= threshold, k=1))
+            weights = proximity_matrix[rows, cols]
+
+        # Connected components below the size floor become communities as-is;
+        # Louvain only runs on the nodes of the remaining large components
+        n = len(employee_ids)
+        n_components, component = connected_components(
+            sparse.coo_matrix((weights, (rows, cols)), shape=(n, n)), directed=False
+        )
+        in_large = np.bincount(component)[component] >= self.config.graph_min_component_size
+        large_nodes = np.flatnonzero(in_large)
+        remap = np.full(n, -1, dtype=np.int64)
+        remap[large_nodes] = np.arange(len(large_nodes))
+        large_edges = in_large[rows]  # edges never cross components
+        sub_rows, sub_cols = remap[rows[large_edges]], remap[cols[large_edges]]
+        sub_weights = weights[large_edges]
+        logger.info(
+            f"Graph has {n_components} components; running Louvain on "
+            f"{len(large_nodes)}/{n} nodes"
+        )
+
+        sub_labels: Optional[np.ndarray]
         try:
-            import networkx as nx
-            from networkx.algorithms import community as nx_community
+            if len(large_nodes):
+                sub_labels = self._louvain_igraph(len(large_nodes), sub_rows, sub_cols, sub_weights)
+            else:
+                sub_labels = np.empty(0, dtype=np.int64)
         except ImportError:
-            logger.warning("NetworkX not available, skipping graph community clustering")
-            return {}
+            try:
+                sub_labels = self._louvain_networkx(
+                    [employee_ids[i] for i in large_nodes], sub_rows, sub_cols, sub_weights
+                )
+            except ImportError:
+                logger.warning("NetworkX not available, skipping graph community clustering")
+                return StrategyAssignments.empty(ClusteringStrategy.GRAPH_COMMUNITY)
+        except Exception as e:
+            logger.warning(f"Louvain community detection failed: {e}")
+            return StrategyAssignments.empty(ClusteringStrategy.GRAPH_COMMUNITY)
+        if sub_labels is None:
+            return StrategyAssignments.empty(ClusteringStrategy.GRAPH_COMMUNITY)
+
+        labels = np.full(n, -1, dtype=np.int64)
+        labels[large_nodes] = sub_labels
+        small_nodes = np.flatnonzero(~in_large)
+        if len(small_nodes):
+            _, small_ids = np.unique(component[small_nodes], return_inverse=True)
+            labels[small_nodes] = small_ids + (int(sub_labels.max()) + 1 if len(sub_labels) else 0)
+
+        n_communities = int(labels.max()) + 1 if n else 0
+        logger.info(f"Graph community detection found {n_communities} communities")
+
+        # Confidence = average edge weight to community members (0.5 if no such edges)
+        same = labels[rows] == labels[cols]
+        ends = np.concatenate([rows[same], cols[same]])
+        edge_weights = np.concatenate([weights[same], weights[same]]).astype(np.float64)
+        weight_sum = np.bincount(ends, weights=edge_weights, minlength=n)
+        edge_count = np.bincount(ends, minlength=n)
+        confidences = np.divide(
+            weight_sum, edge_count, out=np.full(n, 0.5), where=edge_count > 0
+        )
+        confidences[labels < 0] = 0.0
 
-        # Build graph from proximity matrix
-        G = nx.Graph()
+        return StrategyAssignments.from_labels(
+            ClusteringStrategy.GRAPH_COMMUNITY, employee_ids, labels, confidences
+        )
 
-        # Add nodes
-        for i, emp_id in enumerate(employee_ids):
-            G.add_node(emp_id)
-
-        # Add edges where proximity exceeds threshold
-        for i in range(len(employee_ids)):
-            for j in range(i + 1, len(employee_ids)):
-                proximity = proximity_matrix[i, j]
-                if proximity >= self.config.graph_min_edge_weight:
-                    G.add_edge(
-                        employee_ids[i],
-                        employee_ids[j],
-                        weight=proximity
-                    )
+    def _louvain_igraph(
+        self,
+        n: int,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        weights: np.ndarray
+    ) -> np.ndarray:
+        """
+        Louvain via igraph's C implementation.
+
+        Raises:
+            ImportError: If python-igraph is not installed
+        """
+        import igraph as ig
+
+        g = ig.Graph(n=n, edges=np.column_stack([rows, cols]).tolist(), directed=False)
+        g.es["weight"] = weights.tolist()
+        # Seeded like the NetworkX fallback; igraph's RNG is process-wide, so
+        # hand it back to the random module afterwards
+        ig.set_random_number_generator(random.Random(42))
+        try:
+            partition = g.community_multilevel(
+                weights="weight",
+                resolution=self.config.graph_resolution
+            )
+        finally:
+            ig.set_random_number_generator(random)
+        return np.asarray(partition.membership, dtype=np.int64)
+
+    def _louvain_networkx(
+        self,
+        employee_ids: List[str],
+        rows: np.ndarray,
+        cols: np.ndarray,
+        weights: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """
+        Louvain via NetworkX (pure Python fallback).
+
+        Raises:
+            ImportError: If NetworkX is not installed
+        """
+        import networkx as nx
+        from networkx.algorithms import community as nx_community
+
+        G = nx.Graph()
+        G.add_nodes_from(employee_ids)
+        ids = np.asarray(employee_ids, dtype=object)
+        G.add_weighted_edges_from(zip(ids[rows], ids[cols], weights.tolist()))
 
-        # Detect communities using Louvain
         try:
             communities = nx_community.louvain_communities(
                 G,
@@ -347,51 +858,21 @@ class MultiStrategyClusterer:
             )
         except Exception as e:
             logger.warning(f"Louvain community detection failed: {e}")
-            return {}
-
-        logger.info(f"Graph community detection found {len(communities)} communities")
+            return None
 
-        # Create assignments
-        emp_to_cluster = {}
+        id_to_idx = {emp_id: i for i, emp_id in enumerate(employee_ids)}
+        labels = np.full(len(employee_ids), -1, dtype=np.int64)
         for cluster_id, community in enumerate(communities):
             for emp_id in community:
-                emp_to_cluster[emp_id] = cluster_id
-
-        assignments = {}
-        for i, emp_id in enumerate(employee_ids):
-            cluster_id = emp_to_cluster.get(emp_id, -1)
-
-            if cluster_id >= 0:
-                # Confidence = average edge weight to community members
-                community = communities[cluster_id]
-                neighbors_in_community = [
-                    n for n in G.neighbors(emp_id) if n in community
-                ]
-                if neighbors_in_community:
-                    confidence = np.mean([
-                        G[emp_id][n]['weight'] for n in neighbors_in_community
-                    ])
-                else:
-                    confidence = 0.5
-            else:
-                confidence = 0.0
-
-            assignments[emp_id] = ClusterAssignment(
-                employee_id=emp_id,
-                strategy=ClusteringStrategy.GRAPH_COMMUNITY,
-                cluster_id=cluster_id,
-                confidence=confidence,
-                is_outlier=cluster_id == -1
-            )
-
-        return assignments
+                labels[id_to_idx[emp_id]] = cluster_id
+        return labels
 
     def run_all_strategies(
         self,
         proximity_matrix: np.ndarray,
         employee_ids: List[str],
         strategies: Optional[List[ClusteringStrategy]] = None
-    ) -> Dict[ClusteringStrategy, Dict[str, ClusterAssignment]]:
+    ) -> Dict[ClusteringStrategy, StrategyAssignments]:
         """
         Run all specified clustering strategies.
 
@@ -406,28 +887,119 @@ class MultiStrategyClusterer:
         if strategies is None:
             strategies = list(ClusteringStrategy)
 
+        # float32 halves the bandwidth of every n x n pass; proximities are in [0, 1]
+        if isinstance(proximity_matrix, np.ndarray):
+            proximity_matrix = np.ascontiguousarray(proximity_matrix, dtype=np.float32)
+
+        n_workers = min(len(strategies), os.cpu_count() or 1)
+        if (
+            self.config.parallel_strategies
+            and n_workers > 1
+            and isinstance(proximity_matrix, np.ndarray)
+        ):
+            try:
+                return self._run_strategies_parallel(
+                    proximity_matrix, employee_ids, strategies, n_workers
+                )
+            except Exception as e:
+                logger.warning(f"Parallel clustering unavailable ({e}), running sequentially")
+
         results = {}
 
         for strategy in strategies:
             logger.info(f"Running {strategy.value} clustering...")
             try:
-                if strategy == ClusteringStrategy.KMEANS:
-                    results[strategy] = self.cluster_kmeans(proximity_matrix, employee_ids)
-                elif strategy == ClusteringStrategy.HIERARCHICAL:
-                    results[strategy] = self.cluster_hierarchical(proximity_matrix, employee_ids)
-                elif strategy == ClusteringStrategy.DBSCAN:
-                    results[strategy] = self.cluster_dbscan(proximity_matrix, employee_ids)
-                elif strategy == ClusteringStrategy.GRAPH_COMMUNITY:
-                    results[strategy] = self.cluster_graph_community(proximity_matrix, employee_ids)
+                results[strategy] = self._run_strategy(strategy, proximity_matrix, employee_ids)
             except Exception as e:
                 logger.error(f"Strategy {strategy.value} failed: {e}")
                 continue
+            self._index_clusters(strategy, results[strategy])
 
         return results
 
+    def _run_strategy(
+        self,
+        strategy: ClusteringStrategy,
+        proximity_matrix: np.ndarray,
+        employee_ids: List[str]
+    ) -> StrategyAssignments:
+        """Dispatch a single strategy to its cluster_* method."""
+        if strategy == ClusteringStrategy.KMEANS:
+            return self.cluster_kmeans(proximity_matrix, employee_ids)
+        elif strategy == ClusteringStrategy.HIERARCHICAL:
+            return self.cluster_hierarchical(proximity_matrix, employee_ids)
+        elif strategy == ClusteringStrategy.DBSCAN:
+            return self.cluster_dbscan(proximity_matrix, employee_ids)
+        elif strategy == ClusteringStrategy.GRAPH_COMMUNITY:
+            return self.cluster_graph_community(proximity_matrix, employee_ids)
+        raise ValueError(f"Unknown clustering strategy: {strategy}")
+
+    def _run_strategies_parallel(
+        self,
+        proximity_matrix: np.ndarray,
+        employee_ids: List[str],
+        strategies: List[ClusteringStrategy],
+        n_workers: int
+    ) -> Dict[ClusteringStrategy, StrategyAssignments]:
+        """
+        Run strategies concurrently in up to n_workers processes.
+
+        The proximity matrix is copied once into shared memory and attached
+        by each worker. Workers are spawned (safe from threaded hosts such
+        as uvicorn, and the same on Windows) on the first parallel run and
+        then reused, so later runs skip the startup and imports, and each
+        strategy lands on the worker that already holds its buffers and
+        k-sweep cache. Per-strategy failures are logged and skipped as in
+        the sequential path; a broken pool is shut down and the error
+        propagates so the caller can fall back.
+        """
+        matrix = np.ascontiguousarray(proximity_matrix)
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        try:
+            shared = np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)
+            shared[...] = matrix
+            del shared
+
+            while len(self._pools) < n_workers:
+                self._pools.append(ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn")
+                ))
+            all_strategies = list(ClusteringStrategy)
+
+            results = {}
+            futures = {}
+            for strategy in strategies:
+                logger.info(f"Running {strategy.value} clustering...")
+                pool = self._pools[all_strategies.index(strategy) % len(self._pools)]
+                futures[strategy] = pool.submit(
+                    _run_strategy_in_worker,
+                    shm.name, matrix.shape, matrix.dtype.str,
+                    list(employee_ids), strategy, self.config
+                )
+            for strategy, future in futures.items():
+                try:
+                    results[strategy] = future.result()
+                    self._index_clusters(strategy, results[strategy])
+                except BrokenProcessPool:
+                    self.close()
+                    raise
+                except Exception as e:
+                    logger.error(f"Strategy {strategy.value} failed: {e}")
+            return results
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self) -> None:
+        """Shut down the worker processes of parallel runs (restarted on next use)."""
+        for pool in self._pools:
+            pool.shutdown(wait=True, cancel_futures=True)
+        self._pools = []
+
     def analyze_consensus(
         self,
-        all_assignments: Dict[ClusteringStrategy, Dict[str, ClusterAssignment]],
+        all_assignments: Dict[ClusteringStrategy, StrategyAssignments],
         employee_ids: List[str]
     ) -> Dict[str, ConsensusResult]:
         """
@@ -447,9 +1019,15 @@ class MultiStrategyClusterer:
         """
         logger.info("Analyzing clustering consensus...")
 
+        id_to_idx = {emp_id: i for i, emp_id in enumerate(employee_ids)}
+        label_matrix, present = self._build_label_matrix(all_assignments, id_to_idx)
+        consensus_scores = _consensus_scores(label_matrix, present)
+        consensus_clusters, strategies_agreeing_all, outlier_votes_all = (
+            self._consensus_modes(label_matrix, present)
+        )
         results = {}
 
-        for emp_id in employee_ids:
+        for emp_idx, emp_id in enumerate(employee_ids):
             # Collect all assignments for this employee
             emp_assignments = {}
             for strategy, assignments in all_assignments.items():
@@ -466,48 +1044,24 @@ class MultiStrategyClusterer:
                 )
                 continue
 
-            # Find peer sets from each strategy
-            peer_sets = []
-            for strategy, assignment in emp_assignments.items():
-                if assignment.is_outlier:
-                    peer_sets.append(set())  # Outliers have no peers
-                else:
-                    # Find all employees in same cluster
-                    cluster_members = set()
-                    strategy_assignments = all_assignments[strategy]
-                    for other_id, other_assign in strategy_assignments.items():
-                        if other_id != emp_id and other_assign.cluster_id == assignment.cluster_id:
-                            cluster_members.add(other_id)
-                    peer_sets.append(cluster_members)
-
-            # Calculate consensus
-            # Use Jaccard similarity between peer sets
-            if len(peer_sets) >= 2:
-                pairwise_similarities = []
-                for i in range(len(peer_sets)):
-                    for j in range(i + 1, len(peer_sets)):
-                        set_a, set_b = peer_sets[i], peer_sets[j]
-                        if set_a or set_b:
-                            intersection = len(set_a & set_b)
-                            union = len(set_a | set_b)
-                            jaccard = intersection / union if union > 0 else 1.0
-                            pairwise_similarities.append(jaccard)
-
-                consensus_score = np.mean(pairwise_similarities) if pairwise_similarities else 0.0
-            else:
-                consensus_score = 1.0  # Single strategy = full consensus
+            # Find peer sets from each strategy (same-cluster masks; outliers have no peers)
+            peer_masks = _peer_masks(label_matrix[present[:, emp_idx]], emp_idx)
+
+            # Consensus = mean pairwise Jaccard of peer sets (precomputed)
+            consensus_score = float(consensus_scores[emp_idx])
 
             # Determine consensus peers (intersection of all non-empty peer sets)
-            non_empty_sets = [s for s in peer_sets if s]
-            if non_empty_sets:
-                consensus_peers = set.intersection(*non_empty_sets) if len(non_empty_sets) > 1 else non_empty_sets[0]
-                all_peers = set.union(*non_empty_sets)
+            non_empty = peer_masks[peer_masks.any(axis=1)]
+            if len(non_empty):
+                n_consensus_peers = int(np.logical_and.reduce(non_empty, axis=0).sum())
+                all_peers_mask = np.logical_or.reduce(non_empty, axis=0)
             else:
-                consensus_peers = set()
-                all_peers = set()
+                n_consensus_peers = 0
+                all_peers_mask = np.zeros(len(employee_ids), dtype=bool)
+            peer_idx = np.flatnonzero(all_peers_mask).astype(np.int32)
 
             # Check for outlier disagreement
-            outlier_votes = sum(1 for a in emp_assignments.values() if a.is_outlier)
+            outlier_votes = int(outlier_votes_all[emp_idx])
             non_outlier_votes = total_strategies - outlier_votes
 
             # Determine if human review is needed
@@ -520,23 +1074,15 @@ class MultiStrategyClusterer:
             elif outlier_votes > 0 and non_outlier_votes > 0:
                 needs_review = True
                 reason = f"Outlier disagreement ({outlier_votes}/{total_strategies} strategies mark as outlier)"
-            elif len(consensus_peers) == 0 and len(all_peers) > 0:
+            elif n_consensus_peers == 0 and len(peer_idx) > 0:
                 needs_review = True
                 reason = "No common peers across all strategies"
 
-            # Determine consensus cluster (mode of cluster IDs, excluding outliers)
-            non_outlier_clusters = [
-                a.cluster_id for a in emp_assignments.values()
-                if not a.is_outlier
-            ]
-            if non_outlier_clusters:
-                from collections import Counter
-                cluster_counts = Counter(non_outlier_clusters)
-                consensus_cluster = cluster_counts.most_common(1)[0][0]
-                strategies_agreeing = cluster_counts[consensus_cluster]
-            else:
-                consensus_cluster = -1
-                strategies_agreeing = outlier_votes
+            # Consensus cluster = mode of cluster IDs, excluding outliers (precomputed)
+            consensus_cluster = int(consensus_clusters[emp_idx])
+            strategies_agreeing = int(strategies_agreeing_all[emp_idx])
+
+            peer_ids = [employee_ids[j] for j in peer_idx]  # Use union for peer list
 
             results[emp_id] = ConsensusResult(
                 employee_id=emp_id,
@@ -545,8 +1091,9 @@ class MultiStrategyClusterer:
                 consensus_score=consensus_score,
                 strategies_agreeing=strategies_agreeing,
                 total_strategies=total_strategies,
-                peer_ids=list(all_peers),  # Use union for peer list
-                peer_count=len(all_peers),
+                peer_ids=peer_ids,
+                peer_idx=peer_idx,
+                peer_count=len(peer_ids),
                 needs_human_review=needs_review,
                 disagreement_reason=reason
             )
@@ -558,11 +1105,77 @@ class MultiStrategyClusterer:
         self._results_cache = results
         return results
 
+    @staticmethod
+    def _consensus_modes(
+        label_matrix: np.ndarray,
+        present: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-employee mode of non-outlier cluster IDs across strategies.
+
+        For every (strategy, employee) cell, counts how many strategies give
+        the employee the same label; the first strategy with the highest
+        count supplies the mode, matching Counter.most_common tie-breaking.
+
+        Returns:
+            Tuple of (consensus_cluster, strategies_agreeing, outlier_votes),
+            each shaped (n_employees,). Employees with no non-outlier label get
+            cluster -1 and strategies_agreeing equal to their outlier votes.
+        """
+        n_strategies, n = label_matrix.shape
+        if n_strategies == 0:
+            zeros = np.zeros(n, dtype=np.int64)
+            return np.full(n, -1, dtype=np.int64), zeros, zeros
+
+        valid = present & (label_matrix >= 0)
+        same = label_matrix[:, None, :] == label_matrix[None, :, :]
+        counts = (same & valid[None, :, :]).sum(axis=1)
+        counts[~valid] = 0
+
+        cols = np.arange(n)
+        best = counts.argmax(axis=0)
+        best_count = counts[best, cols]
+        outlier_votes = (present & (label_matrix < 0)).sum(axis=0)
+
+        has_mode = best_count > 0
+        consensus_cluster = np.where(has_mode, label_matrix[best, cols], -1)
+        strategies_agreeing = np.where(has_mode, best_count, outlier_votes)
+        return consensus_cluster, strategies_agreeing, outlier_votes
+
+    @staticmethod
+    def _build_label_matrix(
+        all_assignments: Dict[ClusteringStrategy, StrategyAssignments],
+        id_to_idx: Dict[str, int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pack per-strategy assignments into contiguous int32 label arrays.
+
+        Returns:
+            Tuple of (labels, present), both shaped (n_strategies, n_employees).
+            Outliers and missing assignments carry label -1.
+        """
+        n_strategies = len(all_assignments)
+        n = len(id_to_idx)
+        labels = np.full((n_strategies, n), -1, dtype=np.int32)
+        present = np.zeros((n_strategies, n), dtype=bool)
+        for s, assignments in enumerate(all_assignments.values()):
+            cols = np.fromiter(
+                (id_to_idx.get(emp_id, -1) for emp_id in assignments.employee_ids),
+                dtype=np.int64, count=len(assignments)
+            )
+            known = cols >= 0
+            cols = cols[known]
+            present[s, cols] = True
+            labels[s, cols] = np.where(
+                assignments.is_outlier[known], -1, assignments.cluster_id[known]
+            )
+        return labels, present
+
     def get_cluster_members(
         self,
         employee_id: str,
         strategy: ClusteringStrategy,
-        all_assignments: Dict[ClusteringStrategy, Dict[str, ClusterAssignment]]
+        all_assignments: Dict[ClusteringStrategy, StrategyAssignments]
     ) -> List[str]:
         """
         Get all members of the same cluster as a given employee.
@@ -571,14 +1184,38 @@ class MultiStrategyClusterer:
             return []
 
         assignments = all_assignments[strategy]
-        if employee_id not in assignments:
+        pos = assignments.position(employee_id)
+        if pos is None:
             return []
 
-        target_cluster = assignments[employee_id].cluster_id
+        target_cluster = int(assignments.cluster_id[pos])
         if target_cluster == -1:  # Outlier
             return []
 
+        cached = self._cluster_index.get(strategy)
+        if cached is None or cached[0] is not assignments:
+            index = self._index_clusters(strategy, assignments)
+        else:
+            index = cached[1]
+
         return [
-            emp_id for emp_id, assign in assignments.items()
-            if assign.cluster_id == target_cluster and emp_id != employee_id
+            emp_id for emp_id in index.get(target_cluster, [])
+            if emp_id != employee_id
         ]
+
+    def _index_clusters(
+        self,
+        strategy: ClusteringStrategy,
+        assignments: StrategyAssignments
+    ) -> Dict[int, List[str]]:
+        """Build and cache the cluster_id -> member ids inverted index for a strategy."""
+        order = np.argsort(assignments.cluster_id, kind='stable')
+        sorted_ids = assignments.cluster_id[order]
+        cluster_ids, starts = np.unique(sorted_ids, return_index=True)
+        bounds = np.append(starts, len(order))
+        members = [assignments.employee_ids[i] for i in order]
+        index = {
+            int(c): members[bounds[k]:bounds[k + 1]] for k, c in enumerate(cluster_ids)
+        }
+        self._cluster_index[strategy] = (assignments, index)
+        return index
@@ -12,19 +12,36 @@ Provides a unified interface for analyzing access recertification data.
 Author: Chiradeep Chhaya
 """
 
+import hashlib
 import logging
+import os
 import sqlite3
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+import tempfile
+import threading
+from contextlib import contextmanager
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import IO, Callable, Dict, Iterator, List, Optional, Any, Set, Tuple
 from pathlib import Path
 import json
 
-from .peer_proximity import PeerProximityCalculator, ProximityWeights, EmployeeFeatures
-from .clustering import MultiStrategyClusterer, ClusteringConfig, ClusteringStrategy, ConsensusResult
-from .assurance import AssuranceScorer, AssuranceConfig, AssuranceScore
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+from .peer_proximity import FEATURE_VERSION, PeerProximityCalculator, ProximityWeights, EmployeeFeatures
+from .clustering import MultiStrategyClusterer, ClusteringConfig, ClusteringStrategy, ConsensusResult, StrategyAssignments
+from .assurance import AssuranceScorer, AssuranceConfig, AssuranceScore, AssuranceArrays
 
 logger = logging.getLogger(__name__)
 
+# Employee columns kept in the engine's reference cache (review items,
+# employee summaries and the manager -> reports index)
+EMPLOYEE_REFERENCE_COLUMNS = ("id", "full_name", "job_title", "team_id", "manager_id")
+
 
 @dataclass
 class AnalyticsResult:
@@ -34,7 +51,7 @@ class AnalyticsResult:
     employee_features: Dict[str, EmployeeFeatures]
 
     # Clustering results
-    cluster_assignments: Dict[ClusteringStrategy, Dict[str, Any]]
+    cluster_assignments: Dict[ClusteringStrategy, StrategyAssignments]
     consensus_results: Dict[str, ConsensusResult]
 
     # Assurance scores
@@ -50,6 +67,18 @@ class AnalyticsResult:
     needs_human_review_count: int = 0
     clustering_disagreement_count: int = 0
 
+    # Assurance scores grouped by employee_id (same objects as assurance_scores)
+    scores_by_employee: Dict[str, List[AssuranceScore]] = field(default_factory=dict)
+
+    # Array view of assurance_scores for counting, filtering and sorting
+    assurance_arrays: Optional[AssuranceArrays] = None
+
+    # Encoded "key":value export entries per section, filled by the first
+    # compact export_results() call and reused by later ones
+    _export_cache: Dict[str, List[bytes]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
 
 class AnalyticsEngine:
     """
@@ -69,9 +98,16 @@ class AnalyticsEngine:
         db_path: str,
         proximity_weights: Optional[ProximityWeights] = None,
         clustering_config: Optional[ClusteringConfig] = None,
-        assurance_config: Optional[AssuranceConfig] = None
+        assurance_config: Optional[AssuranceConfig] = None,
+        proximity_cache_dir: Optional[str] = None,
+        proximity_cache_max_entries: int = 4
     ):
         self.db_path = db_path
+        # Persisted proximity matrices, memory-mapped when features are unchanged.
+        # Keys include tenure and time in role, so entries only live for a day;
+        # saving prunes all but the most recently used max_entries matrices
+        self.proximity_cache_dir = Path(proximity_cache_dir) if proximity_cache_dir else None
+        self.proximity_cache_max_entries = proximity_cache_max_entries
         self.proximity_calculator = PeerProximityCalculator(weights=proximity_weights)
         self.clusterer = MultiStrategyClusterer(config=clustering_config)
         self.scorer = AssuranceScorer(config=assurance_config)
@@ -81,66 +117,258 @@ class AnalyticsEngine:
         self._teams: List[Dict] = []
         self._sub_lobs: List[Dict] = []
         self._lobs: List[Dict] = []
+        self._lob_id_by_name: Dict[Optional[str], str] = {}
         self._resources: Dict[str, Dict] = {}
-        self._access_grants: List[Dict] = []
-        self._activity_summaries: Dict[str, Dict] = {}
 
-    def load_data(self) -> None:
-        """Load all required data from SQLite database."""
-        logger.info(f"Loading data from {self.db_path}")
+        # Employee lookup indexes, rebuilt with the employee cache
+        self._employee_by_id: Dict[str, Dict] = {}
+        self._reports_by_manager: Dict[Optional[str], Set[str]] = {}
+
+        # String ID -> int32 intern tables, seeded at reference-data load and
+        # extended with IDs first seen by a later scoped load
+        self._emp_str_to_int: Dict[str, int] = {}
+        self._res_str_to_int: Dict[str, int] = {}
+
+        # Shared read-only connection, opened on first use
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
+
+        # LOB IDs known to have active employees (EXISTS pre-check). Empty
+        # LOBs are re-checked, since employees may be hired into them later
+        self._lobs_with_employees: Set[str] = set()
+
+    def load_data(self, lob_filter: Optional[str] = None) -> None:
+        """
+        Load reference data from SQLite database.
+
+        Access grants and activity summaries are not cached here; run_analysis()
+        fetches them per scope with load_scoped_data().
+
+        Args:
+            lob_filter: Optional LOB ID or name the caller will analyze. The
+                LOB's EXISTS pre-check runs here, so an empty LOB is known
+                before run_analysis() and its scoped loads are skipped.
+        """
+        self.load_reference_data()
+
+        if lob_filter:
+            lob_id = self._resolve_lob_id(lob_filter)
+            if not lob_id or not self.lob_has_employees(lob_id):
+                logger.warning(f"No active employees for LOB filter: {lob_filter}")
 
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow the engine's shared read-only connection.
+
+        The connection stays open across loads, so sqlite3's per-connection
+        statement cache reuses the prepared SELECTs and the page cache stays
+        warm between LOB scopes. Access is serialized with a lock.
+        """
+        with self._conn_lock:
+            if self._conn is None:
+                self._conn = self._open_connection()
+            yield self._conn
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open the read-only connection the engine loads through."""
         if not Path(self.db_path).exists():
             raise FileNotFoundError(f"Database not found: {self.db_path}")
 
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        db_uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(db_uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA mmap_size=1073741824")
+        conn.execute("PRAGMA cache_size=-262144")
+        return conn
+
+    def close(self) -> None:
+        """Close the shared database connection and clustering workers (reopened on next use)."""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.clusterer.close()
+
+    def load_reference_data(self) -> None:
+        """Load employees, org structure and resources from SQLite database."""
+        logger.info(f"Loading data from {self.db_path}")
 
-        try:
-            # Load employees
-            cursor = conn.execute("SELECT * FROM employees WHERE status = 'Active'")
-            self._employees = [dict(row) for row in cursor.fetchall()]
+        with self._connect() as conn:
+            # Load employees (lookup columns only; run_analysis() loads full
+            # rows for the scope it analyzes)
+            cursor = conn.execute(f"""
+                SELECT {', '.join(EMPLOYEE_REFERENCE_COLUMNS)} FROM employees
+                WHERE status = 'Active'
+            """)
+            self._employees = _rows_as_dicts(cursor)
+            self._index_employees()
             logger.info(f"Loaded {len(self._employees)} employees")
 
             # Load teams
             cursor = conn.execute("SELECT * FROM teams")
-            self._teams = [dict(row) for row in cursor.fetchall()]
+            self._teams = _rows_as_dicts(cursor)
             logger.info(f"Loaded {len(self._teams)} teams")
 
             # Load sub-LOBs
             cursor = conn.execute("SELECT * FROM sub_lobs")
-            self._sub_lobs = [dict(row) for row in cursor.fetchall()]
+            self._sub_lobs = _rows_as_dicts(cursor)
             logger.info(f"Loaded {len(self._sub_lobs)} sub-LOBs")
 
             # Load LOBs
             cursor = conn.execute("SELECT * FROM lobs")
-            self._lobs = [dict(row) for row in cursor.fetchall()]
+            self._lobs = _rows_as_dicts(cursor)
+            self._lob_id_by_name = {}
+            for lob in self._lobs:
+                # First match wins, as with the previous linear scan
+                self._lob_id_by_name.setdefault(lob.get("name"), lob["id"])
             logger.info(f"Loaded {len(self._lobs)} LOBs")
 
             # Load resources
             cursor = conn.execute("SELECT * FROM resources")
-            resources = [dict(row) for row in cursor.fetchall()]
+            resources = _rows_as_dicts(cursor)
             self._resources = {r["id"]: r for r in resources}
+            self._res_str_to_int = {res_id: i for i, res_id in enumerate(self._resources)}
             logger.info(f"Loaded {len(self._resources)} resources")
 
-            # Load access grants
-            cursor = conn.execute("""
-                SELECT ag.* FROM access_grants ag
-                JOIN employees e ON ag.employee_id = e.id
-                WHERE e.status = 'Active'
-            """)
-            self._access_grants = [dict(row) for row in cursor.fetchall()]
-            logger.info(f"Loaded {len(self._access_grants)} access grants")
+        self._lobs_with_employees = set()
+
+    def _resolve_lob_id(self, lob_filter: str) -> Optional[str]:
+        """Resolve a LOB ID or LOB name to a LOB ID (None if the name is unknown)."""
+        # Support both LOB ID and LOB name
+        if lob_filter.startswith("lob_"):
+            return lob_filter
+
+        # Look up by name
+        lob_id = self._lob_id_by_name.get(lob_filter)
+        if lob_id:
+            return lob_id
+
+        logger.warning(f"LOB not found: {lob_filter}")
+        return None
+
+    def lob_has_employees(self, lob_id: str) -> bool:
+        """
+        Check whether a LOB has any active employees, without loading them.
+
+        Args:
+            lob_id: LOB ID
+
+        Returns:
+            True if at least one active employee belongs to the LOB
+        """
+        if lob_id in self._lobs_with_employees:
+            return True
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT 1 FROM employees e
+                JOIN teams t ON e.team_id = t.id
+                WHERE t.lob_id = ? AND e.status = 'Active'
+                LIMIT 1
+            """, (lob_id,)).fetchone()
+        if row is None:
+            return False
+        self._lobs_with_employees.add(lob_id)
+        return True
+
+    def _index_employees(self) -> None:
+        """Build id and manager -> direct reports lookups over the employee cache."""
+        self._employee_by_id = {e["id"]: e for e in self._employees}
+        self._emp_str_to_int = {emp_id: i for i, emp_id in enumerate(self._employee_by_id)}
+        reports_by_manager = defaultdict(set)
+        for e in self._employees:
+            reports_by_manager[e.get("manager_id")].add(e["id"])
+        self._reports_by_manager = dict(reports_by_manager)
+
+    def _intern_ids(self, row: Dict) -> Dict:
+        """
+        Add interned employee_idx / resource_idx ints to a grant or activity row.
+
+        IDs added since the reference data was loaded get the next free int,
+        so every distinct ID keeps a distinct key.
+        """
+        emp_ids = self._emp_str_to_int
+        res_ids = self._res_str_to_int
+        row["employee_idx"] = emp_ids.setdefault(row["employee_id"], len(emp_ids))
+        row["resource_idx"] = res_ids.setdefault(row["resource_id"], len(res_ids))
+        return row
+
+    def load_scoped_data(
+        self,
+        lob_id: Optional[str] = None
+    ) -> Tuple[List[Dict], List[Dict], Dict[Tuple[int, int], Dict]]:
+        """
+        Load active employees, their access grants and activity summaries for one scope.
 
-            # Load activity summaries
-            cursor = conn.execute("SELECT * FROM activity_summaries")
-            for row in cursor.fetchall():
-                row_dict = dict(row)
-                key = f"{row_dict['employee_id']}:{row_dict['resource_id']}"
-                self._activity_summaries[key] = row_dict
-            logger.info(f"Loaded {len(self._activity_summaries)} activity summaries")
+        The LOB filter is applied in SQL (employees -> teams join), so only the
+        scoped rows are read into Python. Without a LOB filter the teams join
+        is skipped and grants/activity are semi-joined on active employees.
 
-        finally:
-            conn.close()
+        Args:
+            lob_id: LOB ID to restrict to, or None for all LOBs
+
+        Returns:
+            Tuple of (employees, access_grants, activity_summaries keyed by
+            (employee_idx, resource_idx)). Grant and activity rows carry
+            interned "employee_idx" / "resource_idx" ints.
+        """
+        if lob_id is None:
+            employee_sql = """
+                SELECT e.* FROM employees e
+                WHERE e.status = 'Active'
+                ORDER BY e.rowid
+            """
+            # Unary + keeps SQLite on a rowid-ordered scan with an in-memory
+            # membership test rather than an index search plus a sort
+            scope_sql = """
+                WHERE +{alias}.employee_id IN (SELECT id FROM employees WHERE status = 'Active')
+            """
+            params: Tuple[str, ...] = ()
+        else:
+            if not self.lob_has_employees(lob_id):
+                logger.info(f"No active employees in LOB {lob_id}, skipping scoped loads")
+                return [], [], {}
+
+            employee_sql = """
+                SELECT e.* FROM employees e
+                JOIN teams t ON e.team_id = t.id
+                WHERE e.status = 'Active' AND t.lob_id = ?
+                ORDER BY e.rowid
+            """
+            scope_sql = """
+                JOIN employees e ON {alias}.employee_id = e.id
+                JOIN teams t ON e.team_id = t.id
+                WHERE e.status = 'Active' AND t.lob_id = ?
+            """
+            params = (lob_id,)
+
+        with self._connect() as conn:
+            cursor = conn.execute(employee_sql, params)
+            employees = _rows_as_dicts(cursor)
+            logger.info(f"Loaded {len(employees)} employees in scope")
+
+            cursor = conn.execute(
+                "SELECT ag.* FROM access_grants ag"
+                + scope_sql.format(alias="ag")
+                + " ORDER BY ag.rowid",
+                params
+            )
+            access_grants = [self._intern_ids(row) for row in _rows_as_dicts(cursor)]
+            logger.info(f"Loaded {len(access_grants)} access grants")
+
+            cursor = conn.execute(
+                "SELECT a.* FROM activity_summaries a"
+                + scope_sql.format(alias="a")
+                + " ORDER BY a.rowid",
+                params
+            )
+            activity_summaries = {}
+            for row in _rows_as_dicts(cursor):
+                row_dict = self._intern_ids(row)
+                activity_summaries[(row_dict["employee_idx"], row_dict["resource_idx"])] = row_dict
+            logger.info(f"Loaded {len(activity_summaries)} activity summaries")
+
+        return employees, access_grants, activity_summaries
 
     def run_analysis(
         self,
@@ -161,30 +389,19 @@ class AnalyticsEngine:
         """
         logger.info("Starting analytics pipeline...")
 
-        # Filter employees if LOB specified
-        if lob_filter:
-            # Support both LOB ID and LOB name
-            lob_id = lob_filter
-            if not lob_filter.startswith("lob_"):
-                # Look up by name
-                matching_lobs = [l for l in self._lobs if l.get("name") == lob_filter]
-                if matching_lobs:
-                    lob_id = matching_lobs[0]["id"]
-                else:
-                    logger.warning(f"LOB not found: {lob_filter}")
-                    lob_id = None
+        # Resolve LOB filter; the scoped rows themselves are selected in SQL
+        lob_id = self._resolve_lob_id(lob_filter) if lob_filter else None
 
+        employees: List[Dict]
+        access_grants: List[Dict]
+        activity_summaries: Dict[Tuple[int, int], Dict]
+        if lob_filter and (not lob_id or not self.lob_has_employees(lob_id)):
+            logger.warning(f"No employees found for LOB filter: {lob_filter}")
+            employees, access_grants, activity_summaries = [], [], {}
+        else:
+            employees, access_grants, activity_summaries = self.load_scoped_data(lob_id)
             if lob_id:
-                team_ids_in_lob = {
-                    t["id"] for t in self._teams if t.get("lob_id") == lob_id
-                }
-                employees = [e for e in self._employees if e.get("team_id") in team_ids_in_lob]
                 logger.info(f"Filtered to {len(employees)} employees in LOB {lob_filter} (id: {lob_id})")
-            else:
-                employees = []
-                logger.warning(f"No employees found for LOB filter: {lob_filter}")
-        else:
-            employees = self._employees
 
         employee_ids = [e["id"] for e in employees]
 
@@ -206,20 +423,6 @@ class AnalyticsEngine:
                 clustering_disagreement_count=0
             )
 
-        # Filter access grants to these employees
-        employee_id_set = set(employee_ids)
-        access_grants = [
-            g for g in self._access_grants
-            if g["employee_id"] in employee_id_set
-        ]
-        logger.info(f"Filtered to {len(access_grants)} access grants")
-
-        # Filter activity summaries
-        activity_summaries = {
-            k: v for k, v in self._activity_summaries.items()
-            if v["employee_id"] in employee_id_set
-        }
-
         # Step 1: Extract features
         logger.info("Step 1: Extracting employee features...")
         features = self.proximity_calculator.extract_features(
@@ -232,11 +435,24 @@ class AnalyticsEngine:
 
         # Step 2: Calculate proximity matrix
         logger.info("Step 2: Calculating proximity matrix...")
-        proximity_matrix = self.proximity_calculator.calculate_pairwise_proximity_matrix(
-            employee_ids=employee_ids,
-            features=features,
-            block_by_lob=block_by_lob
-        )
+        cache_key = None
+        proximity_matrix = None
+        if self.proximity_cache_dir is not None:
+            cache_key = self._proximity_cache_key(employee_ids, features, block_by_lob)
+            proximity_matrix = self._load_cached_proximity(cache_key, employee_ids)
+        if proximity_matrix is None:
+            proximity_matrix = self.proximity_calculator.calculate_pairwise_proximity_matrix(
+                employee_ids=employee_ids,
+                features=features,
+                block_by_lob=block_by_lob
+            )
+            if cache_key is not None:
+                self._save_cached_proximity(cache_key, employee_ids, proximity_matrix)
+                # Swap the private copy for the file mapping, whose page-cache
+                # pages are shared with every other process reading it
+                mapped = self._load_cached_proximity(cache_key, employee_ids)
+                if mapped is not None:
+                    proximity_matrix = mapped
 
         # Step 3: Run clustering
         logger.info("Step 3: Running multi-strategy clustering...")
@@ -262,13 +478,23 @@ class AnalyticsEngine:
             activity_summaries=activity_summaries
         )
 
-        # Calculate summary statistics
-        high_assurance = sum(1 for s in assurance_scores.values() if s.classification == "high_assurance")
-        medium_assurance = sum(1 for s in assurance_scores.values() if s.classification == "medium_assurance")
-        low_assurance = sum(1 for s in assurance_scores.values() if s.classification == "low_assurance")
-        auto_eligible = sum(1 for s in assurance_scores.values() if s.auto_certify_eligible)
-        needs_review = sum(1 for c in consensus_results.values() if c.needs_human_review)
-        disagreements = sum(1 for c in consensus_results.values() if c.consensus_score < 0.7)
+        # Calculate summary statistics from the array view
+        assurance_arrays = AssuranceArrays.from_scores(assurance_scores)
+        classification_counts = assurance_arrays.classification_counts()
+        high_assurance = classification_counts["high_assurance"]
+        medium_assurance = classification_counts["medium_assurance"]
+        low_assurance = classification_counts["low_assurance"]
+        auto_eligible = int(assurance_arrays.auto_certify_eligible.sum())
+
+        scores_by_employee = defaultdict(list)
+        for s in assurance_scores.values():
+            scores_by_employee[s.employee_id].append(s)
+
+        needs_review = 0
+        disagreements = 0
+        for c in consensus_results.values():
+            needs_review += c.needs_human_review
+            disagreements += c.consensus_score < 0.7
 
         result = AnalyticsResult(
             employee_features=features,
@@ -282,7 +508,9 @@ class AnalyticsEngine:
             low_assurance_count=low_assurance,
             auto_certify_eligible_count=auto_eligible,
             needs_human_review_count=needs_review,
-            clustering_disagreement_count=disagreements
+            clustering_disagreement_count=disagreements,
+            scores_by_employee=dict(scores_by_employee),
+            assurance_arrays=assurance_arrays
         )
 
         logger.info("Analytics pipeline complete!")
@@ -290,31 +518,157 @@ class AnalyticsEngine:
 
         return result
 
+    def _proximity_cache_key(
+        self,
+        employee_ids: List[str],
+        features: Dict[str, EmployeeFeatures],
+        block_by_lob: bool
+    ) -> str:
+        """
+        Hash everything the proximity matrix depends on into a cache key.
+
+        Tenure and time in role are part of the temporal proximity, so the
+        key (and with it the cache) changes every day.
+        """
+        w = self.proximity_calculator.weights
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps([
+            FEATURE_VERSION,
+            [w.structural, w.functional, w.behavioral, w.temporal],
+            block_by_lob,
+            employee_ids
+        ]).encode())
+        for emp_id in employee_ids:
+            feat = features.get(emp_id)
+            if feat is None:
+                digest.update(b"\0")
+                continue
+            digest.update(repr((
+                feat.manager_id, feat.team_id, feat.sub_lob_id, feat.lob_id, feat.location_id,
+                feat.job_title, feat.job_code, feat.job_family, feat.job_level, feat.cost_center_id,
+                sorted(feat.access_set), sorted(feat.activity_vector.items()),
+                feat.tenure_days, feat.time_in_role_days, feat.hire_quarter
+            )).encode())
+        return digest.hexdigest()
+
+    def _load_cached_proximity(self, key: str, employee_ids: List[str]) -> Optional[np.ndarray]:
+        """Memory-map a persisted proximity matrix, or None if absent or stale."""
+        if self.proximity_cache_dir is None:
+            return None
+        matrix_path = self.proximity_cache_dir / f"{key}.npy"
+        sidecar_path = self.proximity_cache_dir / f"{key}.json"
+        if not matrix_path.exists() or not sidecar_path.exists():
+            return None
+
+        try:
+            with open(sidecar_path) as f:
+                cached_ids = json.load(f)["employee_ids"]
+            if cached_ids != employee_ids:
+                return None
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable proximity cache {matrix_path}: {e}")
+            return None
+
+        if matrix.shape != (len(employee_ids), len(employee_ids)):
+            return None
+
+        try:
+            # Mark as recently used so pruning keeps it
+            os.utime(matrix_path)
+        except OSError:
+            pass
+        logger.info(f"Loaded cached proximity matrix {matrix_path}")
+        return matrix
+
+    def _save_cached_proximity(self, key: str, employee_ids: List[str], matrix: np.ndarray) -> None:
+        """Persist a proximity matrix and its employee order sidecar."""
+        if self.proximity_cache_dir is None:
+            return
+        try:
+            self.proximity_cache_dir.mkdir(parents=True, exist_ok=True)
+            # Workers sharing the directory may save the same key at once, so
+            # each writes its own temp file and publishes it with os.replace
+            self._replace_atomically(
+                self.proximity_cache_dir / f"{key}.npy", ".tmp.npy",
+                lambda f: np.save(f, matrix)
+            )
+            self._replace_atomically(
+                self.proximity_cache_dir / f"{key}.json", ".tmp.json",
+                lambda f: f.write(json.dumps({"employee_ids": employee_ids}).encode())
+            )
+        except OSError as e:
+            logger.warning(f"Could not persist proximity matrix: {e}")
+        self._prune_proximity_cache()
+
+    @staticmethod
+    def _replace_atomically(path: Path, suffix: str, write: Callable[[IO[bytes]], Any]) -> None:
+        """Write a file through a uniquely named temp file in the same directory."""
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=suffix, delete=False) as f:
+            tmp_path = f.name
+            try:
+                write(f)
+            except BaseException:
+                f.close()
+                os.unlink(tmp_path)
+                raise
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def _prune_proximity_cache(self) -> None:
+        """Delete all but the most recently used proximity_cache_max_entries matrices."""
+        if self.proximity_cache_dir is None:
+            return
+        entries = []
+        for matrix_path in self.proximity_cache_dir.glob("*.npy"):
+            if matrix_path.name.endswith(".tmp.npy"):
+                continue
+            try:
+                entries.append((matrix_path.stat().st_mtime, matrix_path))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        for _, matrix_path in entries[self.proximity_cache_max_entries:]:
+            try:
+                # Processes that already mapped the matrix keep their mapping
+                matrix_path.unlink()
+                matrix_path.with_suffix(".json").unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not prune proximity cache {matrix_path}: {e}")
+
     def _log_summary(self, result: AnalyticsResult) -> None:
         """Log summary of analytics result."""
         total = result.total_grants
-        if total == 0:
+        if total == 0 or not logger.isEnabledFor(logging.INFO):
             return
 
-        logger.info("=" * 60)
-        logger.info("ANALYTICS SUMMARY")
-        logger.info("=" * 60)
-        logger.info(f"Total Employees: {result.total_employees:,}")
-        logger.info(f"Total Access Grants: {result.total_grants:,}")
-        logger.info("-" * 60)
-        logger.info(f"High Assurance: {result.high_assurance_count:,} ({result.high_assurance_count/total*100:.1f}%)")
-        logger.info(f"Medium Assurance: {result.medium_assurance_count:,} ({result.medium_assurance_count/total*100:.1f}%)")
-        logger.info(f"Low Assurance: {result.low_assurance_count:,} ({result.low_assurance_count/total*100:.1f}%)")
-        logger.info("-" * 60)
-        logger.info(f"Auto-Certify Eligible: {result.auto_certify_eligible_count:,} ({result.auto_certify_eligible_count/total*100:.1f}%)")
-        logger.info(f"Clustering Disagreements: {result.clustering_disagreement_count:,}")
-        logger.info("=" * 60)
+        lines = [
+            "=" * 60,
+            "ANALYTICS SUMMARY",
+            "=" * 60,
+            f"Total Employees: {result.total_employees:,}",
+            f"Total Access Grants: {result.total_grants:,}",
+            "-" * 60,
+            f"High Assurance: {result.high_assurance_count:,} ({result.high_assurance_count/total*100:.1f}%)",
+            f"Medium Assurance: {result.medium_assurance_count:,} ({result.medium_assurance_count/total*100:.1f}%)",
+            f"Low Assurance: {result.low_assurance_count:,} ({result.low_assurance_count/total*100:.1f}%)",
+            "-" * 60,
+            f"Auto-Certify Eligible: {result.auto_certify_eligible_count:,} ({result.auto_certify_eligible_count/total*100:.1f}%)",
+            f"Clustering Disagreements: {result.clustering_disagreement_count:,}",
+            "=" * 60,
+        ]
+        # One record, so the block is not interleaved with other threads' logs
+        logger.info("\n".join(lines))
 
     def get_review_items(
         self,
         result: AnalyticsResult,
         reviewer_employee_id: str,
-        include_auto_certified: bool = False
+        include_auto_certified: bool = False,
+        limit: Optional[int] = None
     ) -> List[Dict]:
         """
         Get review items for a specific reviewer (manager).
@@ -323,33 +677,50 @@ class AnalyticsEngine:
             result: AnalyticsResult from run_analysis()
             reviewer_employee_id: Employee ID of the reviewer
             include_auto_certified: Whether to include auto-certified items
+            limit: Return only the first N items (lowest scores); None for all
 
         Returns:
             List of review items with scores and explanations
         """
         # Find direct reports
-        direct_reports = {
-            e["id"] for e in self._employees
-            if e.get("manager_id") == reviewer_employee_id
-        }
+        direct_reports = self._reports_by_manager.get(reviewer_employee_id, set())
 
         if not direct_reports:
             return []
 
-        # Get grants for direct reports
-        review_items = []
-        for grant_id, score in result.assurance_scores.items():
-            if score.employee_id not in direct_reports:
-                continue
+        arrays = result.assurance_arrays
+        if arrays is None:
+            arrays = AssuranceArrays.from_scores(result.assurance_scores)
 
-            if not include_auto_certified and score.auto_certify_eligible:
-                continue
+        # Select direct reports' grants with array masks
+        report_positions = [
+            pos for pos in map(arrays.employee_position, direct_reports) if pos is not None
+        ]
+        mask = np.isin(arrays.employee_idx, report_positions)
+        if not include_auto_certified:
+            mask &= ~arrays.auto_certify_eligible
+        rows = np.flatnonzero(mask)
+
+        # Sort by assurance score ascending (lowest first = most attention needed)
+        rows = _lowest_scores_first(arrays.overall_score, rows, limit)
+
+        # Materialize only the selected items
+        return self._materialize_review_items(result, arrays, rows)
+
+    def _materialize_review_items(
+        self,
+        result: AnalyticsResult,
+        arrays: AssuranceArrays,
+        rows: np.ndarray
+    ) -> List[Dict]:
+        """Build review item dicts for the given AssuranceArrays rows, in order."""
+        review_items = []
+        for row in rows:
+            grant_id = arrays.grant_ids[row]
+            score = result.assurance_scores[grant_id]
 
             # Get employee name
-            employee = next(
-                (e for e in self._employees if e["id"] == score.employee_id),
-                {}
-            )
+            employee = self._employee_by_id.get(score.employee_id, {})
 
             # Get consensus info
             consensus = result.consensus_results.get(score.employee_id)
@@ -378,11 +749,62 @@ class AnalyticsEngine:
 
             review_items.append(review_item)
 
-        # Sort by assurance score ascending (lowest first = most attention needed)
-        review_items.sort(key=lambda x: x["assurance_score"])
-
         return review_items
 
+    def get_all_review_items(
+        self,
+        result: AnalyticsResult,
+        reviewer_ids: Optional[List[str]] = None,
+        include_auto_certified: bool = False
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get review items for many reviewers in one pass.
+
+        Rows for every reviewer are selected and ordered with a single
+        lexsort over (reviewer, assurance score).
+
+        Args:
+            result: AnalyticsResult from run_analysis()
+            reviewer_ids: Reviewer employee IDs (default: every manager)
+            include_auto_certified: Whether to include auto-certified items
+
+        Returns:
+            Dictionary mapping reviewer ID to its items, as get_review_items() returns
+        """
+        if reviewer_ids is None:
+            reviewer_ids = [m for m in self._reports_by_manager if m]
+
+        arrays = result.assurance_arrays
+        if arrays is None:
+            arrays = AssuranceArrays.from_scores(result.assurance_scores)
+
+        # Reviewer code of every array employee (-1 = manager not requested)
+        reviewer_code: Dict[Optional[str], int] = {r: i for i, r in enumerate(reviewer_ids)}
+        employee_reviewer = np.fromiter(
+            (
+                reviewer_code.get(self._employee_by_id.get(e, {}).get("manager_id"), -1)
+                for e in arrays.employee_ids
+            ),
+            dtype=np.int64, count=len(arrays.employee_ids)
+        )
+        row_reviewer = employee_reviewer[arrays.employee_idx]
+        mask = row_reviewer >= 0
+        if not include_auto_certified:
+            mask &= ~arrays.auto_certify_eligible
+        rows = np.flatnonzero(mask)
+
+        # Group by reviewer, lowest score first within each (lexsort is stable)
+        rows = rows[np.lexsort((arrays.overall_score[rows], row_reviewer[rows]))]
+        bounds = np.searchsorted(row_reviewer[rows], np.arange(len(reviewer_ids) + 1))
+        rows_by_reviewer = [
+            (r, rows[bounds[i]:bounds[i + 1]]) for i, r in enumerate(reviewer_ids)
+        ]
+
+        return {
+            r: self._materialize_review_items(result, arrays, r_rows)
+            for r, r_rows in rows_by_reviewer
+        }
+
     def get_employee_access_summary(
         self,
         result: AnalyticsResult,
@@ -392,28 +814,25 @@ class AnalyticsEngine:
         Get complete access summary for a single employee.
         """
         # Get employee info
-        employee = next(
-            (e for e in self._employees if e["id"] == employee_id),
-            {}
-        )
+        employee = self._employee_by_id.get(employee_id, {})
 
         if not employee:
             return {}
 
         # Get their grants
-        employee_grants = [
-            score for score in result.assurance_scores.values()
-            if score.employee_id == employee_id
-        ]
+        employee_grants = result.scores_by_employee.get(employee_id, [])
 
         # Get consensus info
         consensus = result.consensus_results.get(employee_id)
 
-        # Categorize grants
-        high = [g for g in employee_grants if g.classification == "high_assurance"]
-        medium = [g for g in employee_grants if g.classification == "medium_assurance"]
-        low = [g for g in employee_grants if g.classification == "low_assurance"]
-        dormant = [g for g in employee_grants if g.usage_pattern == "dormant"]
+        # Categorize grants in one pass
+        classification_counts: Counter[str] = Counter()
+        dormant_count = 0
+        auto_eligible = 0
+        for g in employee_grants:
+            classification_counts[g.classification] += 1
+            dormant_count += g.usage_pattern == "dormant"
+            auto_eligible += g.auto_certify_eligible
 
         return {
             "employee_id": employee_id,
@@ -422,11 +841,11 @@ class AnalyticsEngine:
             "team_id": employee.get("team_id"),
             "manager_id": employee.get("manager_id"),
             "total_grants": len(employee_grants),
-            "high_assurance_count": len(high),
-            "medium_assurance_count": len(medium),
-            "low_assurance_count": len(low),
-            "dormant_access_count": len(dormant),
-            "auto_certify_eligible": sum(1 for g in employee_grants if g.auto_certify_eligible),
+            "high_assurance_count": classification_counts["high_assurance"],
+            "medium_assurance_count": classification_counts["medium_assurance"],
+            "low_assurance_count": classification_counts["low_assurance"],
+            "dormant_access_count": dormant_count,
+            "auto_certify_eligible": auto_eligible,
             "peer_count": consensus.peer_count if consensus else 0,
             "clustering_consensus": consensus.consensus_score if consensus else 0,
             "needs_clustering_review": consensus.needs_human_review if consensus else False,
@@ -448,62 +867,151 @@ class AnalyticsEngine:
     def export_results(
         self,
         result: AnalyticsResult,
-        output_path: str
+        output_path: str,
+        pretty: bool = False
     ) -> None:
         """
         Export analytics results to JSON file.
+
+        Sections are streamed to the file one entry at a time rather than
+        built into a single dict first; entries are encoded with orjson when
+        it is installed. Encoded entries are kept on the result, so exporting
+        the same (unmodified) result again only writes the cached bytes.
+
+        Args:
+            result: AnalyticsResult from run_analysis()
+            output_path: Destination JSON file
+            pretty: Indent the whole document for human inspection (builds it
+                in memory first; orjson's OPT_INDENT_2 when installed)
         """
         logger.info(f"Exporting results to {output_path}")
 
-        # Convert to serializable format
-        export_data = {
-            "summary": {
-                "total_employees": result.total_employees,
-                "total_grants": result.total_grants,
-                "high_assurance_count": result.high_assurance_count,
-                "medium_assurance_count": result.medium_assurance_count,
-                "low_assurance_count": result.low_assurance_count,
-                "auto_certify_eligible_count": result.auto_certify_eligible_count,
-                "needs_human_review_count": result.needs_human_review_count,
-                "clustering_disagreement_count": result.clustering_disagreement_count
-            },
-            "assurance_scores": {
-                grant_id: {
-                    "grant_id": score.grant_id,
-                    "employee_id": score.employee_id,
-                    "resource_id": score.resource_id,
-                    "resource_name": score.resource_name,
-                    "resource_sensitivity": score.resource_sensitivity,
-                    "overall_score": score.overall_score,
-                    "classification": score.classification,
-                    "auto_certify_eligible": score.auto_certify_eligible,
-                    "peer_typicality": score.peer_typicality,
-                    "peer_percentage": score.peer_percentage,
-                    "usage_pattern": score.usage_pattern,
-                    "usage_factor": score.usage_factor,
-                    "explanations": score.explanations
-                }
+        summary = {
+            "total_employees": result.total_employees,
+            "total_grants": result.total_grants,
+            "high_assurance_count": result.high_assurance_count,
+            "medium_assurance_count": result.medium_assurance_count,
+            "low_assurance_count": result.low_assurance_count,
+            "auto_certify_eligible_count": result.auto_certify_eligible_count,
+            "needs_human_review_count": result.needs_human_review_count,
+            "clustering_disagreement_count": result.clustering_disagreement_count
+        }
+        sections: Dict[str, Iterator[Tuple[str, Dict[str, Any]]]] = {
+            "assurance_scores": (
+                (grant_id, self._score_export(score))
                 for grant_id, score in result.assurance_scores.items()
-            },
-            "consensus_results": {
-                emp_id: {
-                    "employee_id": consensus.employee_id,
-                    "consensus_score": consensus.consensus_score,
-                    "strategies_agreeing": consensus.strategies_agreeing,
-                    "total_strategies": consensus.total_strategies,
-                    "peer_count": consensus.peer_count,
-                    "needs_human_review": consensus.needs_human_review,
-                    "disagreement_reason": consensus.disagreement_reason
-                }
+            ),
+            "consensus_results": (
+                (emp_id, self._consensus_export(consensus))
                 for emp_id, consensus in result.consensus_results.items()
-            }
+            )
         }
 
-        with open(output_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        if pretty:
+            export_data: Dict[str, Any] = {"summary": summary}
+            export_data.update({name: dict(entries) for name, entries in sections.items()})
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(
+                        export_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                    ))
+            else:
+                with open(output_path, 'w') as f:
+                    json.dump(export_data, f, indent=2, default=_json_default)
+        else:
+            with open(output_path, 'wb') as f:
+                f.write(b'{"summary":')
+                f.write(_dumps(summary))
+                for name, entries in sections.items():
+                    f.write(b',' + _dumps(name) + b':{')
+                    encoded = result._export_cache.get(name)
+                    if encoded is None:
+                        encoded = [_dumps(key) + b':' + _dumps(value) for key, value in entries]
+                        result._export_cache[name] = encoded
+                    f.write(b','.join(encoded))
+                    f.write(b'}')
+                f.write(b'}')
 
         logger.info(f"Results exported to {output_path}")
 
+    @staticmethod
+    def _score_export(score: AssuranceScore) -> Dict[str, Any]:
+        """Serializable form of one assurance score."""
+        return {
+            "grant_id": score.grant_id,
+            "employee_id": score.employee_id,
+            "resource_id": score.resource_id,
+            "resource_name": score.resource_name,
+            "resource_sensitivity": score.resource_sensitivity,
+            "overall_score": score.overall_score,
+            "classification": score.classification,
+            "auto_certify_eligible": score.auto_certify_eligible,
+            "peer_typicality": score.peer_typicality,
+            "peer_percentage": score.peer_percentage,
+            "usage_pattern": score.usage_pattern,
+            "usage_factor": score.usage_factor,
+            "explanations": score.explanations
+        }
+
+    @staticmethod
+    def _consensus_export(consensus: ConsensusResult) -> Dict[str, Any]:
+        """Serializable form of one consensus result."""
+        return {
+            "employee_id": consensus.employee_id,
+            "consensus_score": consensus.consensus_score,
+            "strategies_agreeing": consensus.strategies_agreeing,
+            "total_strategies": consensus.total_strategies,
+            "peer_count": consensus.peer_count,
+            "needs_human_review": consensus.needs_human_review,
+            "disagreement_reason": consensus.disagreement_reason
+        }
+
+
+def _lowest_scores_first(
+    scores: np.ndarray,
+    rows: np.ndarray,
+    limit: Optional[int] = None
+) -> np.ndarray:
+    """
+    Order rows by ascending score, ties in row order, keeping at most limit.
+
+    With a limit below len(rows), the limit lowest scores are picked with
+    argpartition first so only those are sorted. Boundary ties are
+    resolved in row order, so the result always equals the first limit
+    entries of the full stable sort.
+    """
+    row_scores = scores[rows]
+    if limit is not None and limit < len(rows):
+        if limit <= 0:
+            return rows[:0]
+        cutoff = np.partition(row_scores, limit - 1)[limit - 1]
+        below = row_scores < cutoff
+        at_cutoff = np.flatnonzero(row_scores == cutoff)[:limit - int(below.sum())]
+        keep = np.flatnonzero(below)
+        keep = np.sort(np.concatenate([keep, at_cutoff]))
+        rows, row_scores = rows[keep], row_scores[keep]
+    return rows[np.argsort(row_scores, kind="stable")]
+
+
+def _rows_as_dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+    """Fetch all rows as dicts by zipping plain tuples with the column names."""
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _dumps(value: Any) -> bytes:
+    """Compact JSON encoding as bytes (orjson if available)."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, separators=(",", ":"), default=_json_default).encode()
+
+
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for numpy scalars in the stdlib json path."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
 # CLI for testing
 if __name__ == "__main__":
@@ -518,10 +1026,18 @@ if __name__ == "__main__":
     parser.add_argument("--db", required=True, help="Path to SQLite database")
     parser.add_argument("--output", default="analytics_results.json", help="Output JSON file")
     parser.add_argument("--lob", default=None, help="Filter by LOB ID")
+    parser.add_argument("--proximity-cache", default=None, help="Directory to persist proximity matrices")
+    parser.add_argument("--proximity-cache-entries", type=int, default=4,
+                        help="Proximity matrices to keep in --proximity-cache")
+    parser.add_argument("--pretty", action="store_true", help="Indent the output JSON")
 
     args = parser.parse_args()
 
-    engine = AnalyticsEngine(db_path=args.db)
-    engine.load_data()
+    engine = AnalyticsEngine(
+        db_path=args.db,
+        proximity_cache_dir=args.proximity_cache,
+        proximity_cache_max_entries=args.proximity_cache_entries
+    )
+    engine.load_data(lob_filter=args.lob)
     result = engine.run_analysis(lob_filter=args.lob)
-    engine.export_results(result, args.output)
+    engine.export_results(result, args.output, pretty=args.pretty)
@@ -14,18 +14,29 @@ Dimensions:
 Author: Chiradeep Chhaya
 """
 
+import copy
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Set
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Set
 import numpy as np
+import pandas as pd
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Bump when feature extraction or proximity formulas change, so persisted
+# proximity matrices computed by older code are not reused
+FEATURE_VERSION = 2
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ProximityWeights:
-    """Configurable weights for proximity dimensions."""
+    """Configurable weights for proximity dimensions (immutable; normalize() returns a copy)."""
     structural: float = 0.25
     functional: float = 0.35
     behavioral: float = 0.30
@@ -36,6 +47,10 @@ class ProximityWeights:
         total = self.structural + self.functional + self.behavioral + self.temporal
         return abs(total - 1.0) < 0.001
 
+    def as_tuple(self) -> Tuple[float, float, float, float]:
+        """(structural, functional, behavioral, temporal)."""
+        return (self.structural, self.functional, self.behavioral, self.temporal)
+
     def normalize(self) -> "ProximityWeights":
         """Normalize weights to sum to 1.0."""
         total = self.structural + self.functional + self.behavioral + self.temporal
@@ -49,7 +64,7 @@ class ProximityWeights:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EmployeeFeatures:
     """Extracted features for an employee."""
     employee_id: str
@@ -77,6 +92,426 @@ class EmployeeFeatures:
     time_in_role_days: int = 0
     hire_quarter: str = ""  # e.g., "2023-Q1"
 
+    # Interned int codes of the categorical fields above (-1 = missing/empty
+    # or not interned), assigned by the extracting calculator
+    manager_idx: int = -1
+    team_idx: int = -1
+    sub_lob_idx: int = -1
+    lob_idx: int = -1
+    location_idx: int = -1
+    job_code_idx: int = -1
+    job_family_idx: int = -1
+    cost_center_idx: int = -1
+    hire_quarter_idx: int = -1
+
+
+# Hash functions per MinHash signature (estimate std. error ~ 1/sqrt(k))
+MINHASH_PERMUTATIONS = 128
+
+# Up to this many resource columns, access Jaccard is counted on packed
+# uint64 bitsets with popcount rather than with a sparse product
+BITSET_MAX_RESOURCES = 1024
+
+# Up to this many resource columns, activity cosine is a dense BLAS product;
+# the product is nearly dense anyway, and dense GEMM beats sparse x sparse
+DENSE_ACTIVITY_MAX_RESOURCES = 4096
+
+# Pairwise blocks are scored in tiles of at most this many rows x cols,
+# bounding the size of every per-component temporary
+PROXIMITY_TILE = 1024
+
+# Proximity scores need nowhere near float64 precision; float32 halves the
+# memory and bandwidth of every matrix and per-component temporary
+PROXIMITY_DTYPE = np.float32
+
+# Categorical EmployeeFeatures fields -> their interned code fields
+CATEGORICAL_FIELDS = {
+    "manager_id": "manager_idx",
+    "team_id": "team_idx",
+    "sub_lob_id": "sub_lob_idx",
+    "lob_id": "lob_idx",
+    "location_id": "location_idx",
+    "job_code": "job_code_idx",
+    "job_family": "job_family_idx",
+    "cost_center_id": "cost_center_idx",
+    "hire_quarter": "hire_quarter_idx",
+}
+
+
+@dataclass
+class FeatureArrays:
+    """
+    Struct-of-arrays view of EmployeeFeatures for an ordered list of employees.
+
+    Row i describes employee_ids[i]. Categorical fields are interned to
+    int32 codes, with -1 where the value is missing or empty (never equal
+    to anything, as in the scalar comparisons). has_features marks rows
+    whose employee had an EmployeeFeatures entry.
+    """
+    employee_ids: List[str]
+    features: List[Optional[EmployeeFeatures]]
+    has_features: np.ndarray  # bool
+
+    # Structural codes
+    manager: np.ndarray
+    team: np.ndarray
+    sub_lob: np.ndarray
+    lob: np.ndarray
+    location: np.ndarray
+
+    # Functional codes and level
+    job_code: np.ndarray
+    job_family: np.ndarray
+    cost_center: np.ndarray
+    job_level: np.ndarray  # int64
+
+    # Temporal
+    tenure_days: np.ndarray  # int64
+    time_in_role_days: np.ndarray  # int64
+    hire_quarter: np.ndarray
+
+    # Behavioral: employees x resources scipy CSR matrices over one resource
+    # column space: 0/1 access, and L2-normalized activity intensities
+    access: Any = None
+    activity: Any = None
+
+    # MinHash signatures of the access sets, built on first use
+    _minhash: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _access_bits: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _activity_dense: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _positions: Optional[Dict[str, int]] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_features(
+        cls,
+        employee_ids: List[str],
+        features: Dict[str, EmployeeFeatures],
+        interners: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> "FeatureArrays":
+        """
+        Build the arrays in one pass per field over the feature objects.
+
+        Args:
+            employee_ids: Row order
+            features: Feature dictionary
+            interners: The extracting calculator's field -> value -> code
+                tables. Codes already on the features are read as-is; values
+                without one are interned into these tables (or into
+                call-local tables, ignoring stored codes, when None).
+        """
+        feats = [features.get(emp_id) for emp_id in employee_ids]
+        n = len(feats)
+
+        def intern(attr: str) -> np.ndarray:
+            code_attr = CATEGORICAL_FIELDS[attr]
+            codes = interners.setdefault(attr, {}) if interners is not None else {}
+            out = np.full(n, -1, dtype=np.int32)
+            for i, f in enumerate(feats):
+                if f is None:
+                    continue
+                code = getattr(f, code_attr) if interners is not None else -1
+                if code < 0:
+                    value = getattr(f, attr)
+                    if not value:
+                        continue
+                    code = codes.setdefault(value, len(codes))
+                out[i] = code
+            return out
+
+        def ints(attr: str) -> np.ndarray:
+            return np.fromiter(
+                ((getattr(f, attr) or 0) if f is not None else 0 for f in feats),
+                dtype=np.int64, count=n
+            )
+
+        from scipy.sparse import csr_matrix
+
+        # Resource columns in first-seen order
+        resource_cols: Dict[str, int] = {}
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indices: List[int] = []
+        act_indptr = np.zeros(n + 1, dtype=np.int64)
+        act_indices: List[int] = []
+        act_values: List[float] = []
+        for i, f in enumerate(feats):
+            if f is not None:
+                indices.extend(resource_cols.setdefault(r, len(resource_cols)) for r in f.access_set)
+                act_indices.extend(resource_cols.setdefault(r, len(resource_cols)) for r in f.activity_vector)
+                act_values.extend(f.activity_vector.values())
+            indptr[i + 1] = len(indices)
+            act_indptr[i + 1] = len(act_indices)
+        n_resources = len(resource_cols)
+        access = csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(n, n_resources)
+        )
+
+        # Row-normalize activity so cosine similarity is a plain dot product;
+        # all-zero rows stay zero (no cosine contribution)
+        act_data = np.asarray(act_values, dtype=np.float64)
+        act_counts = np.diff(act_indptr)
+        act_rows = np.repeat(np.arange(n), act_counts)
+        row_norms = np.sqrt(np.bincount(act_rows, weights=act_data ** 2, minlength=n))
+        row_norms[row_norms == 0] = 1.0
+        act_data /= row_norms[act_rows]
+        activity = csr_matrix(
+            (act_data.astype(PROXIMITY_DTYPE), np.asarray(act_indices, dtype=np.int32), act_indptr),
+            shape=(n, n_resources)
+        )
+
+        return cls(
+            employee_ids=list(employee_ids),
+            features=feats,
+            has_features=np.fromiter((f is not None for f in feats), dtype=bool, count=n),
+            manager=intern("manager_id"),
+            team=intern("team_id"),
+            sub_lob=intern("sub_lob_id"),
+            lob=intern("lob_id"),
+            location=intern("location_id"),
+            job_code=intern("job_code"),
+            job_family=intern("job_family"),
+            cost_center=intern("cost_center_id"),
+            job_level=ints("job_level"),
+            tenure_days=ints("tenure_days"),
+            time_in_role_days=ints("time_in_role_days"),
+            hire_quarter=intern("hire_quarter"),
+            access=access,
+            activity=activity
+        )
+
+    def position(self, employee_id: str) -> Optional[int]:
+        """Row of employee_id, or None if it is not in the view."""
+        if self._positions is None:
+            self._positions = {e: i for i, e in enumerate(self.employee_ids)}
+        return self._positions.get(employee_id)
+
+    def access_bits(self) -> np.ndarray:
+        """
+        Access sets as packed bitsets, shape (n, ceil(R / 64)) uint64.
+
+        Bit c of row i is set when employee i holds resource column c.
+        """
+        if self._access_bits is None:
+            n, n_resources = self.access.shape
+            words = max(1, (n_resources + 63) // 64)
+            dense = np.zeros((n, words * 64), dtype=np.uint8)
+            dense[np.repeat(np.arange(n), np.diff(self.access.indptr)), self.access.indices] = 1
+            self._access_bits = np.packbits(dense, axis=1, bitorder="little").view(np.uint64)
+        return self._access_bits
+
+    def activity_dense(self) -> np.ndarray:
+        """
+        The normalized activity matrix as a dense (n x R) float64 array.
+
+        Dense BLAS kernels can round differently depending on operand
+        alignment, so products are taken in float64 and only then rounded
+        to PROXIMITY_DTYPE, where that ~1e-16 noise no longer shows.
+        """
+        if self._activity_dense is None:
+            self._activity_dense = self.activity.toarray().astype(np.float64)
+        return self._activity_dense
+
+    def minhash_signatures(self, num_perm: int = MINHASH_PERMUTATIONS, seed: int = 0) -> np.ndarray:
+        """
+        MinHash signatures of the access sets, shape (n, num_perm) uint32.
+
+        Each hash is (a * col + b) mod (2^31 - 1) over resource columns;
+        rows with no access are all 0xFFFFFFFF. The fraction of equal
+        signature slots between two rows estimates their Jaccard index.
+        """
+        if self._minhash is not None and self._minhash.shape[1] == num_perm:
+            return self._minhash
+
+        prime = np.uint64((1 << 31) - 1)
+        rng = np.random.default_rng(seed)
+        a = rng.integers(1, int(prime), size=num_perm, dtype=np.uint64)
+        b = rng.integers(0, int(prime), size=num_perm, dtype=np.uint64)
+
+        n = len(self.employee_ids)
+        indptr = self.access.indptr
+        cols = self.access.indices.astype(np.uint64)
+        nonempty = np.flatnonzero(np.diff(indptr) > 0)
+        signatures = np.full((n, num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+
+        # A few hash functions at a time keeps the (nnz x chunk) temporary small
+        chunk = 8
+        for h0 in range(0, num_perm, chunk):
+            hashes = (cols[:, None] * a[None, h0:h0 + chunk] + b[None, h0:h0 + chunk]) % prime
+            if nonempty.size:
+                signatures[nonempty, h0:h0 + chunk] = np.minimum.reduceat(
+                    hashes, indptr[nonempty], axis=0
+                )
+
+        self._minhash = signatures
+        return signatures
+
+
+def _parse_iso_dates(
+    values: List[Optional[str]],
+    now_aware: datetime,
+    now_naive: datetime
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Days elapsed since, and year / month of, each ISO-8601 date string.
+
+    The column is parsed in one pandas call. Offset-aware dates count from
+    now_aware and naive ones from now_naive. A column mixing UTC offsets
+    falls back to per-value parsing. Missing or unparseable values give 0
+    for all three.
+
+    Returns:
+        Tuple of (days, years, months) lists of ints
+    """
+    try:
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), format="ISO8601", errors="coerce")
+    except ValueError:
+        return _parse_iso_dates_scalar(values, now_aware, now_naive)
+
+    now = pd.Timestamp(now_naive if parsed.dt.tz is None else now_aware)
+    days = (now - parsed).dt.days.fillna(0).astype(np.int64)
+    years = parsed.dt.year.fillna(0).astype(np.int64)
+    months = parsed.dt.month.fillna(0).astype(np.int64)
+    return days.tolist(), years.tolist(), months.tolist()
+
+
+def _parse_iso_dates_scalar(
+    values: List[Optional[str]],
+    now_aware: datetime,
+    now_naive: datetime
+) -> Tuple[List[int], List[int], List[int]]:
+    """Per-value datetime.fromisoformat() version of _parse_iso_dates()."""
+    days = [0] * len(values)
+    years = [0] * len(values)
+    months = [0] * len(values)
+    for i, value in enumerate(values):
+        if not value:
+            continue
+        try:
+            parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+        except (AttributeError, TypeError, ValueError):
+            continue
+        days[i] = ((now_aware if parsed.tzinfo else now_naive) - parsed).days
+        years[i] = parsed.year
+        months[i] = parsed.month
+    return days, years, months
+
+
+def _popcount_lookup(words: np.ndarray) -> np.ndarray:
+    """Set bits in each uint64 of words, via a 16-bit lookup table (NumPy < 2.0)."""
+    quarters = _POPCOUNT_16[words.view(np.uint16)]
+    return quarters.reshape(*words.shape, 4).sum(axis=-1, dtype=np.int64)
+
+
+# np.bitwise_count is new in NumPy 2.0; older releases count through a table
+_popcount: Callable[[np.ndarray], np.ndarray]
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT_16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+    _popcount = _popcount_lookup
+
+
+def _bitset_intersection(bits_rows: np.ndarray, bits_cols: np.ndarray) -> np.ndarray:
+    """
+    |A & B| for every (rows x cols) pair of packed bitsets.
+
+    Works one uint64 word at a time over bands of rows, so each
+    AND + popcount pass is a single vectorized op on a cache-sized block.
+    """
+    counts = np.zeros((len(bits_rows), len(bits_cols)), dtype=np.int64)
+    band = 256
+    for r0 in range(0, len(bits_rows), band):
+        block = counts[r0:r0 + band]
+        for w in range(bits_rows.shape[1]):
+            block += _popcount(bits_rows[r0:r0 + band, w, None] & bits_cols[None, :, w])
+    return counts
+
+
+def _add_if_same(
+    score: np.ndarray,
+    weight: float,
+    codes: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray
+) -> None:
+    """
+    Add weight in place to the (rows x cols) entries whose codes are equal and not missing.
+
+    Missing row codes are swapped for unique negatives first, so one
+    equality pass needs no separate mask, and the masked ufunc add leaves
+    non-matching entries untouched without a weighted temporary.
+    """
+    row_codes = codes[rows]
+    row_codes = np.where(row_codes >= 0, row_codes, -2 - np.arange(len(rows)))
+    same = row_codes[:, None] == codes[cols][None, :]
+    np.add(score, weight, out=score, where=same)
+
+
+def _manager_chain_distance(
+    manager_chains: Dict[str, List[str]],
+    employee_ids: List[str],
+    rows: np.ndarray,
+    cols: np.ndarray
+) -> np.ndarray:
+    """
+    Hops to the nearest common manager-chain ancestor for (rows x cols) pairs.
+
+    For every ancestor, the depths of the rows and columns whose chains
+    contain it are combined with one outer sum and min-reduced into the
+    result, so chains are never intersected per pair. Depth is the
+    ancestor's first position in the chain, as in the scalar path.
+    Pairs with no common ancestor are -1.
+    """
+    def ancestor_depths(idx: np.ndarray) -> Dict[str, Tuple[List[int], List[int]]]:
+        by_ancestor: Dict[str, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+        for pos, i in enumerate(idx):
+            seen = set()
+            for depth, ancestor in enumerate(manager_chains.get(employee_ids[i], [])):
+                if ancestor not in seen:
+                    seen.add(ancestor)
+                    positions, depths = by_ancestor[ancestor]
+                    positions.append(pos)
+                    depths.append(depth)
+        return by_ancestor
+
+    row_ancestors = ancestor_depths(rows)
+    col_ancestors = row_ancestors if rows is cols else ancestor_depths(cols)
+
+    no_common = np.iinfo(np.int64).max
+    dist = np.full((len(rows), len(cols)), no_common, dtype=np.int64)
+    for ancestor, (row_pos, row_depth) in row_ancestors.items():
+        if ancestor not in col_ancestors:
+            continue
+        col_pos, col_depth = col_ancestors[ancestor]
+        block = np.ix_(row_pos, col_pos)
+        dist[block] = np.minimum(dist[block], np.add.outer(row_depth, col_depth))
+    dist[dist == no_common] = -1
+    return dist
+
+
+def _gaussian_similarity(
+    values: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    sigma: float
+) -> np.ndarray:
+    """
+    exp(-diff^2 / 2 sigma^2) over (rows x cols), 0 where either value is not positive.
+
+    values are whole days, so the Gaussian is evaluated once per possible
+    |diff| into a lookup table and gathered per pair instead of calling
+    exp on every pair.
+    """
+    a = values[rows].astype(np.int32)[:, None]
+    b = values[cols].astype(np.int32)[None, :]
+    if a.size == 0 or b.size == 0:
+        return np.zeros((a.size, b.size), dtype=PROXIMITY_DTYPE)
+    span = int(max(a.max(), b.max())) - int(min(a.min(), b.min()))
+    lut = np.exp(-(np.arange(span + 1, dtype=PROXIMITY_DTYPE) ** 2) / (2 * sigma ** 2))
+    sim = np.take(lut, np.abs(a - b))
+    sim[~((a > 0) & (b > 0))] = 0.0
+    return sim
+
 
 class PeerProximityCalculator:
     """
@@ -99,6 +534,25 @@ class PeerProximityCalculator:
         self._manager_chain_cache: Dict[str, List[str]] = {}
         self._features_cache: Dict[str, EmployeeFeatures] = {}
 
+        # Categorical field -> value -> int code, shared by every extract
+        self._interners: Dict[str, Dict[str, int]] = {attr: {} for attr in CATEGORICAL_FIELDS}
+
+        # Last FeatureArrays view and the features dict it was built from;
+        # dropped by extract_features()
+        self._soa: Optional[FeatureArrays] = None
+        self._soa_features: Optional[Dict[str, EmployeeFeatures]] = None
+
+    @property
+    def weights(self) -> ProximityWeights:
+        """Proximity dimension weights."""
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights: ProximityWeights) -> None:
+        # Keep the unpacked weight floats in step for the scoring paths
+        self._weights = weights
+        self._w = weights.as_tuple()
+
     def extract_features(
         self,
         employees: List[Dict],
@@ -121,6 +575,8 @@ class PeerProximityCalculator:
             Dictionary mapping employee_id to EmployeeFeatures
         """
         logger.info(f"Extracting features for {len(employees)} employees")
+        self._soa = None
+        self._soa_features = None
 
         # Build lookup tables
         team_lookup = {t["id"]: t for t in teams}
@@ -142,9 +598,19 @@ class PeerProximityCalculator:
             intensity = min(count_30d / 100.0, 1.0)
             activity_by_employee[emp_id][res_id] = intensity
 
+        # Parse tenure dates as whole columns against one reference time
+        now_aware = datetime.now(timezone.utc)
+        now_naive = datetime.now()
+        tenure, hire_year, hire_month = _parse_iso_dates(
+            [emp.get("hire_date") for emp in employees], now_aware, now_naive
+        )
+        time_in_role, _, _ = _parse_iso_dates(
+            [emp.get("role_start_date") for emp in employees], now_aware, now_naive
+        )
+
         # Extract features for each employee
         features = {}
-        for emp in employees:
+        for i, emp in enumerate(employees):
             emp_id = emp["id"]
 
             # Get team and LOB info
@@ -156,32 +622,15 @@ class PeerProximityCalculator:
                 sub_lob = sub_lob_lookup.get(sub_lob_id)
                 lob_id = sub_lob.get("lob_id") if sub_lob else None
 
-            # Calculate tenure
-            from datetime import datetime
-            hire_date = emp.get("hire_date")
-            role_start_date = emp.get("role_start_date")
-
-            tenure_days = 0
-            time_in_role_days = 0
+            # Tenure (0 / "" when the date is missing or unparseable)
+            tenure_days = tenure[i]
+            time_in_role_days = time_in_role[i]
             hire_quarter = ""
+            if hire_month[i]:
+                quarter = (hire_month[i] - 1) // 3 + 1
+                hire_quarter = f"{hire_year[i]}-Q{quarter}"
 
-            if hire_date:
-                try:
-                    hd = datetime.fromisoformat(hire_date.replace("Z", "+00:00"))
-                    tenure_days = (datetime.now(hd.tzinfo) - hd).days if hd.tzinfo else (datetime.now() - hd).days
-                    quarter = (hd.month - 1) // 3 + 1
-                    hire_quarter = f"{hd.year}-Q{quarter}"
-                except:
-                    pass
-
-            if role_start_date:
-                try:
-                    rd = datetime.fromisoformat(role_start_date.replace("Z", "+00:00"))
-                    time_in_role_days = (datetime.now(rd.tzinfo) - rd).days if rd.tzinfo else (datetime.now() - rd).days
-                except:
-                    pass
-
-            features[emp_id] = EmployeeFeatures(
+            feat = EmployeeFeatures(
                 employee_id=emp_id,
                 manager_id=emp.get("manager_id"),
                 team_id=emp.get("team_id"),
@@ -200,6 +649,15 @@ class PeerProximityCalculator:
                 hire_quarter=hire_quarter
             )
 
+            # Intern categorical values to int codes
+            for attr, code_attr in CATEGORICAL_FIELDS.items():
+                value = getattr(feat, attr)
+                if value:
+                    codes = self._interners[attr]
+                    setattr(feat, code_attr, codes.setdefault(value, len(codes)))
+
+            features[emp_id] = feat
+
         self._features_cache = features
         logger.info(f"Extracted features for {len(features)} employees")
         return features
@@ -321,6 +779,18 @@ class PeerProximityCalculator:
                 score += 0.5 * jaccard
 
         # Activity pattern similarity (cosine similarity)
+        cosine_sim = self._activity_cosine(emp_a, emp_b)
+        if cosine_sim is not None:
+            score += 0.5 * cosine_sim
+
+        return min(score, 1.0)
+
+    def _activity_cosine(
+        self,
+        emp_a: EmployeeFeatures,
+        emp_b: EmployeeFeatures
+    ) -> Optional[float]:
+        """Cosine similarity of two activity vectors, or None if either is empty/zero."""
         if emp_a.activity_vector and emp_b.activity_vector:
             # Get all resources
             all_resources = set(emp_a.activity_vector.keys()) | set(emp_b.activity_vector.keys())
@@ -332,10 +802,8 @@ class PeerProximityCalculator:
                 norm_b = np.linalg.norm(vec_b)
 
                 if norm_a > 0 and norm_b > 0:
-                    cosine_sim = np.dot(vec_a, vec_b) / (norm_a * norm_b)
-                    score += 0.5 * cosine_sim
-
-        return min(score, 1.0)
+                    return np.dot(vec_a, vec_b) / (norm_a * norm_b)
+        return None
 
     def calculate_temporal_proximity(
         self,
@@ -389,11 +857,12 @@ class PeerProximityCalculator:
         behavioral = self.calculate_behavioral_proximity(emp_a, emp_b)
         temporal = self.calculate_temporal_proximity(emp_a, emp_b)
 
+        w_structural, w_functional, w_behavioral, w_temporal = self._w
         overall = (
-            self.weights.structural * structural +
-            self.weights.functional * functional +
-            self.weights.behavioral * behavioral +
-            self.weights.temporal * temporal
+            w_structural * structural +
+            w_functional * functional +
+            w_behavioral * behavioral +
+            w_temporal * temporal
         )
 
         components = {
@@ -405,21 +874,191 @@ class PeerProximityCalculator:
 
         return overall, components
 
+    def _get_soa(
+        self,
+        employee_ids: List[str],
+        features: Dict[str, EmployeeFeatures]
+    ) -> FeatureArrays:
+        """
+        FeatureArrays for employee_ids over features, reused across calls.
+
+        The cached view is rebuilt when a different features dict or row
+        order is passed, and after extract_features(). A features dict is
+        assumed not to be modified in place once scored.
+        """
+        soa = self._soa
+        if soa is None or self._soa_features is not features or soa.employee_ids != employee_ids:
+            soa = FeatureArrays.from_features(employee_ids, features, self._interners)
+            self._soa = soa
+            self._soa_features = features
+        return soa
+
+    def structural_proximity_matrix(
+        self,
+        arrays: FeatureArrays,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        manager_chains: Optional[Dict[str, List[str]]] = None
+    ) -> np.ndarray:
+        """Structural proximity for every (rows x cols) pair, as calculate_structural_proximity()."""
+        score = np.zeros((len(rows), len(cols)), dtype=PROXIMITY_DTYPE)
+        _add_if_same(score, 0.3, arrays.manager, rows, cols)
+
+        # Manager distance (hops to common ancestor)
+        if manager_chains:
+            dist = _manager_chain_distance(manager_chains, arrays.employee_ids, rows, cols)
+            np.add(score, 0.2 * (1.0 / (1.0 + np.maximum(dist, 0))), out=score, where=dist >= 0)
+
+        _add_if_same(score, 0.2, arrays.team, rows, cols)
+        _add_if_same(score, 0.15, arrays.sub_lob, rows, cols)
+        _add_if_same(score, 0.1, arrays.lob, rows, cols)
+        _add_if_same(score, 0.05, arrays.location, rows, cols)
+        return np.minimum(score, 1.0, out=score)
+
+    def functional_proximity_matrix(
+        self,
+        arrays: FeatureArrays,
+        rows: np.ndarray,
+        cols: np.ndarray
+    ) -> np.ndarray:
+        """Functional proximity for every (rows x cols) pair, as calculate_functional_proximity()."""
+        score = np.zeros((len(rows), len(cols)), dtype=PROXIMITY_DTYPE)
+        _add_if_same(score, 0.35, arrays.job_code, rows, cols)
+        _add_if_same(score, 0.25, arrays.job_family, rows, cols)
+
+        level_a = arrays.job_level[rows].astype(PROXIMITY_DTYPE)[:, None]
+        level_b = arrays.job_level[cols].astype(PROXIMITY_DTYPE)[None, :]
+        level_score = np.maximum(0, 1.0 - np.abs(level_a - level_b) / 7.0)
+        level_score[~((level_a > 0) & (level_b > 0))] = 0.0
+        score += 0.2 * level_score
+
+        _add_if_same(score, 0.2, arrays.cost_center, rows, cols)
+        return np.minimum(score, 1.0, out=score)
+
+    def behavioral_proximity_matrix(
+        self,
+        arrays: FeatureArrays,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        use_minhash: bool = False
+    ) -> np.ndarray:
+        """
+        Behavioral proximity for every (rows x cols) pair, as calculate_behavioral_proximity().
+
+        Access Jaccard uses |A | B| = |A| + |B| - |A & B|, with |A & B| from
+        popcounts of packed bitsets when there are at most
+        BITSET_MAX_RESOURCES resource columns, else from one sparse product
+        of the 0/1 access matrix. With use_minhash, it is instead estimated
+        from MinHash signatures, whose cost does not grow with access-set
+        size. Activity cosine is one product of the row-normalized activity
+        matrix, dense when there are at most DENSE_ACTIVITY_MAX_RESOURCES
+        resource columns and sparse otherwise.
+        """
+        if use_minhash:
+            score = 0.5 * self._minhash_jaccard(arrays, rows, cols)
+        else:
+            access_sizes = np.diff(arrays.access.indptr)
+            if arrays.access.shape[1] <= BITSET_MAX_RESOURCES:
+                bits = arrays.access_bits()
+                intersection = _bitset_intersection(bits[rows], bits[cols])
+            else:
+                access_rows = arrays.access[rows]
+                access_cols = access_rows if rows is cols else arrays.access[cols]
+                intersection = (access_rows @ access_cols.T).toarray()
+            sizes_a = access_sizes[rows][:, None]
+            sizes_b = access_sizes[cols][None, :]
+            union = sizes_a + sizes_b - intersection
+            score = 0.5 * np.divide(intersection, np.maximum(union, 1), dtype=PROXIMITY_DTYPE)
+
+        # Activity pattern similarity (cosine)
+        if arrays.activity.shape[1] <= DENSE_ACTIVITY_MAX_RESOURCES:
+            activity = arrays.activity_dense()
+            activity_rows = activity[rows]
+            activity_cols = activity_rows if rows is cols else activity[cols]
+            cosine = (activity_rows @ activity_cols.T).astype(PROXIMITY_DTYPE)
+        else:
+            activity_rows = arrays.activity[rows]
+            activity_cols = activity_rows if rows is cols else arrays.activity[cols]
+            cosine = (activity_rows @ activity_cols.T).toarray()
+        score += 0.5 * cosine
+        return np.minimum(score, 1.0, out=score)
+
+    def _minhash_jaccard(
+        self,
+        arrays: FeatureArrays,
+        rows: np.ndarray,
+        cols: np.ndarray
+    ) -> np.ndarray:
+        """Estimated access Jaccard for (rows x cols) from MinHash signature agreement."""
+        signatures = arrays.minhash_signatures()
+        sig_rows = signatures[rows]
+        sig_cols = signatures[cols]
+        matches = np.zeros((len(rows), len(cols)), dtype=np.uint16)
+        for h in range(signatures.shape[1]):
+            matches += sig_rows[:, h][:, None] == sig_cols[:, h][None, :]
+        jaccard = np.divide(matches, signatures.shape[1], dtype=PROXIMITY_DTYPE)
+
+        # Empty sets: two empties agree everywhere but have Jaccard 0
+        has_access = np.diff(arrays.access.indptr) > 0
+        jaccard[~has_access[rows], :] = 0.0
+        jaccard[:, ~has_access[cols]] = 0.0
+        return jaccard
+
+    def temporal_proximity_matrix(
+        self,
+        arrays: FeatureArrays,
+        rows: np.ndarray,
+        cols: np.ndarray
+    ) -> np.ndarray:
+        """Temporal proximity for every (rows x cols) pair, as calculate_temporal_proximity()."""
+        score = np.zeros((len(rows), len(cols)), dtype=PROXIMITY_DTYPE)
+        score += 0.4 * _gaussian_similarity(arrays.tenure_days, rows, cols, sigma=365)
+        score += 0.3 * _gaussian_similarity(arrays.time_in_role_days, rows, cols, sigma=180)
+        _add_if_same(score, 0.3, arrays.hire_quarter, rows, cols)
+        return np.minimum(score, 1.0, out=score)
+
+    def proximity_matrix(
+        self,
+        arrays: FeatureArrays,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        manager_chains: Optional[Dict[str, List[str]]] = None,
+        use_minhash: bool = False
+    ) -> np.ndarray:
+        """Weighted overall proximity for every (rows x cols) pair, as calculate_proximity()."""
+        w_structural, w_functional, w_behavioral, w_temporal = self._w
+        return (
+            w_structural * self.structural_proximity_matrix(arrays, rows, cols, manager_chains) +
+            w_functional * self.functional_proximity_matrix(arrays, rows, cols) +
+            w_behavioral * self.behavioral_proximity_matrix(arrays, rows, cols, use_minhash) +
+            w_temporal * self.temporal_proximity_matrix(arrays, rows, cols)
+        )
+
     def calculate_pairwise_proximity_matrix(
         self,
         employee_ids: List[str],
         features: Dict[str, EmployeeFeatures],
         manager_chains: Optional[Dict[str, List[str]]] = None,
-        block_by_lob: bool = True
+        block_by_lob: bool = True,
+        use_minhash: bool = False,
+        parallel_min_pairs: int = 4_000_000
     ) -> np.ndarray:
         """
         Calculate pairwise proximity matrix for a set of employees.
 
+        Each block of compared employees is scored as whole matrices over a
+        FeatureArrays view, in PROXIMITY_TILE-sized tiles of the upper
+        triangle that are mirrored into the lower one. Tiles are scored in
+        spawned worker processes when there are enough pairs to pay for it.
+
         Args:
             employee_ids: List of employee IDs to compare
             features: Feature dictionary from extract_features()
             manager_chains: Optional manager chain lookup
             block_by_lob: If True, only calculate proximity within same LOB (performance optimization)
+            use_minhash: Estimate access Jaccard from MinHash signatures instead
+                of computing it exactly
+            parallel_min_pairs: Minimum scored pairs before using a process pool
 
         Returns:
             Symmetric proximity matrix (n x n)
@@ -427,53 +1066,47 @@ class PeerProximityCalculator:
         n = len(employee_ids)
         logger.info(f"Calculating {n}x{n} proximity matrix (block_by_lob={block_by_lob})")
 
-        matrix = np.zeros((n, n))
-        id_to_idx = {emp_id: i for i, emp_id in enumerate(employee_ids)}
+        matrix = np.zeros((n, n), dtype=PROXIMITY_DTYPE)
+        arrays = self._get_soa(list(employee_ids), features)
 
-        # Group by LOB if blocking
-        lob_groups: Dict[str, List[str]] = defaultdict(list)
-        for emp_id in employee_ids:
-            feat = features.get(emp_id)
-            if feat:
-                lob_id = feat.lob_id or "unknown"
-                lob_groups[lob_id].append(emp_id)
-
-        comparisons = 0
+        # Group row indices by LOB if blocking
         if block_by_lob:
-            # Only compare within LOB
-            for lob_id, lob_employees in lob_groups.items():
-                for i, emp_a_id in enumerate(lob_employees):
-                    feat_a = features.get(emp_a_id)
-                    if not feat_a:
-                        continue
-                    idx_a = id_to_idx[emp_a_id]
-
-                    for emp_b_id in lob_employees[i+1:]:
-                        feat_b = features.get(emp_b_id)
-                        if not feat_b:
-                            continue
-                        idx_b = id_to_idx[emp_b_id]
-
-                        proximity, _ = self.calculate_proximity(feat_a, feat_b, manager_chains)
-                        matrix[idx_a, idx_b] = proximity
-                        matrix[idx_b, idx_a] = proximity
-                        comparisons += 1
+            lob_groups: Dict[str, List[int]] = defaultdict(list)
+            for i, feat in enumerate(arrays.features):
+                if feat:
+                    lob_groups[feat.lob_id or "unknown"].append(i)
+            blocks = [np.array(idx, dtype=np.intp) for idx in lob_groups.values()]
         else:
-            # Full pairwise comparison
-            for i, emp_a_id in enumerate(employee_ids):
-                feat_a = features.get(emp_a_id)
-                if not feat_a:
-                    continue
+            blocks = [np.flatnonzero(arrays.has_features)]
 
-                for j, emp_b_id in enumerate(employee_ids[i+1:], i+1):
-                    feat_b = features.get(emp_b_id)
-                    if not feat_b:
-                        continue
-
-                    proximity, _ = self.calculate_proximity(feat_a, feat_b, manager_chains)
-                    matrix[i, j] = proximity
-                    matrix[j, i] = proximity
-                    comparisons += 1
+        comparisons = 0
+        tile = PROXIMITY_TILE
+        tiles: List[Tuple[np.ndarray, np.ndarray]] = []
+        for idx in blocks:
+            for i0 in range(0, len(idx), tile):
+                rows = idx[i0:i0 + tile]
+                for j0 in range(i0, len(idx), tile):
+                    tiles.append((rows, rows if j0 == i0 else idx[j0:j0 + tile]))
+            comparisons += len(idx) * (len(idx) - 1) // 2
+
+        scored = False
+        n_workers = min(os.cpu_count() or 1, 8)
+        if (
+            len(tiles) > 1
+            and sum(len(rows) * len(cols) for rows, cols in tiles) >= parallel_min_pairs
+            and n_workers > 1
+        ):
+            try:
+                self._score_tiles_parallel(matrix, arrays, tiles, manager_chains, use_minhash, n_workers)
+                scored = True
+            except Exception as e:
+                logger.warning(f"Parallel proximity scoring failed ({e}), running in-process")
+        if not scored:
+            for rows, cols in tiles:
+                _store_tile(
+                    matrix, rows, cols,
+                    self.proximity_matrix(arrays, rows, cols, manager_chains, use_minhash)
+                )
 
         # Diagonal is 1.0 (self-similarity)
         np.fill_diagonal(matrix, 1.0)
@@ -481,6 +1114,48 @@ class PeerProximityCalculator:
         logger.info(f"Completed {comparisons} pairwise comparisons")
         return matrix
 
+    def _score_tiles_parallel(
+        self,
+        matrix: np.ndarray,
+        arrays: FeatureArrays,
+        tiles: List[Tuple[np.ndarray, np.ndarray]],
+        manager_chains: Optional[Dict[str, List[str]]],
+        use_minhash: bool,
+        n_workers: int
+    ) -> None:
+        """
+        Score proximity tiles into matrix in up to n_workers processes.
+
+        Workers attach a shared-memory output matrix and write their tiles
+        in place, so no scores are pickled back. Each worker is passed its
+        share of the tiles and the feature arrays (without the per-employee
+        features, which scoring never reads). Uses the spawn start method so
+        it is safe to call from threaded hosts (uvicorn). Any worker failure
+        propagates so the caller can rescore in-process.
+        """
+        shipped = copy.copy(arrays)
+        shipped.features = []
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _score_tiles_in_worker,
+                        shm.name, matrix.shape, matrix.dtype.str, self.weights,
+                        shipped, tiles[i::n_workers], manager_chains, use_minhash
+                    )
+                    for i in range(n_workers)
+                ]
+                for future in futures:
+                    future.result()
+            matrix[...] = np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)
+        finally:
+            shm.close()
+            shm.unlink()
+
     def find_peers(
         self,
         employee_id: str,
@@ -502,23 +1177,104 @@ class PeerProximityCalculator:
         Returns:
             List of (peer_id, proximity_score, component_scores) tuples
         """
-        target = features.get(employee_id)
-        if not target:
+        if employee_id not in features:
             return []
 
-        peers = []
-        for other_id, other_features in features.items():
-            if other_id == employee_id:
-                continue
+        # Score the target against everyone else in one (1 x n-1) row
+        candidate_ids = list(features)
+        arrays = self._get_soa(candidate_ids, features)
+        target = np.array([arrays.position(employee_id)])
+        others = np.delete(np.arange(len(candidate_ids)), target)
+
+        w_structural, w_functional, w_behavioral, w_temporal = self._w
+        structural = self.structural_proximity_matrix(arrays, target, others, manager_chains)[0]
+        functional = self.functional_proximity_matrix(arrays, target, others)[0]
+        temporal = self.temporal_proximity_matrix(arrays, target, others)[0]
+
+        # Behavioral is at most 1.0, so peers whose other components cannot
+        # reach min_proximity even with it are skipped before the access and
+        # activity products (the small slack absorbs float32 rounding)
+        upper_bound = (
+            w_structural * structural +
+            w_functional * functional +
+            w_behavioral +
+            w_temporal * temporal
+        )
+        need = np.flatnonzero(upper_bound >= min_proximity - 1e-6)
+        behavioral = np.zeros(len(others), dtype=PROXIMITY_DTYPE)
+        if need.size:
+            behavioral[need] = self.behavioral_proximity_matrix(arrays, target, others[need])[0]
+
+        scores = (
+            w_structural * structural +
+            w_functional * functional +
+            w_behavioral * behavioral +
+            w_temporal * temporal
+        )
+        components = {
+            "structural": structural,
+            "functional": functional,
+            "behavioral": behavioral,
+            "temporal": temporal
+        }
 
-            proximity, components = self.calculate_proximity(
-                target, other_features, manager_chains
+        # Sort by proximity descending (stable, like list.sort). When only
+        # top_k of the passing peers are needed, argpartition picks them
+        # first and only those k are sorted; ties at the k-th score are
+        # kept in row order so the result matches the full sort.
+        passing = need[scores[need] >= min_proximity]
+        neg = -scores[passing]
+        if top_k <= 0:
+            passing, neg = passing[:0], neg[:0]
+        elif top_k < passing.size:
+            cutoff = neg[np.argpartition(neg, top_k - 1)[top_k - 1]]
+            above = neg < cutoff
+            at_cutoff = np.flatnonzero(neg == cutoff)[:top_k - int(above.sum())]
+            keep = np.sort(np.concatenate([np.flatnonzero(above), at_cutoff]))
+            passing, neg = passing[keep], neg[keep]
+        order = passing[np.argsort(neg, kind="stable")]
+
+        return [
+            (
+                candidate_ids[others[j]],
+                float(scores[j]),
+                {name: float(values[j]) for name, values in components.items()}
             )
+            for j in order
+        ]
+
+
+def _store_tile(matrix: np.ndarray, rows: np.ndarray, cols: np.ndarray, scores: np.ndarray) -> None:
+    """Write a (rows x cols) tile of scores and, off the diagonal, its mirror."""
+    matrix[np.ix_(rows, cols)] = scores
+    if cols is not rows:
+        matrix[np.ix_(cols, rows)] = scores.T
+
+
+def _score_tiles_in_worker(
+    shm_name: str,
+    shape: Tuple[int, ...],
+    dtype: str,
+    weights: ProximityWeights,
+    arrays: FeatureArrays,
+    tiles: List[Tuple[np.ndarray, np.ndarray]],
+    manager_chains: Optional[Dict[str, List[str]]],
+    use_minhash: bool
+) -> None:
+    """
+    Process-pool entry point: score tiles into a shared-memory proximity matrix.
 
-            if proximity >= min_proximity:
-                peers.append((other_id, proximity, components))
-
-        # Sort by proximity descending
-        peers.sort(key=lambda x: x[1], reverse=True)
-
-        return peers[:top_k]
+    Workers write disjoint tiles, so they need no locking.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        matrix = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        calculator = PeerProximityCalculator(weights)
+        for rows, cols in tiles:
+            _store_tile(
+                matrix, rows, cols,
+                calculator.proximity_matrix(arrays, rows, cols, manager_chains, use_minhash)
+            )
+        del matrix
+    finally:
+        shm.close()
@@ -7,11 +7,18 @@ LLM-powered chat assistant using Claude API with tool calling.
 Author: Chiradeep Chhaya
 """
 
+import asyncio
+import importlib.util
 import json
+import logging
 import os
-import sqlite3
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+from datetime import date, datetime, timedelta
 
 # Load .env file if it exists
 from dotenv import load_dotenv
@@ -21,10 +28,24 @@ env_path = os.path.join(
 )
 load_dotenv(env_path)
 
+# The anthropic SDK takes over a second to import, so it is only imported
+# when the first ChatAssistant creates its client
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+
+# h2 enables HTTP/2 in the Anthropic client; httpx imports it itself
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 try:
-    from anthropic import Anthropic
+    import orjson
 except ImportError:
-    Anthropic = None
+    orjson = None  # type: ignore[assignment]
+
+from .db_pool import get_pool
+
+if TYPE_CHECKING:
+    from anthropic.types.message_create_params import MessageCreateParamsNonStreaming
+
+logger = logging.getLogger(__name__)
 
 # Database path
 DB_PATH = os.path.join(
@@ -32,6 +53,27 @@ DB_PATH = os.path.join(
     "data", "aras.db"
 )
 
+# Model used for every chat request
+CHAT_MODEL = "claude-sonnet-4-20250514"
+
+# Anthropic API client settings: fail fast on connect, and let the SDK retry
+# timeouts, 429s and 5xx with jittered exponential backoff
+CHAT_TIMEOUT_SECONDS = 60.0
+CHAT_CONNECT_TIMEOUT_SECONDS = 5.0
+CHAT_MAX_RETRIES = 2
+
+# Conversations are trimmed, oldest turns first, to about this many
+# characters of history, so each turn's input tokens stay bounded
+CHAT_HISTORY_MAX_CHARS = 32_000
+
+# Chat sessions kept, and seconds of inactivity before one is dropped
+CHAT_MAX_SESSIONS = 1000
+CHAT_SESSION_TTL = 1800.0
+
+# Message batch polling backoff (seconds)
+BATCH_POLL_INITIAL = 1.0
+BATCH_POLL_MAX = 60.0
+
 # Tool definitions for Claude
 TOOLS = [
     {
@@ -172,133 +214,383 @@ TOOLS = [
     }
 ]
 
+# TOOLS as sent with every tool-use request, built once at import. The
+# cache breakpoint on the last tool lets the API reuse the processed tool
+# definitions across calls and turns instead of re-reading them each time.
+REQUEST_TOOLS = TOOLS[:-1] + [{**TOOLS[-1], "cache_control": {"type": "ephemeral"}}]
+
 
+@contextmanager
 def get_db():
-    """Get database connection."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get a pooled database connection."""
+    pool = get_pool(DB_PATH)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+# Tool queries, kept as constants so each pooled connection's statement
+# cache reuses one prepared statement per query
+# List tools build their JSON result inside SQLite (json_group_array over
+# json_object), so rows go straight to the tool result without Python dicts
+SQL_SEARCH_EMPLOYEES = """
+    SELECT json_group_array(json_object(
+        'id', id, 'employee_number', employee_number, 'full_name', full_name,
+        'email', email, 'job_title', job_title, 'job_family', job_family
+    ))
+    FROM (
+        SELECT id, employee_number, full_name, email, job_title, job_family
+        FROM employees
+        WHERE full_name LIKE ? OR email LIKE ? OR job_title LIKE ?
+        LIMIT ?
+    )
+"""
+
+SQL_EMPLOYEE = "SELECT * FROM employees WHERE id = ?"
+
+SQL_EMPLOYEE_GRANTS = """
+    SELECT ag.id, ag.granted_date, r.name as resource_name,
+           r.sensitivity, r.resource_type, s.name as system_name
+    FROM access_grants ag
+    JOIN resources r ON ag.resource_id = r.id
+    JOIN systems s ON r.system_id = s.id
+    WHERE ag.employee_id = ?
+    ORDER BY r.sensitivity DESC
+"""
+
+SQL_CAMPAIGN = "SELECT * FROM campaigns WHERE id = ?"
+
+SQL_CAMPAIGN_STATS = """
+    SELECT
+        COUNT(*) as total,
+        SUM(CASE WHEN status = 'Auto-Approved' THEN 1 ELSE 0 END) as auto_approved,
+        SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
+        SUM(CASE WHEN status = 'Decided' THEN 1 ELSE 0 END) as decided,
+        AVG(assurance_score) as avg_score
+    FROM review_items WHERE campaign_id = ?
+"""
+
+SQL_LOW_ASSURANCE_ITEMS = """
+    SELECT ri.*, e.full_name, e.job_title, r.name as resource_name, r.sensitivity
+    FROM review_items ri
+    JOIN employees e ON ri.employee_id = e.id
+    JOIN access_grants ag ON ri.access_grant_id = ag.id
+    JOIN resources r ON ag.resource_id = r.id
+    WHERE ri.campaign_id = ? AND ri.assurance_score < ? AND ri.status != 'Decided'
+    ORDER BY ri.assurance_score ASC
+    LIMIT ?
+"""
+
+# A review item with its peer counts (same resource and job code) in one
+# round trip
+SQL_REVIEW_ITEM_DETAIL = """
+    WITH target AS (
+        SELECT ri.*, e.full_name, e.job_title, e.job_code,
+               r.name as resource_name, r.sensitivity, r.resource_type,
+               ag.resource_id as _resource_id
+        FROM review_items ri
+        JOIN employees e ON ri.employee_id = e.id
+        JOIN access_grants ag ON ri.access_grant_id = ag.id
+        JOIN resources r ON ag.resource_id = r.id
+        WHERE ri.id = ?
+    )
+    SELECT target.*,
+        (SELECT COUNT(DISTINCT peer.employee_id)
+         FROM access_grants peer
+         JOIN employees pe ON pe.id = peer.employee_id
+         WHERE peer.resource_id = target._resource_id
+           AND pe.job_code = target.job_code) as _peers_with_access,
+        (SELECT COUNT(*) FROM employees
+         WHERE job_code = target.job_code) as _total_peers
+    FROM target
+"""
+
+# Every get_system_stats count in one statement
+SQL_SYSTEM_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM employees) as employees,
+        (SELECT COUNT(*) FROM resources) as resources,
+        (SELECT COUNT(*) FROM access_grants) as access_grants,
+        (SELECT COUNT(*) FROM campaigns) as campaigns,
+        (SELECT COUNT(*) FROM review_items) as review_items,
+        (SELECT COUNT(*) FROM campaigns WHERE status = 'Active') as active_campaigns
+"""
+
+SQL_SEARCH_RESOURCES = """
+    SELECT json_group_array(json_object(
+        'id', id, 'system_id', system_id, 'resource_type', resource_type,
+        'name', name, 'external_id', external_id, 'description', description,
+        'sensitivity', sensitivity, 'grants_access_to', grants_access_to,
+        'system_name', system_name
+    ))
+    FROM (
+        SELECT r.*, s.name as system_name
+        FROM resources r
+        JOIN systems s ON r.system_id = s.id
+        WHERE r.name LIKE ?
+        LIMIT ?
+    )
+"""
+
+SQL_SEARCH_RESOURCES_BY_SENSITIVITY = """
+    SELECT json_group_array(json_object(
+        'id', id, 'system_id', system_id, 'resource_type', resource_type,
+        'name', name, 'external_id', external_id, 'description', description,
+        'sensitivity', sensitivity, 'grants_access_to', grants_access_to,
+        'system_name', system_name
+    ))
+    FROM (
+        SELECT r.*, s.name as system_name
+        FROM resources r
+        JOIN systems s ON r.system_id = s.id
+        WHERE r.name LIKE ? AND r.sensitivity = ?
+        LIMIT ?
+    )
+"""
+
+# Dormant access candidates, materialized into dormant_cache by
+# refresh_dormant_cache() so the tool reads one table. Activity summaries
+# change at most daily, so a daily rebuild keeps it current.
+SQL_DORMANT_CACHE_CREATE = """
+    CREATE TABLE IF NOT EXISTS dormant_cache (
+        id TEXT,
+        employee_id TEXT,
+        full_name TEXT,
+        resource_name TEXT,
+        sensitivity TEXT,
+        sensitivity_rank INTEGER,
+        last_activity_date TEXT
+    )
+"""
+
+SQL_DORMANT_CACHE_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_dormant_cache_rank
+    ON dormant_cache(sensitivity_rank, last_activity_date)
+"""
+
+SQL_DORMANT_CACHE_FILL = """
+    INSERT INTO dormant_cache
+    SELECT ag.id, ag.employee_id, e.full_name,
+           r.name as resource_name, r.sensitivity,
+           CASE r.sensitivity
+               WHEN 'Critical' THEN 4
+               WHEN 'Confidential' THEN 3
+               WHEN 'Internal' THEN 2
+               WHEN 'Public' THEN 1
+               ELSE 0
+           END as sensitivity_rank,
+           a.last_accessed as last_activity_date
+    FROM access_grants ag
+    JOIN employees e ON ag.employee_id = e.id
+    JOIN resources r ON ag.resource_id = r.id
+    LEFT JOIN activity_summaries a ON ag.employee_id = a.employee_id AND ag.resource_id = a.resource_id
+"""
+
+# Takes an ISO date threshold computed in Python, so the comparison is a
+# plain range on last_activity_date; most sensitive resources first
+SQL_DORMANT_ACCESS = """
+    SELECT json_group_array(json_object(
+        'id', id, 'employee_id', employee_id, 'full_name', full_name,
+        'resource_name', resource_name, 'sensitivity', sensitivity,
+        'last_activity_date', last_activity_date
+    ))
+    FROM (
+        SELECT id, employee_id, full_name, resource_name, sensitivity,
+               last_activity_date
+        FROM dormant_cache
+        WHERE last_activity_date < ?
+           OR last_activity_date IS NULL
+        ORDER BY sensitivity_rank DESC
+        LIMIT ?
+    )
+"""
+
+
+def _to_json(value: Any, sort_keys: bool = False) -> str:
+    """
+    Compact JSON for tool results and stream events.
+
+    Tool results are sent back to the model as input tokens, so no
+    indentation or separator spaces; encoded with orjson when installed.
+    sort_keys gives a canonical form for cache keys.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    return json.dumps(value, separators=(',', ':'), sort_keys=sort_keys)
+
+
+# Tool results are reused for this long (seconds) unless the database is
+# written through the API first
+TOOL_CACHE_TTL = 60.0
+TOOL_CACHE_SIZE = 1024
+
+# Tools whose results depend on the current date rather than just the data
+UNCACHED_TOOLS = {"get_dormant_access"}
+
+_tool_cache: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+_tool_cache_lock = threading.Lock()
+_tool_cache_generation = 0
+
+
+def clear_tool_cache() -> None:
+    """Drop all memoized tool results (call after writes to the database)."""
+    global _tool_cache_generation
+    with _tool_cache_lock:
+        _tool_cache.clear()
+        _tool_cache_generation += 1
+
+
+_dormant_cache_lock = threading.Lock()
+_dormant_cache_built = False
+
+
+def refresh_dormant_cache(force: bool = True) -> None:
+    """
+    Rebuild dormant_cache from the grant, employee, resource and activity tables.
+
+    Args:
+        force: Rebuild even if the cache was already built. With False, only
+            the first of several concurrent callers builds it.
+    """
+    global _dormant_cache_built
+    if not force and _dormant_cache_built:
+        return
+    with _dormant_cache_lock:
+        if not force and _dormant_cache_built:
+            return
+        # Queue behind the API's writers instead of racing them in SQLite's
+        # busy handler
+        with get_pool(DB_PATH).write_transaction() as conn:
+            conn.execute(SQL_DORMANT_CACHE_CREATE)
+            conn.execute(SQL_DORMANT_CACHE_INDEX)
+            # One transaction, so readers keep seeing the previous rows until commit
+            conn.execute("DELETE FROM dormant_cache")
+            conn.execute(SQL_DORMANT_CACHE_FILL)
+            conn.commit()
+        _dormant_cache_built = True
 
 
 def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
-    """Execute a tool and return the result."""
-    conn = get_db()
+    """Execute a tool and return the result, reusing recent identical calls."""
+    if tool_name in UNCACHED_TOOLS:
+        return _run_tool(tool_name, arguments)
+
+    key = (tool_name, _to_json(arguments, sort_keys=True))
+    with _tool_cache_lock:
+        cached = _tool_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            _tool_cache.move_to_end(key)
+            return cached[1]
+        generation = _tool_cache_generation
+
+    result = _run_tool(tool_name, arguments)
+
+    with _tool_cache_lock:
+        # Don't store a result that may predate a write made while it ran
+        if generation == _tool_cache_generation:
+            _tool_cache[key] = (time.monotonic() + TOOL_CACHE_TTL, result)
+            _tool_cache.move_to_end(key)
+            while len(_tool_cache) > TOOL_CACHE_SIZE:
+                _tool_cache.popitem(last=False)
+    return result
+
+
+def _tool_result(call: Any) -> Dict[str, Any]:
+    """
+    Run one tool_use block and build its tool_result.
+
+    A tool that raises (e.g. on arguments of the wrong type) still gets a
+    result, marked is_error, so the model sees the failure and every
+    tool_use in history stays answered.
+    """
+    try:
+        return {"type": "tool_result", "tool_use_id": call.id,
+                "content": execute_tool(call.name, call.input)}
+    except Exception as e:
+        logger.exception(f"Tool {call.name} failed")
+        return {"type": "tool_result", "tool_use_id": call.id, "is_error": True,
+                "content": f"{type(e).__name__}: {e}"}
+
+
+def _fetch_all(conn: Any, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+    """Run sql and return its rows as plain dicts, built straight from tuples."""
     cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
 
-    try:
+
+def _fetch_one(conn: Any, sql: str, params: Tuple = ()) -> Optional[Dict[str, Any]]:
+    """Run sql and return its first row as a plain dict, or None."""
+    rows = _fetch_all(conn, sql, params)
+    return rows[0] if rows else None
+
+
+def _run_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Run a tool's queries against the database."""
+    if tool_name == "get_dormant_access":
+        # Build before taking a pooled connection, so a cold call never
+        # holds one connection while waiting for another
+        refresh_dormant_cache(force=False)
+
+    with get_db() as conn:
         if tool_name == "search_employees":
             query = f"%{arguments.get('query', '')}%"
             limit = arguments.get('limit', 10)
-            cursor.execute("""
-                SELECT id, employee_number, full_name, email, job_title, job_family
-                FROM employees
-                WHERE full_name LIKE ? OR email LIKE ? OR job_title LIKE ?
-                LIMIT ?
-            """, (query, query, query, limit))
-            rows = cursor.fetchall()
-            return json.dumps([dict(r) for r in rows], indent=2)
+            return conn.execute(SQL_SEARCH_EMPLOYEES, (query, query, query, limit)).fetchone()[0]
 
         elif tool_name == "get_employee_access":
             emp_id = arguments.get('employee_id')
             # Get employee info
-            cursor.execute("SELECT * FROM employees WHERE id = ?", (emp_id,))
-            emp = cursor.fetchone()
+            emp = _fetch_one(conn, SQL_EMPLOYEE, (emp_id,))
             if not emp:
-                return json.dumps({"error": "Employee not found"})
+                return _to_json({"error": "Employee not found"})
 
             # Get access grants with resources
-            cursor.execute("""
-                SELECT ag.id, ag.granted_at, r.name as resource_name,
-                       r.sensitivity, r.resource_type, s.name as system_name
-                FROM access_grants ag
-                JOIN resources r ON ag.resource_id = r.id
-                JOIN systems s ON r.system_id = s.id
-                WHERE ag.employee_id = ?
-                ORDER BY r.sensitivity DESC
-            """, (emp_id,))
-            grants = cursor.fetchall()
-
-            return json.dumps({
-                "employee": dict(emp),
+            grants = _fetch_all(conn, SQL_EMPLOYEE_GRANTS, (emp_id,))
+
+            return _to_json({
+                "employee": emp,
                 "total_grants": len(grants),
-                "grants": [dict(g) for g in grants]
-            }, indent=2)
+                "grants": grants
+            })
 
         elif tool_name == "get_campaign_summary":
             camp_id = arguments.get('campaign_id')
-            cursor.execute("SELECT * FROM campaigns WHERE id = ?", (camp_id,))
-            campaign = cursor.fetchone()
+            campaign = _fetch_one(conn, SQL_CAMPAIGN, (camp_id,))
             if not campaign:
-                return json.dumps({"error": "Campaign not found"})
-
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'Auto-Approved' THEN 1 ELSE 0 END) as auto_approved,
-                    SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
-                    SUM(CASE WHEN status = 'Decided' THEN 1 ELSE 0 END) as decided,
-                    AVG(assurance_score) as avg_score
-                FROM review_items WHERE campaign_id = ?
-            """, (camp_id,))
-            stats = cursor.fetchone()
-
-            return json.dumps({
-                "campaign": dict(campaign),
-                "statistics": dict(stats)
-            }, indent=2)
+                return _to_json({"error": "Campaign not found"})
+
+            stats = _fetch_one(conn, SQL_CAMPAIGN_STATS, (camp_id,))
+
+            return _to_json({
+                "campaign": campaign,
+                "statistics": stats
+            })
 
         elif tool_name == "get_low_assurance_items":
             camp_id = arguments.get('campaign_id')
             threshold = arguments.get('threshold', 50)
             limit = arguments.get('limit', 10)
 
-            cursor.execute("""
-                SELECT ri.*, e.full_name, e.job_title, r.name as resource_name, r.sensitivity
-                FROM review_items ri
-                JOIN employees e ON ri.employee_id = e.id
-                JOIN access_grants ag ON ri.access_grant_id = ag.id
-                JOIN resources r ON ag.resource_id = r.id
-                WHERE ri.campaign_id = ? AND ri.assurance_score < ? AND ri.status != 'Decided'
-                ORDER BY ri.assurance_score ASC
-                LIMIT ?
-            """, (camp_id, threshold, limit))
-            items = cursor.fetchall()
+            items = _fetch_all(conn, SQL_LOW_ASSURANCE_ITEMS, (camp_id, threshold, limit))
 
-            return json.dumps([dict(i) for i in items], indent=2)
+            return _to_json(items)
 
         elif tool_name == "explain_assurance_score":
             item_id = arguments.get('review_item_id')
-            cursor.execute("""
-                SELECT ri.*, e.full_name, e.job_title, e.job_code,
-                       r.name as resource_name, r.sensitivity, r.resource_type
-                FROM review_items ri
-                JOIN employees e ON ri.employee_id = e.id
-                JOIN access_grants ag ON ri.access_grant_id = ag.id
-                JOIN resources r ON ag.resource_id = r.id
-                WHERE ri.id = ?
-            """, (item_id,))
-            item = cursor.fetchone()
-
-            if not item:
-                return json.dumps({"error": "Review item not found"})
-
-            item_dict = dict(item)
-
-            # Get peer comparison
-            cursor.execute("""
-                SELECT COUNT(DISTINCT ag.employee_id) as peers_with_access
-                FROM access_grants ag
-                JOIN employees e ON ag.employee_id = e.id
-                WHERE ag.resource_id = (SELECT resource_id FROM access_grants WHERE id = ?)
-                  AND e.job_code = ?
-            """, (item_dict['access_grant_id'], item_dict['job_code']))
-            peer_info = cursor.fetchone()
-
-            cursor.execute("""
-                SELECT COUNT(*) as total_peers
-                FROM employees WHERE job_code = ?
-            """, (item_dict['job_code'],))
-            total_peers = cursor.fetchone()
+            item_dict = _fetch_one(conn, SQL_REVIEW_ITEM_DETAIL, (item_id,))
+
+            if not item_dict:
+                return _to_json({"error": "Review item not found"})
+
+            # Peer comparison columns came with the item
+            del item_dict['_resource_id']
+            peers_with_access = item_dict.pop('_peers_with_access')
+            total_peers = item_dict.pop('_total_peers')
 
             explanation = {
                 "review_item": item_dict,
@@ -310,25 +602,16 @@ def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
                     "needs_clustering_review": bool(item_dict['needs_clustering_review'])
                 },
                 "peer_context": {
-                    "peers_with_same_access": peer_info['peers_with_access'] if peer_info else 0,
-                    "total_peers_in_role": total_peers['total_peers'] if total_peers else 0
+                    "peers_with_same_access": peers_with_access,
+                    "total_peers_in_role": total_peers
                 },
                 "sensitivity_impact": f"Resource sensitivity is {item_dict['sensitivity']}, which affects the maximum possible score."
             }
 
-            return json.dumps(explanation, indent=2)
+            return _to_json(explanation)
 
         elif tool_name == "get_system_stats":
-            stats = {}
-            for table in ['employees', 'resources', 'access_grants', 'campaigns', 'review_items']:
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                stats[table] = cursor.fetchone()[0]
-
-            # Get active campaigns
-            cursor.execute("SELECT COUNT(*) FROM campaigns WHERE status = 'Active'")
-            stats['active_campaigns'] = cursor.fetchone()[0]
-
-            return json.dumps(stats, indent=2)
+            return _to_json(_fetch_one(conn, SQL_SYSTEM_STATS))
 
         elif tool_name == "search_resources":
             query = f"%{arguments.get('query', '')}%"
@@ -336,65 +619,53 @@ def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
             limit = arguments.get('limit', 10)
 
             if sensitivity:
-                cursor.execute("""
-                    SELECT r.*, s.name as system_name
-                    FROM resources r
-                    JOIN systems s ON r.system_id = s.id
-                    WHERE r.name LIKE ? AND r.sensitivity = ?
-                    LIMIT ?
-                """, (query, sensitivity, limit))
-            else:
-                cursor.execute("""
-                    SELECT r.*, s.name as system_name
-                    FROM resources r
-                    JOIN systems s ON r.system_id = s.id
-                    WHERE r.name LIKE ?
-                    LIMIT ?
-                """, (query, limit))
-
-            rows = cursor.fetchall()
-            return json.dumps([dict(r) for r in rows], indent=2)
+                return conn.execute(SQL_SEARCH_RESOURCES_BY_SENSITIVITY, (query, sensitivity, limit)).fetchone()[0]
+            return conn.execute(SQL_SEARCH_RESOURCES, (query, limit)).fetchone()[0]
 
         elif tool_name == "get_dormant_access":
             days = arguments.get('days_threshold', 90)
             limit = arguments.get('limit', 20)
 
-            cursor.execute("""
-                SELECT ag.id, ag.employee_id, e.full_name,
-                       r.name as resource_name, r.sensitivity,
-                       a.last_activity_date
-                FROM access_grants ag
-                JOIN employees e ON ag.employee_id = e.id
-                JOIN resources r ON ag.resource_id = r.id
-                LEFT JOIN activity_summaries a ON ag.employee_id = a.employee_id AND ag.resource_id = a.resource_id
-                WHERE a.last_activity_date < date('now', ? || ' days')
-                   OR a.last_activity_date IS NULL
-                ORDER BY r.sensitivity DESC
-                LIMIT ?
-            """, (f'-{days}', limit))
-            rows = cursor.fetchall()
-            return json.dumps([dict(r) for r in rows], indent=2)
+            threshold = (date.today() - timedelta(days=days)).isoformat()
+            return conn.execute(SQL_DORMANT_ACCESS, (threshold, limit)).fetchone()[0]
 
         else:
-            return json.dumps({"error": f"Unknown tool: {tool_name}"})
-
-    finally:
-        conn.close()
+            return _to_json({"error": f"Unknown tool: {tool_name}"})
 
 
 class ChatAssistant:
     """Chat assistant using Claude with tool calling."""
 
-    def __init__(self, api_key: Optional[str] = None):
-        if Anthropic is None:
-            raise ImportError("anthropic package not installed. Run: pip install anthropic")
-
-        self.api_key = api_key or os.environ.get('ANTHROPIC_API_KEY')
-        if not self.api_key:
-            raise ValueError("ANTHROPIC_API_KEY not set")
-
-        self.client = Anthropic(api_key=self.api_key)
+    def __init__(self, api_key: Optional[str] = None, client: Optional[Any] = None):
+        """
+        Args:
+            api_key: Anthropic API key (default: ANTHROPIC_API_KEY)
+            client: AsyncAnthropic client to share with other assistants;
+                one is created if not given
+        """
+        if client is None:
+            if not ANTHROPIC_AVAILABLE:
+                raise ImportError("anthropic package not installed. Run: pip install anthropic")
+            from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient, Timeout
+
+            self.api_key = api_key or os.environ.get('ANTHROPIC_API_KEY')
+            if not self.api_key:
+                raise ValueError("ANTHROPIC_API_KEY not set")
+
+            # Shared by every session, so its pooled keep-alive connections (and
+            # HTTP/2 multiplexing when h2 is installed) are reused across requests
+            client = AsyncAnthropic(
+                api_key=self.api_key,
+                timeout=Timeout(CHAT_TIMEOUT_SECONDS, connect=CHAT_CONNECT_TIMEOUT_SECONDS),
+                max_retries=CHAT_MAX_RETRIES,
+                http_client=DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE)
+            )
+        else:
+            self.api_key = api_key
+        self.client = client
         self.conversation_history: List[Dict] = []
+        # One turn at a time, so concurrent requests don't interleave history
+        self._turn_lock = asyncio.Lock()
 
         self.system_prompt = """You are ARAS Assistant, an AI helper for the Access Recertification Assurance System.
 
@@ -418,89 +689,223 @@ Key concepts:
 
 Be concise but helpful. If asked about specific employees or access, use the tools to look up real data."""
 
-    def chat(self, user_message: str) -> str:
+    async def chat(self, user_message: str) -> str:
         """Process a chat message and return the response."""
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
-
-        # Initial API call
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            system=self.system_prompt,
-            tools=TOOLS,
-            messages=self.conversation_history
-        )
-
-        # Handle tool use
-        while response.stop_reason == "tool_use":
-            # Extract tool calls
-            tool_results = []
-            for content in response.content:
-                if content.type == "tool_use":
-                    result = execute_tool(content.name, content.input)
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": content.id,
-                        "content": result
-                    })
-
-            # Add assistant response and tool results
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": response.content
-            })
-            self.conversation_history.append({
-                "role": "user",
-                "content": tool_results
-            })
-
-            # Continue conversation
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                system=self.system_prompt,
-                tools=TOOLS,
-                messages=self.conversation_history
-            )
+        async for item in self._respond(user_message):
+            response = item
 
         # Extract final text response
         final_text = ""
         for content in response.content:
             if hasattr(content, 'text'):
                 final_text += content.text
+        return final_text
 
-        # Add to history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": response.content
-        })
+    async def chat_stream(self, user_message: str) -> AsyncIterator[str]:
+        """Process a chat message, yielding response text as it is generated."""
+        async for item in self._respond(user_message):
+            if isinstance(item, str):
+                yield item
 
-        return final_text
+    async def _respond(self, user_message: str) -> AsyncIterator[Any]:
+        """Run one user turn, yielding text deltas and then the final response message."""
+        async with self._turn_lock:
+            turn_start = len(self.conversation_history)
+            self.conversation_history.append({
+                "role": "user",
+                "content": user_message
+            })
+
+            try:
+                while True:
+                    async with self.client.messages.stream(
+                        model=CHAT_MODEL,
+                        max_tokens=4096,
+                        system=self.system_prompt,
+                        tools=REQUEST_TOOLS,
+                        messages=self.conversation_history
+                    ) as stream:
+                        async for text in stream.text_stream:
+                            yield text
+                        response = await stream.get_final_message()
+
+                    self.conversation_history.append({
+                        "role": "assistant",
+                        "content": response.content
+                    })
+                    if response.stop_reason != "tool_use":
+                        break
+
+                    # Tools are read-only, so independent calls run concurrently
+                    tool_calls = [c for c in response.content if c.type == "tool_use"]
+                    results = await asyncio.gather(*[
+                        asyncio.to_thread(_tool_result, c) for c in tool_calls
+                    ])
+                    self.conversation_history.append({
+                        "role": "user",
+                        "content": list(results)
+                    })
+            except BaseException:
+                # A failed or cancelled turn leaves nothing behind, so history
+                # never ends in an unanswered user message or tool_use
+                del self.conversation_history[turn_start:]
+                raise
+
+            self._trim_history()
+            yield response
+
+    def _trim_history(self) -> None:
+        """
+        Drop the oldest turns while history exceeds CHAT_HISTORY_MAX_CHARS.
+
+        A turn starts at a user text message and runs through its tool calls
+        and results, so history always starts with a user message. The
+        latest turn is always kept.
+        """
+        sizes = [_message_chars(m) for m in self.conversation_history]
+        turn_starts = [
+            i for i, m in enumerate(self.conversation_history)
+            if m["role"] == "user" and isinstance(m["content"], str)
+        ]
+        total = sum(sizes)
+        drop = 0
+        for start in turn_starts[1:]:
+            if total <= CHAT_HISTORY_MAX_CHARS:
+                break
+            total -= sum(sizes[drop:start])
+            drop = start
+        if drop:
+            del self.conversation_history[:drop]
+
+    def _single_turn_params(self, user_message: str) -> "MessageCreateParamsNonStreaming":
+        """Message parameters for a stateless, tool-free request."""
+        return {
+            "model": CHAT_MODEL,
+            "max_tokens": 4096,
+            "system": self.system_prompt,
+            "messages": [{"role": "user", "content": user_message}]
+        }
+
+    async def complete(self, user_message: str) -> str:
+        """Answer one message outside the conversation history, without tools."""
+        response = await self.client.messages.create(**self._single_turn_params(user_message))
+        return "".join(c.text for c in response.content if hasattr(c, 'text'))
+
+    async def submit_batch(self, user_messages: List[str]) -> str:
+        """
+        Submit messages to the Message Batches API.
+
+        Batches are billed at half the real-time token price and don't count
+        against real-time rate limits, but complete asynchronously. Each
+        message is answered independently (no history, no tools) and is
+        identified by custom_id "item-<index>".
+
+        Returns:
+            Batch ID
+        """
+        batch = await self.client.messages.batches.create(requests=[
+            {"custom_id": f"item-{i}", "params": self._single_turn_params(m)}
+            for i, m in enumerate(user_messages)
+        ])
+        return batch.id
+
+    async def get_batch(
+        self,
+        batch_id: str,
+        max_wait: float = 0.0
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        """
+        Poll a message batch, waiting up to max_wait seconds for it to end.
+
+        Polls back off exponentially from BATCH_POLL_INITIAL to BATCH_POLL_MAX.
+
+        Returns:
+            (processing_status, results in submission order once ended, else None)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        delay = BATCH_POLL_INITIAL
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        while batch.processing_status != "ended" and loop.time() + delay <= deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX)
+            batch = await self.client.messages.batches.retrieve(batch_id)
+
+        if batch.processing_status != "ended":
+            return batch.processing_status, None
+
+        from anthropic.types.messages import MessageBatchErroredResult, MessageBatchSucceededResult
+
+        results = []
+        async for entry in await self.client.messages.batches.results(batch_id):
+            result = {"custom_id": entry.custom_id, "status": entry.result.type}
+            if isinstance(entry.result, MessageBatchSucceededResult):
+                result["response"] = "".join(
+                    c.text for c in entry.result.message.content if hasattr(c, 'text')
+                )
+            elif isinstance(entry.result, MessageBatchErroredResult):
+                result["error"] = str(entry.result.error)
+            results.append(result)
+        results.sort(key=lambda r: int(r["custom_id"].rsplit("-", 1)[1]))
+        return batch.processing_status, results
 
     def clear_history(self):
         """Clear conversation history."""
         self.conversation_history = []
 
 
+def _message_chars(message: Dict[str, Any]) -> int:
+    """Approximate serialized size of a history message."""
+    content = message["content"]
+    if isinstance(content, str):
+        return len(content)
+    return sum(
+        len(block.model_dump_json()) if hasattr(block, "model_dump_json") else len(_to_json(block))
+        for block in content
+    )
+
+
 # API endpoints
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 router = APIRouter()
 
-# Global assistant instance
+# Global assistant instance (API client, batches); conversations live in
+# per-session assistants that share its client
 _assistant: Optional[ChatAssistant] = None
 
+# session_id -> (last used, monotonic seconds; session assistant), oldest first
+_sessions: "OrderedDict[str, Tuple[float, ChatAssistant]]" = OrderedDict()
+
 
 class ChatRequest(BaseModel):
     message: str
+    session_id: Optional[str] = None
 
 
 class ChatResponse(BaseModel):
     response: str
+    session_id: str
+    timestamp: str
+
+
+class BatchChatRequest(BaseModel):
+    items: List[ChatRequest]
+
+
+class BatchChatResult(BaseModel):
+    custom_id: str
+    status: str
+    response: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchChatResponse(BaseModel):
+    batch_id: Optional[str] = None
+    status: str
+    results: Optional[List[BatchChatResult]] = None
     timestamp: str
 
 
@@ -509,20 +914,14 @@ def get_assistant() -> ChatAssistant:
     global _assistant
     if _assistant is None:
         try:
-            # Debug: print env status
-            api_key = os.environ.get('ANTHROPIC_API_KEY')
-            print(f"[Chat] ENV file path: {env_path}")
-            print(f"[Chat] ENV file exists: {os.path.exists(env_path)}")
-            print(f"[Chat] API key found: {'Yes' if api_key else 'No'}")
-            if api_key:
-                print(f"[Chat] API key starts with: {api_key[:10]}...")
-            print(f"[Chat] Anthropic module loaded: {Anthropic is not None}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"ENV file path: {env_path}")
+                logger.debug(f"API key found: {'Yes' if os.environ.get('ANTHROPIC_API_KEY') else 'No'}")
+                logger.debug(f"Anthropic module available: {ANTHROPIC_AVAILABLE}")
             _assistant = ChatAssistant()
-            print(f"[Chat] ChatAssistant created successfully")
+            logger.debug("ChatAssistant created")
         except Exception as e:
-            import traceback
-            print(f"[Chat] ERROR creating assistant: {type(e).__name__}: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Could not create chat assistant")
             raise HTTPException(
                 status_code=503,
                 detail=f"Chat assistant not available: {type(e).__name__}: {str(e)}"
@@ -530,21 +929,123 @@ def get_assistant() -> ChatAssistant:
     return _assistant
 
 
+def get_session(session_id: Optional[str]) -> Tuple[str, ChatAssistant]:
+    """
+    Get the conversation for session_id, starting a new one if it is missing or expired.
+
+    Returns:
+        (session_id, session assistant)
+    """
+    base = get_assistant()
+    now = time.monotonic()
+
+    # Sessions are kept in last-use order, so expired ones are at the front
+    while _sessions:
+        oldest_id, (last_used, _) = next(iter(_sessions.items()))
+        if now - last_used <= CHAT_SESSION_TTL and len(_sessions) < CHAT_MAX_SESSIONS:
+            break
+        del _sessions[oldest_id]
+
+    entry = _sessions.pop(session_id, None) if session_id else None
+    if entry is None:
+        assistant = ChatAssistant(api_key=base.api_key, client=base.client)
+    else:
+        assistant = entry[1]
+    if not session_id:
+        session_id = uuid.uuid4().hex
+    _sessions[session_id] = (now, assistant)
+    return session_id, assistant
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
-    """Send a message to the chat assistant."""
-    assistant = get_assistant()
-    response = assistant.chat(request.message)
+    """Send a message to the chat assistant, continuing request.session_id if given."""
+    session_id, assistant = get_session(request.session_id)
+    response = await assistant.chat(request.message)
     return ChatResponse(
         response=response,
+        session_id=session_id,
+        timestamp=datetime.utcnow().isoformat()
+    )
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Send a message to the chat assistant and stream the reply.
+
+    Server-sent events: one data event per {"text": ...} chunk, then a
+    "done" event with the session_id and timestamp, or an "error" event on
+    failure. The session ID is also sent in the X-Session-Id header.
+    """
+    session_id, assistant = get_session(request.session_id)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for text in assistant.chat_stream(request.message):
+                yield f"data: {_to_json({'text': text})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {_to_json({'detail': f'{type(e).__name__}: {e}'})}\n\n"
+            return
+        done = {'session_id': session_id, 'timestamp': datetime.utcnow().isoformat()}
+        yield f"event: done\ndata: {_to_json(done)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"X-Session-Id": session_id}
+    )
+
+
+@router.post("/chat/batch", response_model=BatchChatResponse)
+async def submit_chat_batch(request: BatchChatRequest):
+    """
+    Submit messages for non-interactive answering via the Message Batches API.
+
+    Each message is answered independently, without conversation history or
+    tools. A single message is answered in real time instead.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No messages to submit")
+
+    assistant = get_assistant()
+    if len(request.items) == 1:
+        response = await assistant.complete(request.items[0].message)
+        return BatchChatResponse(
+            status="ended",
+            results=[BatchChatResult(custom_id="item-0", status="succeeded", response=response)],
+            timestamp=datetime.utcnow().isoformat()
+        )
+
+    batch_id = await assistant.submit_batch([item.message for item in request.items])
+    return BatchChatResponse(
+        batch_id=batch_id,
+        status="in_progress",
+        timestamp=datetime.utcnow().isoformat()
+    )
+
+
+@router.get("/chat/batch/{batch_id}", response_model=BatchChatResponse)
+async def get_chat_batch(
+    batch_id: str,
+    wait: float = Query(0, ge=0, le=300, description="Seconds to wait for the batch to end")
+):
+    """Get a message batch's status, and its results once it has ended."""
+    assistant = get_assistant()
+    status, results = await assistant.get_batch(batch_id, max_wait=wait)
+    return BatchChatResponse(
+        batch_id=batch_id,
+        status=status,
+        results=[BatchChatResult(**r) for r in results] if results is not None else None,
         timestamp=datetime.utcnow().isoformat()
     )
 
 
 @router.post("/chat/clear")
-async def clear_chat():
-    """Clear chat history."""
-    global _assistant
-    if _assistant:
-        _assistant.clear_history()
+async def clear_chat(session_id: Optional[str] = None):
+    """Clear one session's chat history, or every session's if none is given."""
+    if session_id is None:
+        _sessions.clear()
+    else:
+        _sessions.pop(session_id, None)
     return {"status": "cleared"}
@@ -0,0 +1,237 @@
+"""
+SQLite Connection Pool
+======================
+
+Bounded pool of pre-configured SQLite connections shared by the API
+modules, so requests reuse warm connections and their page caches
+instead of opening a new connection per call.
+
+Author: Chiradeep Chhaya
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# Connections opened per database
+DEFAULT_POOL_SIZE = 8
+
+# Prepared statements kept per connection, keyed by SQL text; enough for
+# every constant query plus the list_review_items variants
+STATEMENT_CACHE_SIZE = 256
+
+# Applied once to every pooled connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    # Wait for a competing write transaction rather than failing with
+    # "database is locked"
+    "PRAGMA busy_timeout=30000",
+)
+
+# Columns the API's queries rely on, added to databases created before them
+API_COLUMNS = (
+    # Action of a decided item, so get_campaign counts certifications and
+    # revocations from an index instead of parsing every decision
+    "ALTER TABLE review_items ADD COLUMN decision_action TEXT"
+    " GENERATED ALWAYS AS (json_extract(decision, '$.action')) VIRTUAL",
+    # Per-campaign decision counters kept by CAMPAIGN_COUNTS_SCHEMA's
+    # triggers, so get_campaign reads them instead of counting items
+    "ALTER TABLE campaigns ADD COLUMN certified_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE campaigns ADD COLUMN revoked_count INTEGER NOT NULL DEFAULT 0",
+)
+
+# Indexes behind the API's and chat tools' hot queries, created when a pool
+# first opens a database
+API_INDEXES = (
+    # Score second, so low-score ranges come back in ORDER BY order
+    "CREATE INDEX IF NOT EXISTS idx_review_items_campaign_score"
+    " ON review_items(campaign_id, assurance_score, status)",
+    # Status and classification filters and get_campaign's grouped counts
+    "CREATE INDEX IF NOT EXISTS idx_review_items_campaign_status_class"
+    " ON review_items(campaign_id, status, classification)",
+    "CREATE INDEX IF NOT EXISTS idx_review_items_campaign_action"
+    " ON review_items(campaign_id, decision_action) WHERE decision_action IS NOT NULL",
+    # Latest review item of a grant, for the employee access summary
+    "CREATE INDEX IF NOT EXISTS idx_review_items_grant_created"
+    " ON review_items(access_grant_id, created_at)",
+    # Audit list filters, newest first
+    "CREATE INDEX IF NOT EXISTS idx_audit_campaign_action_decision_at"
+    " ON audit_records(campaign_id, action, decision_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_campaign_decision_at"
+    " ON audit_records(campaign_id, decision_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_action_decision_at"
+    " ON audit_records(action, decision_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_decision_at ON audit_records(decision_at)",
+    "CREATE INDEX IF NOT EXISTS idx_access_grants_resource_employee"
+    " ON access_grants(resource_id, employee_id)",
+    "CREATE INDEX IF NOT EXISTS idx_employees_job_code ON employees(job_code)",
+    "CREATE INDEX IF NOT EXISTS idx_activity_employee_resource"
+    " ON activity_summaries(employee_id, resource_id)",
+    "CREATE INDEX IF NOT EXISTS idx_activity_last_accessed"
+    " ON activity_summaries(last_accessed)",
+    # Active employees of a team and the teams of a LOB, for the analytics
+    # engine's scoped loads
+    "CREATE INDEX IF NOT EXISTS idx_employees_team_status ON employees(team_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_teams_lob ON teams(lob_id)",
+)
+
+# Tables counted by /api/status; any insert or delete on them bumps
+# stats_version, which the endpoint serves as its ETag
+STATS_VERSION_TABLES = ("employees", "resources", "access_grants", "campaigns")
+
+STATS_VERSION_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS stats_version"
+    " (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO stats_version (id, version) VALUES (1, 0)",
+) + tuple(
+    f"CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_stats_version"
+    f" AFTER {event} ON {table}"
+    " BEGIN UPDATE stats_version SET version = version + 1; END"
+    for table in STATS_VERSION_TABLES
+    for event in ("INSERT", "DELETE")
+)
+
+# Keep campaigns.certified_count and revoked_count in step with the
+# decision_action of the campaign's review items, in the same transaction
+# as whichever write changes them; then recount once per pool open, for
+# decisions made before the triggers existed
+CAMPAIGN_COUNTS_SCHEMA = (
+    "CREATE TRIGGER IF NOT EXISTS trg_review_items_decision_counts"
+    " AFTER UPDATE OF decision ON review_items"
+    " WHEN OLD.decision_action IS NOT NEW.decision_action"
+    " BEGIN UPDATE campaigns SET"
+    " certified_count = certified_count"
+    " + (NEW.decision_action IS 'Certify') - (OLD.decision_action IS 'Certify'),"
+    " revoked_count = revoked_count"
+    " + (NEW.decision_action IS 'Revoke') - (OLD.decision_action IS 'Revoke')"
+    " WHERE id = NEW.campaign_id; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_review_items_insert_decision_counts"
+    " AFTER INSERT ON review_items"
+    " WHEN NEW.decision_action IN ('Certify', 'Revoke')"
+    " BEGIN UPDATE campaigns SET"
+    " certified_count = certified_count + (NEW.decision_action = 'Certify'),"
+    " revoked_count = revoked_count + (NEW.decision_action = 'Revoke')"
+    " WHERE id = NEW.campaign_id; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_review_items_delete_decision_counts"
+    " AFTER DELETE ON review_items"
+    " WHEN OLD.decision_action IN ('Certify', 'Revoke')"
+    " BEGIN UPDATE campaigns SET"
+    " certified_count = certified_count - (OLD.decision_action = 'Certify'),"
+    " revoked_count = revoked_count - (OLD.decision_action = 'Revoke')"
+    " WHERE id = OLD.campaign_id; END",
+    "UPDATE campaigns SET"
+    " certified_count = (SELECT COUNT(*) FROM review_items"
+    " WHERE campaign_id = campaigns.id AND decision_action = 'Certify'),"
+    " revoked_count = (SELECT COUNT(*) FROM review_items"
+    " WHERE campaign_id = campaigns.id AND decision_action = 'Revoke')",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SqlitePool:
+    """Fixed-size pool of SQLite connections handed out one caller at a time."""
+
+    def __init__(self, db_path: str, size: int = DEFAULT_POOL_SIZE):
+        """
+        Open size connections to db_path.
+
+        Args:
+            db_path: Path to the SQLite database
+            size: Number of connections to keep open
+        """
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        # SQLite allows one writer at a time; writers queue on this lock
+        # instead of polling in SQLite's busy handler
+        self.write_lock = threading.Lock()
+        for _ in range(size):
+            self._idle.put(self._open())
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self.connection() as conn:
+            for statement in API_COLUMNS:
+                try:
+                    conn.execute(statement)
+                except sqlite3.OperationalError:
+                    pass  # Column already exists
+            for statement in API_INDEXES + STATS_VERSION_SCHEMA + CAMPAIGN_COUNTS_SCHEMA:
+                try:
+                    conn.execute(statement)
+                except sqlite3.OperationalError as e:
+                    # e.g. review_items before setup_api_tables.py has run
+                    logger.warning(f"Could not create schema object: {e}")
+            conn.commit()
+
+    def _open(self) -> sqlite3.Connection:
+        # Connections move between worker threads, but only one holds each at a time
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take a connection, blocking until one is free."""
+        return self._idle.get()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection, rolling back anything left uncommitted."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of a with block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def write_transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection inside a BEGIN IMMEDIATE transaction, holding write_lock.
+
+        Writers in this process queue on write_lock; one in another process
+        is waited for at BEGIN IMMEDIATE (busy_timeout) rather than failing a
+        later statement with SQLITE_BUSY. The caller commits; anything left
+        uncommitted is rolled back on release.
+        """
+        with self.write_lock, self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools: Dict[str, SqlitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str, size: int = DEFAULT_POOL_SIZE) -> SqlitePool:
+    """Shared pool for db_path, opened on first use."""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = SqlitePool(db_path, size)
+        return pool
@@ -20,33 +20,46 @@ if os.path.exists(_env_path):
     load_dotenv(_env_path)
     print(f"[ARAS] Loaded environment from: {_env_path}")
 
-import sqlite3
-from datetime import datetime
-from typing import List, Optional, Dict, Any
-from contextlib import contextmanager
-import json
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+import asyncio
+import logging
+import random
+import threading
+import time
 import uuid
 
-from fastapi import FastAPI, HTTPException, Query, Depends, Path
+import numpy as np
+
+from fastapi import FastAPI, HTTPException, Query, Depends, Path, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .models import (
-    CampaignCreate, CampaignUpdate, CampaignResponse, CampaignSummaryResponse,
+    CampaignCreate, CampaignUpdate, CampaignResponse, CampaignRecord, CampaignSummaryResponse,
     CampaignProgressResponse, CampaignStatus, CampaignScopeType,
-    ReviewItemResponse, ReviewItemSummary, ReviewItemStatus,
+    ReviewItemResponse, ReviewItemStatus,
     DecisionCreate, BulkDecisionCreate, DecisionAction,
     EmployeeResponse, ResourceResponse, AssuranceScoreResponse,
     AssuranceClassification, SensitivityLevel,
     WeightsResponse, WeightsUpdate, WeightsPreviewResponse,
     GraduationStatusResponse, EmployeeAccessSummaryResponse,
-    AuditRecordResponse, ComplianceSampleResponse, SampleReviewCreate,
+    ComplianceSampleResponse, SampleReviewCreate,
     AnalyticsResponse, PaginatedResponse, ErrorResponse
 )
+from .db_pool import get_pool
+from .responses import ORJSONResponse, json_dumps, json_loads
 
-# Import analytics engine
+# The analytics package (which pulls in pandas) is imported on first use,
+# not at startup
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from analytics.engine import AnalyticsEngine
+if TYPE_CHECKING:
+    from analytics.engine import AnalyticsEngine
+
+logger = logging.getLogger(__name__)
 
 
 # Database path
@@ -55,6 +68,185 @@ DB_PATH = os.path.join(
     "data", "aras.db"
 )
 
+# Persisted proximity matrices, memory-mapped by every worker's engine so
+# they share one copy in the page cache instead of each computing its own.
+# Opt-in: each entry is an n x n matrix, so disk use is the operator's call
+PROXIMITY_CACHE_DIR = os.environ.get("ARAS_PROXIMITY_CACHE_DIR") or None
+
+# Lookups shared by several endpoints, kept as constants so each pooled
+# connection's statement cache reuses one prepared statement per query
+# Campaign columns in the order _campaign_dict unpacks them
+CAMPAIGN_COLUMNS = (
+    "id, name, scope_type, scope_filter, auto_approve_threshold, review_threshold,"
+    " start_date, due_date, status, created_by, created_at"
+)
+SQL_CAMPAIGN = f"SELECT {CAMPAIGN_COLUMNS} FROM campaigns WHERE id = ?"
+SQL_CAMPAIGN_EXISTS = "SELECT id FROM campaigns WHERE id = ?"
+# A campaign with its trigger-maintained decision counters (db_pool's
+# CAMPAIGN_COUNTS_SCHEMA) appended
+SQL_CAMPAIGN_SUMMARY = (
+    f"SELECT {CAMPAIGN_COLUMNS}, certified_count, revoked_count FROM campaigns WHERE id = ?"
+)
+# Review items of a campaign among a JSON array of ids; one statement
+# (and one cached prepared statement) whatever the number of ids. The
+# unary + keeps the planner on primary-key lookups per id instead of
+# scanning the whole campaign through its index.
+SQL_REVIEW_ITEMS_BY_IDS = """
+    SELECT id, status, assurance_score FROM review_items
+    WHERE +campaign_id = ? AND id IN (SELECT value FROM json_each(?))
+"""
+# Decision writes shared by submit_decision and submit_bulk_decisions, so
+# both reuse one prepared statement per connection
+SQL_DECIDE_REVIEW_ITEM = """
+    UPDATE review_items
+    SET status = ?, decision = ?, updated_at = ?
+    WHERE id = ?
+"""
+SQL_INSERT_AUDIT_RECORD = """
+    INSERT INTO audit_records (
+        id, review_item_id, action, decision_by, decision_at,
+        rationale, assurance_score, auto_certified, campaign_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# A review item with its employee and resource, for ReviewItemResponse;
+# explicit column names avoid conflicts between the joined tables
+SQL_REVIEW_ITEM_DETAIL = """
+    SELECT ri.id as ri_id, ri.campaign_id, ri.access_grant_id, ri.employee_id,
+           ri.assurance_score, ri.classification, ri.auto_certify_eligible,
+           ri.clustering_consensus, ri.needs_clustering_review, ri.clustering_disagreement,
+           ri.status as ri_status, ri.decision, ri.created_at as ri_created_at, ri.updated_at as ri_updated_at,
+           ri.system_recommendation, ri.peer_group_size, ri.human_review_reason,
+           e.employee_number, e.email, e.full_name, e.job_title, e.job_code,
+           e.job_family, e.job_level, e.team_id, e.manager_id, e.location_id,
+           e.employment_type, e.status as emp_status,
+           ag.resource_id,
+           r.system_id, r.resource_type, r.name as resource_name,
+           r.description as resource_description, r.sensitivity
+    FROM review_items ri
+    JOIN employees e ON ri.employee_id = e.id
+    JOIN access_grants ag ON ri.access_grant_id = ag.id
+    JOIN resources r ON ag.resource_id = r.id
+    WHERE ri.id = ?
+"""
+
+# Compliance sampling: the eligible ids come from
+# idx_review_items_campaign_status_class alone, and only the sampled
+# items (a JSON array of ids) are joined for their details
+SQL_SAMPLE_CANDIDATES = """
+    SELECT id FROM review_items
+    WHERE campaign_id = ? AND status IN ('Decided', 'Auto-Approved')
+"""
+SQL_SAMPLE_ITEMS = """
+    SELECT ri.id, ri.assurance_score, ri.classification, ri.decision,
+           e.full_name, r.name
+    FROM review_items ri
+    JOIN employees e ON ri.employee_id = e.id
+    JOIN access_grants ag ON ri.access_grant_id = ag.id
+    JOIN resources r ON ag.resource_id = r.id
+    WHERE ri.id IN (SELECT value FROM json_each(?))
+"""
+
+# Archives a campaign unless it already is, returning the updated row
+SQL_ARCHIVE_CAMPAIGN = (
+    "UPDATE campaigns SET status = ? WHERE id = ? AND status != ?"
+    f" RETURNING {CAMPAIGN_COLUMNS}"
+)
+# Employee columns in the order _employee_response unpacks them
+EMPLOYEE_COLUMNS = (
+    "id, employee_number, email, full_name, job_title, job_code, job_family,"
+    " job_level, team_id, manager_id, location_id, employment_type, status"
+)
+SQL_EMPLOYEE = f"SELECT {EMPLOYEE_COLUMNS} FROM employees WHERE id = ?"
+# An employee (EMPLOYEE_COLUMNS), their peer count, then one row per grant
+# with its resource, its latest review item's classification and its
+# activity, in one statement; resource columns are NULL for an employee
+# without grants (or a grant without its resource). The employee CTE is
+# materialized so the peer count runs once, not once per grant.
+SQL_EMPLOYEE_ACCESS_SUMMARY = f"""
+    WITH emp AS MATERIALIZED (
+        SELECT {EMPLOYEE_COLUMNS},
+               (SELECT COUNT(*) FROM employees p
+                WHERE p.job_code = e.job_code AND p.id != e.id) AS peer_count
+        FROM employees e WHERE id = ?
+    )
+    SELECT emp.*, r.id, ag.id, r.name, r.system_id, r.sensitivity, ag.granted_date,
+           ri.classification, ri.auto_certify_eligible,
+           a.total_access_count, a.days_since_last_use
+    FROM emp
+    LEFT JOIN access_grants ag ON ag.employee_id = emp.id
+    LEFT JOIN resources r ON ag.resource_id = r.id
+    LEFT JOIN activity_summaries a ON a.access_grant_id = ag.id
+    LEFT JOIN review_items ri ON ri.id = (
+        SELECT id FROM review_items WHERE access_grant_id = ag.id
+        ORDER BY created_at DESC LIMIT 1
+    )
+"""
+GRADUATION_COLUMNS = (
+    "category, status, metrics, meets_criteria, last_evaluated, graduated_at, approved_by"
+)
+
+# Score ceiling per resource sensitivity (unknown levels get 0.5)
+SENSITIVITY_CEILINGS = {
+    "Critical": 0.0,
+    "Confidential": 0.5,
+    "Internal": 0.85,
+    "Public": 1.0
+}
+
+# Stored value -> enum member, for the per-row conversions in list
+# endpoints; a plain dict lookup instead of an Enum constructor call each
+_SCOPE_TYPES = {member.value: member for member in CampaignScopeType}
+_CAMPAIGN_STATUSES = {member.value: member for member in CampaignStatus}
+_SENSITIVITY_LEVELS = {member.value: member for member in SensitivityLevel}
+_CLASSIFICATIONS = {member.value: member for member in AssuranceClassification}
+_REVIEW_ITEM_STATUSES = {member.value: member for member in ReviewItemStatus}
+
+# Local hour at which the chat dormant-access cache is rebuilt
+DORMANT_CACHE_REFRESH_HOUR = 2
+
+# Encoded get_campaign responses are reused for this long (seconds) unless
+# the database is written through the API first
+SUMMARY_CACHE_TTL = 5.0
+SUMMARY_CACHE_SIZE = 256
+
+# Stored proximity weights are re-read after this long (seconds), so a
+# worker picks up updates made through another worker's update_weights
+WEIGHTS_CACHE_TTL = 5.0
+
+# run_analytics results are reused for this long (seconds) per LOB while
+# stats_version is unchanged. stats_version only moves on inserts and
+# deletes, so the TTL bounds how long updates (a terminated employee,
+# refreshed activity) go unseen
+ANALYTICS_CACHE_TTL = 30.0
+ANALYTICS_CACHE_SIZE = 32
+
+
+async def _refresh_dormant_cache_nightly() -> None:
+    """Rebuild the dormant-access cache now, then daily at DORMANT_CACHE_REFRESH_HOUR."""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_dormant_cache)
+            logger.info("Dormant access cache refreshed")
+        except Exception:
+            logger.exception("Dormant access cache refresh failed")
+        now = datetime.now()
+        next_run = now.replace(hour=DORMANT_CACHE_REFRESH_HOUR, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the connection pool, then run background maintenance for the lifetime of the app."""
+    # Open the pooled connections (and create indexes) before the first request
+    await asyncio.to_thread(get_pool, DB_PATH)
+    refresher = asyncio.create_task(_refresh_dormant_cache_nightly())
+    try:
+        yield
+    finally:
+        refresher.cancel()
+
 
 # FastAPI app
 app = FastAPI(
@@ -62,7 +254,8 @@ app = FastAPI(
     description="Access Recertification Assurance System - REST API",
     version="0.1.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -76,22 +269,54 @@ app.add_middleware(
 
 # Include chat router
 try:
-    from .chat import router as chat_router
+    from .chat import router as chat_router, clear_tool_cache, refresh_dormant_cache
     app.include_router(chat_router, prefix="/api", tags=["chat"])
 except Exception as e:
     print(f"Chat router not available: {e}")
 
+    def clear_tool_cache() -> None:
+        pass
+
+    def refresh_dormant_cache(force: bool = True) -> None:
+        pass
+
 
 # Database connection
 @contextmanager
-def get_db():
-    """Get database connection."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    try:
-        yield conn
-    finally:
-        conn.close()
+def get_db(write: bool = False):
+    """
+    Get a pooled database connection.
+
+    Args:
+        write: Hold the pool's write lock for the duration and open the
+            transaction with BEGIN IMMEDIATE, for endpoints that write
+    """
+    pool = get_pool(DB_PATH)
+    # A write transaction takes SQLite's write lock before the endpoint's
+    # reads, so its checks and writes see one snapshot
+    with pool.write_transaction() if write else pool.connection() as conn:
+        changes = conn.total_changes
+        try:
+            yield conn
+        finally:
+            # Chat tool results and campaign summaries memoize reads, so drop
+            # them after any write
+            if conn.total_changes != changes:
+                clear_tool_cache()
+                clear_summary_cache()
+
+
+_summary_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_summary_cache_lock = threading.Lock()
+_summary_cache_generation = 0
+
+
+def clear_summary_cache() -> None:
+    """Drop all cached get_campaign responses (call after writes to the database)."""
+    global _summary_cache_generation
+    with _summary_cache_lock:
+        _summary_cache.clear()
+        _summary_cache_generation += 1
 
 
 def dict_from_row(row) -> dict:
@@ -99,16 +324,115 @@ def dict_from_row(row) -> dict:
     return dict(zip(row.keys(), row))
 
 
-# Analytics engine singleton
-_engine: Optional[AnalyticsEngine] = None
+@lru_cache(maxsize=256)
+def _parse_scope_filter(scope_filter: Optional[str]) -> Dict[str, Any]:
+    """
+    Decode a campaign's scope_filter, memoized by its text.
+
+    Campaigns mostly share a handful of scopes, so list_campaigns and the
+    activate flow reuse one decoded dict per distinct value. Callers must
+    treat the result as read-only.
+    """
+    return json_loads(scope_filter or "{}")
+
+
+def _employee_response(row) -> EmployeeResponse:
+    """EmployeeResponse from an EMPLOYEE_COLUMNS row."""
+    (
+        employee_id, employee_number, email, full_name, job_title, job_code, job_family,
+        job_level, team_id, manager_id, location_id, employment_type, status
+    ) = row
+    return EmployeeResponse(
+        id=employee_id,
+        employee_number=employee_number,
+        email=email,
+        full_name=full_name,
+        job_title=job_title,
+        job_code=job_code,
+        job_family=job_family,
+        job_level=job_level,
+        team_id=team_id,
+        manager_id=manager_id,
+        location_id=location_id,
+        employment_type=employment_type,
+        status=status
+    )
+
+
+def _campaign_dict(row) -> CampaignRecord:
+    """
+    CampaignRecord from a CAMPAIGN_COLUMNS row, for ORJSONResponse.
+
+    Dates are always written with isoformat(), so the stored strings are
+    returned unparsed rather than round-tripped through datetime.
+    """
+    (
+        campaign_id, name, scope_type, scope_filter, auto_approve_threshold,
+        review_threshold, start_date, due_date, status, created_by, created_at
+    ) = row
+    return {
+        "id": campaign_id,
+        "name": name,
+        "scope_type": _SCOPE_TYPES[scope_type],
+        "scope_filter": _parse_scope_filter(scope_filter),
+        "auto_approve_threshold": float(auto_approve_threshold),
+        "review_threshold": float(review_threshold),
+        "start_date": start_date,
+        "due_date": due_date,
+        "status": _CAMPAIGN_STATUSES[status],
+        "created_by": created_by,
+        "created_at": created_at
+    }
+
+
+def _graduation_dict(row) -> Dict[str, Any]:
+    """GraduationStatusResponse-shaped dict from a GRADUATION_COLUMNS row, for ORJSONResponse."""
+    category, status, metrics, meets_criteria, last_evaluated, graduated_at, approved_by = row
+    metrics = json_loads(metrics or "{}")
+    return {
+        "category": category,
+        "status": status,
+        "metrics": {name: float(value) for name, value in metrics.items()},
+        "meets_criteria": bool(meets_criteria),
+        "last_evaluated": last_evaluated,
+        "graduated_at": graduated_at or None,
+        "approved_by": approved_by
+    }
+
+
+def _uuid4_strings(count: int) -> List[str]:
+    """
+    Generate count random UUID4 strings in one batch.
+
+    Equivalent to str(uuid.uuid4()) per item, but draws the random bytes
+    once and sets the version and variant bits with NumPy, which matters
+    when activation creates a review item for every grant.
+    """
+    raw = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.tobytes().hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, 32 * count, 32)
+    ]
+
+
+# Analytics engine singleton. Handlers are plain functions run in FastAPI's
+# threadpool, so creation and run_analysis (which mutates the engine) are
+# serialized behind this lock.
+_engine: Optional["AnalyticsEngine"] = None
+_engine_lock = threading.RLock()
 
-def get_engine() -> AnalyticsEngine:
+def get_engine() -> "AnalyticsEngine":
     """Get or create analytics engine."""
     global _engine
-    if _engine is None:
-        _engine = AnalyticsEngine(DB_PATH)
-        _engine.load_data()
-    return _engine
+    with _engine_lock:
+        if _engine is None:
+            from analytics.engine import AnalyticsEngine
+            _engine = AnalyticsEngine(DB_PATH, proximity_cache_dir=PROXIMITY_CACHE_DIR)
+            _engine.load_data()
+        return _engine
 
 
 # ============================================================================
@@ -122,9 +446,21 @@ async def health_check():
 
 
 @app.get("/api/status")
-async def system_status():
-    """Get system status and statistics."""
+def system_status(request: Request, response: Response):
+    """
+    Get system status and statistics.
+
+    Sends a weak ETag from stats_version, which changes whenever a counted
+    table gains or loses rows, and answers a matching If-None-Match with 304
+    before running any counts.
+    """
     with get_db() as conn:
+        version = conn.execute("SELECT version FROM stats_version").fetchone()[0]
+        etag = f'W/"{version}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
         cursor = conn.cursor()
 
         # Get counts
@@ -158,12 +494,13 @@ async def system_status():
 # ============================================================================
 
 @app.post("/api/campaigns", response_model=CampaignResponse, status_code=201)
-async def create_campaign(campaign: CampaignCreate):
+def create_campaign(campaign: CampaignCreate):
     """Create a new certification campaign."""
     campaign_id = str(uuid.uuid4())
     now = datetime.utcnow()
+    now_iso = now.isoformat()
 
-    with get_db() as conn:
+    with get_db(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO campaigns (
@@ -172,9 +509,9 @@ async def create_campaign(campaign: CampaignCreate):
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             campaign_id, campaign.name, campaign.scope_type.value,
-            json.dumps(campaign.scope_filter), campaign.auto_approve_threshold,
-            campaign.review_threshold, now.isoformat(), campaign.due_date.isoformat(),
-            CampaignStatus.DRAFT.value, "system", now.isoformat()
+            json_dumps(campaign.scope_filter), campaign.auto_approve_threshold,
+            campaign.review_threshold, now_iso, campaign.due_date.isoformat(),
+            CampaignStatus.DRAFT.value, "system", now_iso
         ))
         conn.commit()
 
@@ -193,8 +530,8 @@ async def create_campaign(campaign: CampaignCreate):
         )
 
 
-@app.get("/api/campaigns", response_model=List[CampaignResponse])
-async def list_campaigns(
+@app.get("/api/campaigns", responses={200: {"model": List[CampaignResponse]}})
+def list_campaigns(
     status: Optional[CampaignStatus] = None,
     include_archived: bool = Query(default=False, description="Include archived campaigns"),
     limit: int = Query(default=50, ge=1, le=100)
@@ -205,138 +542,112 @@ async def list_campaigns(
 
         if status:
             cursor.execute(
-                "SELECT * FROM campaigns WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                f"SELECT {CAMPAIGN_COLUMNS} FROM campaigns WHERE status = ? ORDER BY created_at DESC LIMIT ?",
                 (status.value, limit)
             )
         elif include_archived:
             cursor.execute(
-                "SELECT * FROM campaigns ORDER BY created_at DESC LIMIT ?",
+                f"SELECT {CAMPAIGN_COLUMNS} FROM campaigns ORDER BY created_at DESC LIMIT ?",
                 (limit,)
             )
         else:
             cursor.execute(
-                "SELECT * FROM campaigns WHERE status != ? ORDER BY created_at DESC LIMIT ?",
+                f"SELECT {CAMPAIGN_COLUMNS} FROM campaigns WHERE status != ? ORDER BY created_at DESC LIMIT ?",
                 (CampaignStatus.ARCHIVED.value, limit)
             )
 
-        campaigns = []
-        for row in cursor.fetchall():
-            row_dict = dict_from_row(row)
-            campaigns.append(CampaignResponse(
-                id=row_dict["id"],
-                name=row_dict["name"],
-                scope_type=CampaignScopeType(row_dict["scope_type"]),
-                scope_filter=json.loads(row_dict["scope_filter"] or "{}"),
-                auto_approve_threshold=row_dict["auto_approve_threshold"],
-                review_threshold=row_dict["review_threshold"],
-                start_date=datetime.fromisoformat(row_dict["start_date"]),
-                due_date=datetime.fromisoformat(row_dict["due_date"]),
-                status=CampaignStatus(row_dict["status"]),
-                created_by=row_dict["created_by"],
-                created_at=datetime.fromisoformat(row_dict["created_at"])
-            ))
+        campaigns = [_campaign_dict(row) for row in cursor]
+        return ORJSONResponse(campaigns)
+
+
+@app.get("/api/campaigns/{campaign_id}", responses={200: {"model": CampaignSummaryResponse}})
+def get_campaign(campaign_id: str = Path(...)):
+    """Get campaign details with statistics, reusing a recent encoded response."""
+    with _summary_cache_lock:
+        cached = _summary_cache.get(campaign_id)
+        if cached is not None and cached[0] > time.monotonic():
+            _summary_cache.move_to_end(campaign_id)
+            return Response(cached[1], media_type="application/json")
+        generation = _summary_cache_generation
+
+    response = _campaign_summary(campaign_id)
 
-        return campaigns
+    with _summary_cache_lock:
+        # Don't store a summary that may predate a write made while it ran
+        if generation == _summary_cache_generation:
+            _summary_cache[campaign_id] = (time.monotonic() + SUMMARY_CACHE_TTL, bytes(response.body))
+            _summary_cache.move_to_end(campaign_id)
+            while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+                _summary_cache.popitem(last=False)
+    return response
 
 
-@app.get("/api/campaigns/{campaign_id}", response_model=CampaignSummaryResponse)
-async def get_campaign(campaign_id: str = Path(...)):
-    """Get campaign details with statistics."""
+def _campaign_summary(campaign_id: str) -> ORJSONResponse:
+    """CampaignSummaryResponse for campaign_id, computed from the database."""
     with get_db() as conn:
         cursor = conn.cursor()
 
-        # Get campaign
-        cursor.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,))
+        # Get campaign and its decision counters
+        cursor.execute(SQL_CAMPAIGN_SUMMARY, (campaign_id,))
         row = cursor.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Campaign not found")
 
-        row_dict = dict_from_row(row)
-        campaign = CampaignResponse(
-            id=row_dict["id"],
-            name=row_dict["name"],
-            scope_type=CampaignScopeType(row_dict["scope_type"]),
-            scope_filter=json.loads(row_dict["scope_filter"] or "{}"),
-            auto_approve_threshold=row_dict["auto_approve_threshold"],
-            review_threshold=row_dict["review_threshold"],
-            start_date=datetime.fromisoformat(row_dict["start_date"]),
-            due_date=datetime.fromisoformat(row_dict["due_date"]),
-            status=CampaignStatus(row_dict["status"]),
-            created_by=row_dict["created_by"],
-            created_at=datetime.fromisoformat(row_dict["created_at"])
-        )
+        campaign = _campaign_dict(row[:-2])
+        certified, revoked = row[-2:]
 
-        # Get review item statistics
+        # Item counts from one grouped scan of the campaign, answered from
+        # idx_review_items_campaign_status_class alone
         cursor.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Auto-Approved' THEN 1 ELSE 0 END) as auto_approved,
-                SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
-                SUM(CASE WHEN status = 'Decided' THEN 1 ELSE 0 END) as decided
+            SELECT classification, status, COUNT(*) as count
             FROM review_items WHERE campaign_id = ?
+            GROUP BY status, classification
         """, (campaign_id,))
-        stats = cursor.fetchone()
 
-        # Get decision breakdown
-        cursor.execute("""
-            SELECT
-                SUM(CASE WHEN json_extract(decision, '$.action') = 'Certify' THEN 1 ELSE 0 END) as certified,
-                SUM(CASE WHEN json_extract(decision, '$.action') = 'Revoke' THEN 1 ELSE 0 END) as revoked
-            FROM review_items WHERE campaign_id = ? AND decision IS NOT NULL
-        """, (campaign_id,))
-        decisions = cursor.fetchone()
-
-        # Get score distribution
-        cursor.execute("""
-            SELECT classification, COUNT(*) as count
-            FROM review_items WHERE campaign_id = ?
-            GROUP BY classification
-        """, (campaign_id,))
-        dist_rows = cursor.fetchall()
-        score_distribution = {row["classification"]: row["count"] for row in dist_rows}
-
-        total = stats["total"] or 0
-        auto_approved = stats["auto_approved"] or 0
-        pending = stats["pending"] or 0
-        decided = stats["decided"] or 0
-        certified = decisions["certified"] or 0
-        revoked = decisions["revoked"] or 0
+        total = auto_approved = pending = decided = 0
+        score_distribution: Dict[str, int] = {}
+        for row in cursor.fetchall():
+            count = row["count"]
+            total += count
+            score_distribution[row["classification"]] = (
+                score_distribution.get(row["classification"], 0) + count
+            )
+            if row["status"] == "Auto-Approved":
+                auto_approved += count
+            elif row["status"] == "Pending":
+                pending += count
+            elif row["status"] == "Decided":
+                decided += count
+        score_distribution = dict(sorted(score_distribution.items()))
 
         completed = auto_approved + decided
-        completion_pct = (completed / total * 100) if total > 0 else 0
-        revocation_rate = (revoked / (certified + revoked) * 100) if (certified + revoked) > 0 else 0
-
-        return CampaignSummaryResponse(
-            campaign=campaign,
-            total_items=total,
-            pending_items=pending,
-            auto_approved_items=auto_approved,
-            manually_reviewed_items=decided,
-            certified_items=certified,
-            revoked_items=revoked,
-            completion_percentage=round(completion_pct, 1),
-            revocation_rate=round(revocation_rate, 1),
-            score_distribution=score_distribution
-        )
+        completion_pct = (completed / total * 100) if total > 0 else 0.0
+        revocation_rate = (revoked / (certified + revoked) * 100) if (certified + revoked) > 0 else 0.0
+
+        # CampaignSummaryResponse shape, encoded by ORJSONResponse
+        return ORJSONResponse({
+            "campaign": campaign,
+            "total_items": total,
+            "pending_items": pending,
+            "auto_approved_items": auto_approved,
+            "manually_reviewed_items": decided,
+            "certified_items": certified,
+            "revoked_items": revoked,
+            "completion_percentage": round(completion_pct, 1),
+            "revocation_rate": round(revocation_rate, 1),
+            "score_distribution": score_distribution
+        })
 
 
 @app.patch("/api/campaigns/{campaign_id}", response_model=CampaignResponse)
-async def update_campaign(
+def update_campaign(
     campaign_id: str = Path(...),
     update: CampaignUpdate = None
 ):
     """Update campaign settings."""
-    with get_db() as conn:
+    with get_db(write=True) as conn:
         cursor = conn.cursor()
 
-        # Check campaign exists
-        cursor.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,))
-        row = cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Campaign not found")
-
-        row_dict = dict_from_row(row)
-
         # Build update
         updates = []
         params = []
@@ -357,212 +668,197 @@ async def update_campaign(
             updates.append("due_date = ?")
             params.append(update.due_date.isoformat())
 
+        # Update and read back the campaign in one statement; a missing
+        # campaign matches no row either way
         if updates:
             params.append(campaign_id)
             cursor.execute(
-                f"UPDATE campaigns SET {', '.join(updates)} WHERE id = ?",
+                f"UPDATE campaigns SET {', '.join(updates)} WHERE id = ? RETURNING {CAMPAIGN_COLUMNS}",
                 params
             )
+            row = cursor.fetchone()
             conn.commit()
+        else:
+            cursor.execute(SQL_CAMPAIGN, (campaign_id,))
+            row = cursor.fetchone()
 
-        # Return updated campaign
-        cursor.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,))
-        row = cursor.fetchone()
-        row_dict = dict_from_row(row)
+        if not row:
+            raise HTTPException(status_code=404, detail="Campaign not found")
 
-        return CampaignResponse(
-            id=row_dict["id"],
-            name=row_dict["name"],
-            scope_type=CampaignScopeType(row_dict["scope_type"]),
-            scope_filter=json.loads(row_dict["scope_filter"] or "{}"),
-            auto_approve_threshold=row_dict["auto_approve_threshold"],
-            review_threshold=row_dict["review_threshold"],
-            start_date=datetime.fromisoformat(row_dict["start_date"]),
-            due_date=datetime.fromisoformat(row_dict["due_date"]),
-            status=CampaignStatus(row_dict["status"]),
-            created_by=row_dict["created_by"],
-            created_at=datetime.fromisoformat(row_dict["created_at"])
-        )
+        return ORJSONResponse(_campaign_dict(row))
 
 
 @app.post("/api/campaigns/{campaign_id}/archive", response_model=CampaignResponse)
-async def archive_campaign(campaign_id: str = Path(...)):
+def archive_campaign(campaign_id: str = Path(...)):
     """Archive a campaign."""
-    with get_db() as conn:
+    with get_db(write=True) as conn:
         cursor = conn.cursor()
 
-        # Check campaign exists
-        cursor.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,))
+        # Archive any campaign except already archived ones, reading back
+        # the updated row in the same statement
+        archived = CampaignStatus.ARCHIVED.value
+        cursor.execute(SQL_ARCHIVE_CAMPAIGN, (archived, campaign_id, archived))
         row = cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Campaign not found")
-
-        row_dict = dict_from_row(row)
+        conn.commit()
 
-        # Can archive any campaign except already archived ones
-        if row_dict["status"] == CampaignStatus.ARCHIVED.value:
+        if not row:
+            # No row updated: either missing or already archived
+            cursor.execute(SQL_CAMPAIGN_EXISTS, (campaign_id,))
+            if not cursor.fetchone():
+                raise HTTPException(status_code=404, detail="Campaign not found")
             raise HTTPException(
                 status_code=400,
                 detail="Campaign is already archived"
             )
 
-        # Archive the campaign
-        cursor.execute(
-            "UPDATE campaigns SET status = ? WHERE id = ?",
-            (CampaignStatus.ARCHIVED.value, campaign_id)
-        )
-        conn.commit()
-
-        # Return updated campaign
-        cursor.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,))
-        row = cursor.fetchone()
-        row_dict = dict_from_row(row)
-
-        return CampaignResponse(
-            id=row_dict["id"],
-            name=row_dict["name"],
-            scope_type=CampaignScopeType(row_dict["scope_type"]),
-            scope_filter=json.loads(row_dict["scope_filter"] or "{}"),
-            auto_approve_threshold=row_dict["auto_approve_threshold"],
-            review_threshold=row_dict["review_threshold"],
-            start_date=datetime.fromisoformat(row_dict["start_date"]),
-            due_date=datetime.fromisoformat(row_dict["due_date"]),
-            status=CampaignStatus(row_dict["status"]),
-            created_by=row_dict["created_by"],
-            created_at=datetime.fromisoformat(row_dict["created_at"])
-        )
+        return ORJSONResponse(_campaign_dict(row))
 
 
 @app.post("/api/campaigns/{campaign_id}/activate", response_model=CampaignSummaryResponse)
-async def activate_campaign(campaign_id: str = Path(...)):
+def activate_campaign(campaign_id: str = Path(...)):
     """Activate a campaign - run analytics and generate review items."""
-    import statistics
-
+    # Check campaign exists and is in draft status
     with get_db() as conn:
-        cursor = conn.cursor()
+        row = conn.execute(SQL_CAMPAIGN, (campaign_id,)).fetchone()
+        row_dict = dict_from_row(row) if row else None
+    if row_dict is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
 
-        # Check campaign exists and is in draft status
-        cursor.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,))
-        row = cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Campaign not found")
+    if row_dict["status"] != CampaignStatus.DRAFT.value:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campaign is {row_dict['status']}, must be Draft to activate"
+        )
 
-        row_dict = dict_from_row(row)
-        if row_dict["status"] != CampaignStatus.DRAFT.value:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Campaign is {row_dict['status']}, must be Draft to activate"
-            )
+    # Parse scope
+    scope_filter = _parse_scope_filter(row_dict["scope_filter"])
+    lob_filter = scope_filter.get("lob")
+
+    # Run analytics with no pooled connection held: a run takes from
+    # seconds for one LOB to minutes unfiltered
+    with _engine_lock:
+        result = get_engine().run_analysis(lob_filter=lob_filter)
 
-        # Parse scope
-        scope_filter = json.loads(row_dict["scope_filter"] or "{}")
-        lob_filter = scope_filter.get("lob")
+    # Check if we have any results
+    if result.total_grants == 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No access grants found for LOB filter: {lob_filter}"
+        )
 
-        # Run analytics
-        engine = get_engine()
-        result = engine.run_analysis(lob_filter=lob_filter)
+    scores = list(result.assurance_scores.values())
+    peer_sizes = np.fromiter((s.total_peers for s in scores), dtype=np.int64, count=len(scores))
+
+    # Calculate peer group size statistics to identify small peer groups
+    if peer_sizes.size > 1:
+        mean_peer_size = float(peer_sizes.mean())
+        stdev_peer_size = float(peer_sizes.std(ddof=1)) if peer_sizes.size > 2 else 0.0
+        small_peer_threshold = max(3, mean_peer_size - stdev_peer_size)  # At least 3
+    else:
+        mean_peer_size = int(peer_sizes[0]) if peer_sizes.size else 0
+        stdev_peer_size = 0
+        small_peer_threshold = 3
+
+    auto_approve_threshold = row_dict["auto_approve_threshold"]
+    review_threshold = row_dict["review_threshold"]
+
+    # Recommendation and status for every grant at once
+    overall = np.fromiter((s.overall_score for s in scores), dtype=np.float64, count=len(scores))
+    auto_ok = np.fromiter((s.auto_certify_eligible for s in scores), dtype=bool, count=len(scores))
+    consensus_list = [result.consensus_results.get(s.employee_id) for s in scores]
+    needs_cluster = np.fromiter(
+        (c is not None and bool(c.needs_human_review) for c in consensus_list),
+        dtype=bool, count=len(scores)
+    )
+    is_small = peer_sizes < small_peer_threshold
+    flagged = needs_cluster | is_small
+    below_review = overall < review_threshold
 
-        # Check if we have any results
-        if result.total_grants == 0:
-            raise HTTPException(
-                status_code=400,
-                detail=f"No access grants found for LOB filter: {lob_filter}"
-            )
+    # What the system WOULD recommend (for transparency)
+    recommendation_codes = np.where(
+        overall >= auto_approve_threshold, 0, np.where(below_review, 1, 2)
+    )
+    # Don't auto-approve if human review is needed; red flags or a low
+    # score need review; anything else is pending manual review
+    status_codes = np.where(
+        auto_ok & ~flagged, 0, np.where(flagged | below_review, 1, 2)
+    )
+    recommendations = ("Certify", "Review Carefully", "Likely Certify")
+    statuses = (
+        ReviewItemStatus.AUTO_APPROVED.value,
+        ReviewItemStatus.NEEDS_REVIEW.value,
+        ReviewItemStatus.PENDING.value
+    )
 
-        # Calculate peer group size statistics to identify small peer groups
-        peer_group_sizes = [score.total_peers for score in result.assurance_scores.values()]
-        if len(peer_group_sizes) > 1:
-            mean_peer_size = statistics.mean(peer_group_sizes)
-            stdev_peer_size = statistics.stdev(peer_group_sizes) if len(peer_group_sizes) > 2 else 0
-            small_peer_threshold = max(3, mean_peer_size - stdev_peer_size)  # At least 3
-        else:
-            mean_peer_size = peer_group_sizes[0] if peer_group_sizes else 0
-            stdev_peer_size = 0
-            small_peer_threshold = 3
-
-        auto_approve_threshold = row_dict["auto_approve_threshold"]
-        review_threshold = row_dict["review_threshold"]
-
-        # Create review items
-        now = datetime.utcnow()
-        for grant_id, score in result.assurance_scores.items():
-            emp_id = score.employee_id
-
-            # Get consensus info
-            consensus = result.consensus_results.get(emp_id)
-            consensus_score_val = consensus.consensus_score if consensus else 1.0
-            needs_cluster_review = consensus.needs_human_review if consensus else False
-            disagreement = consensus.disagreement_reason if consensus else None
-
-            # Check for small peer group
-            peer_group_size = score.total_peers
-            is_small_peer_group = peer_group_size < small_peer_threshold
-
-            # Determine what the system WOULD recommend (for transparency)
-            if score.overall_score >= auto_approve_threshold:
-                system_recommendation = "Certify"
-            elif score.overall_score < review_threshold:
-                system_recommendation = "Review Carefully"
-            else:
-                system_recommendation = "Likely Certify"
-
-            # Collect reasons requiring human review
+    # Create review items
+    now = datetime.utcnow().isoformat()
+    item_ids = _uuid4_strings(len(scores))
+    review_rows = []
+    for i, (grant_id, score) in enumerate(result.assurance_scores.items()):
+        consensus = consensus_list[i]
+        consensus_score_val = consensus.consensus_score if consensus else 1.0
+        needs_cluster_review = consensus.needs_human_review if consensus else False
+        disagreement = consensus.disagreement_reason if consensus else None
+        peer_group_size = score.total_peers
+
+        # Collect reasons requiring human review
+        human_review_reason = None
+        if flagged[i]:
             human_review_reasons = []
-            if needs_cluster_review:
+            if needs_cluster[i]:
                 human_review_reasons.append(f"Clustering disagreement: {disagreement or 'algorithms disagree on peer grouping'}")
-            if is_small_peer_group:
+            if is_small[i]:
                 human_review_reasons.append(f"Small peer group ({peer_group_size} peers vs avg {mean_peer_size:.0f})")
+            human_review_reason = "; ".join(human_review_reasons)
+
+        review_rows.append((
+            item_ids[i], campaign_id, grant_id, score.employee_id,
+            score.overall_score, score.classification, score.auto_certify_eligible,
+            consensus_score_val, needs_cluster_review, disagreement,
+            statuses[status_codes[i]], now, recommendations[recommendation_codes[i]],
+            peer_group_size, human_review_reason
+        ))
 
-            human_review_reason = "; ".join(human_review_reasons) if human_review_reasons else None
-
-            # Determine initial status - DON'T auto-approve if human review needed
-            if score.auto_certify_eligible and not human_review_reasons:
-                # Safe to auto-approve: high score AND no red flags
-                status = ReviewItemStatus.AUTO_APPROVED.value
-            elif human_review_reasons:
-                # Has red flags - always needs review regardless of score
-                status = ReviewItemStatus.NEEDS_REVIEW.value
-            elif score.overall_score < review_threshold:
-                # Low score, needs attention
-                status = ReviewItemStatus.NEEDS_REVIEW.value
-            else:
-                # Medium score, pending manual review
-                status = ReviewItemStatus.PENDING.value
-
-            item_id = str(uuid.uuid4())
-            cursor.execute("""
-                INSERT INTO review_items (
-                    id, campaign_id, access_grant_id, employee_id,
-                    assurance_score, classification, auto_certify_eligible,
-                    clustering_consensus, needs_clustering_review, clustering_disagreement,
-                    status, created_at, system_recommendation, peer_group_size, human_review_reason
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                item_id, campaign_id, grant_id, emp_id,
-                score.overall_score, score.classification, score.auto_certify_eligible,
-                consensus_score_val, needs_cluster_review, disagreement,
-                status, now.isoformat(), system_recommendation, peer_group_size, human_review_reason
-            ))
-
-        # Update campaign status
+    # One prepared statement and one transaction for every item, queued on
+    # the pool's write lock like every other writer. The Draft check above
+    # ran before analytics, so claim the campaign again inside the write
+    # transaction: only one concurrent activation sees it still in Draft
+    with get_db(write=True) as conn:
+        cursor = conn.cursor()
         cursor.execute(
-            "UPDATE campaigns SET status = ? WHERE id = ?",
-            (CampaignStatus.ACTIVE.value, campaign_id)
+            "UPDATE campaigns SET status = ? WHERE id = ? AND status = ?",
+            (CampaignStatus.ACTIVE.value, campaign_id, CampaignStatus.DRAFT.value)
         )
+        if cursor.rowcount == 0:
+            raise HTTPException(
+                status_code=409,
+                detail="Campaign was activated or changed by another request"
+            )
+        cursor.executemany("""
+            INSERT INTO review_items (
+                id, campaign_id, access_grant_id, employee_id,
+                assurance_score, classification, auto_certify_eligible,
+                clustering_consensus, needs_clustering_review, clustering_disagreement,
+                status, created_at, system_recommendation, peer_group_size, human_review_reason
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, review_rows)
         conn.commit()
 
     # Return updated summary
-    return await get_campaign(campaign_id)
+    return get_campaign(campaign_id)
 
 
-@app.get("/api/campaigns/{campaign_id}/progress", response_model=List[CampaignProgressResponse])
-async def get_campaign_progress(campaign_id: str = Path(...)):
+@app.get(
+    "/api/campaigns/{campaign_id}/progress",
+    responses={200: {"model": List[CampaignProgressResponse]}}
+)
+def get_campaign_progress(campaign_id: str = Path(...)):
     """Get campaign progress by reviewer."""
     with get_db() as conn:
         cursor = conn.cursor()
 
         # Check campaign exists
-        cursor.execute("SELECT id FROM campaigns WHERE id = ?", (campaign_id,))
+        cursor.execute(SQL_CAMPAIGN_EXISTS, (campaign_id,))
         if not cursor.fetchone():
             raise HTTPException(status_code=404, detail="Campaign not found")
 
@@ -579,30 +875,91 @@ async def get_campaign_progress(campaign_id: str = Path(...)):
             LEFT JOIN employees m ON e.manager_id = m.id
             WHERE ri.campaign_id = ?
             GROUP BY e.manager_id, m.full_name
+            ORDER BY completed * 1.0 / COUNT(*), e.manager_id, m.full_name
         """, (campaign_id,))
 
+        # Plain dicts in CampaignProgressResponse shape, encoded by ORJSONResponse,
+        # already in ascending completion order
         progress = []
-        for row in cursor.fetchall():
+        for row in cursor:
             total = row["total_items"]
             completed = row["completed"]
-            progress.append(CampaignProgressResponse(
-                reviewer_id=row["reviewer_id"] or "unknown",
-                reviewer_name=row["reviewer_name"] or "Unknown",
-                total_items=total,
-                completed_items=completed,
-                pending_items=row["pending"],
-                completion_percentage=round(completed / total * 100, 1) if total > 0 else 0
-            ))
+            progress.append({
+                "reviewer_id": row["reviewer_id"] or "unknown",
+                "reviewer_name": row["reviewer_name"] or "Unknown",
+                "total_items": total,
+                "completed_items": completed,
+                "pending_items": row["pending"],
+                "completion_percentage": round(completed / total * 100, 1) if total > 0 else 0.0
+            })
 
-        return sorted(progress, key=lambda x: x.completion_percentage)
+        return ORJSONResponse(progress)
 
 
 # ============================================================================
 # Review Items
 # ============================================================================
 
-@app.get("/api/campaigns/{campaign_id}/review-items", response_model=PaginatedResponse)
-async def list_review_items(
+@lru_cache(maxsize=None)
+def _review_items_queries(
+    has_status: bool,
+    has_classification: bool,
+    has_needs_review: bool,
+    has_search: bool,
+    sort_by: str,
+    sort_order: str
+) -> Tuple[str, str]:
+    """
+    Build list_review_items' count and page queries for one filter/sort shape.
+
+    Memoized, so each shape's SQL text is assembled once and maps to one
+    cached prepared statement per connection.
+
+    Returns:
+        (count query, page query); the page query takes LIMIT and OFFSET
+        after the filter parameters
+    """
+    joins = """
+        JOIN employees e ON ri.employee_id = e.id
+        JOIN access_grants ag ON ri.access_grant_id = ag.id
+        JOIN resources r ON ag.resource_id = r.id
+    """
+    where = " WHERE ri.campaign_id = ?"
+    if has_status:
+        where += " AND ri.status = ?"
+    if has_classification:
+        where += " AND ri.classification = ?"
+    if has_needs_review:
+        where += " AND ri.needs_clustering_review = ?"
+    if has_search:
+        where += " AND (e.full_name LIKE ? OR r.name LIKE ?)"
+
+    sort_column = {
+        "assurance_score": "ri.assurance_score",
+        "employee_name": "e.full_name",
+        "resource_name": "r.name",
+        "status": "ri.status"
+    }.get(sort_by, "ri.assurance_score")
+
+    # Every review item has its employee, grant and resource, so the count
+    # only needs the joins when the search filter reads their columns
+    count_query = "SELECT COUNT(*) FROM review_items ri" + (joins if has_search else "") + where
+    # Columns in the order list_review_items unpacks them
+    page_query = f"""
+        SELECT ri.id, ri.employee_id, e.full_name, e.job_title,
+               ri.access_grant_id, r.name, r.sensitivity,
+               ri.assurance_score, ri.classification, ri.auto_certify_eligible, ri.status
+        FROM review_items ri
+        {joins}
+        {where}
+        ORDER BY {sort_column} {sort_order.upper()}
+        LIMIT ? OFFSET ?
+    """
+    return count_query, page_query
+
+
+@app.get("/api/campaigns/{campaign_id}/review-items", responses={200: {"model": PaginatedResponse}})
+def list_review_items(
     campaign_id: str = Path(...),
     status: Optional[ReviewItemStatus] = None,
     classification: Optional[AssuranceClassification] = None,
@@ -617,191 +974,148 @@ async def list_review_items(
     with get_db() as conn:
         cursor = conn.cursor()
 
-        # Build query
-        base_query = """
-            SELECT ri.*,
-                   e.full_name as employee_name, e.job_title as employee_title,
-                   r.name as resource_name, r.sensitivity as resource_sensitivity
-            FROM review_items ri
-            JOIN employees e ON ri.employee_id = e.id
-            JOIN access_grants ag ON ri.access_grant_id = ag.id
-            JOIN resources r ON ag.resource_id = r.id
-            WHERE ri.campaign_id = ?
-        """
+        count_query, page_query = _review_items_queries(
+            status is not None, classification is not None, needs_review is not None,
+            bool(search), sort_by, sort_order
+        )
         params = [campaign_id]
-
         if status:
-            base_query += " AND ri.status = ?"
             params.append(status.value)
-
         if classification:
-            base_query += " AND ri.classification = ?"
             params.append(classification.value)
-
         if needs_review is not None:
-            base_query += " AND ri.needs_clustering_review = ?"
             params.append(1 if needs_review else 0)
-
         if search:
-            base_query += " AND (e.full_name LIKE ? OR r.name LIKE ?)"
             search_term = f"%{search}%"
             params.extend([search_term, search_term])
 
         # Get total count
-        count_query = f"SELECT COUNT(*) FROM ({base_query})"
         cursor.execute(count_query, params)
         total = cursor.fetchone()[0]
 
-        # Add sorting and pagination
-        sort_column = {
-            "assurance_score": "ri.assurance_score",
-            "employee_name": "e.full_name",
-            "resource_name": "r.name",
-            "status": "ri.status"
-        }.get(sort_by, "ri.assurance_score")
-
-        base_query += f" ORDER BY {sort_column} {sort_order.upper()}"
-        base_query += " LIMIT ? OFFSET ?"
+        # Add pagination
         params.extend([page_size, (page - 1) * page_size])
-
-        cursor.execute(base_query, params)
-
-        items = []
-        for row in cursor.fetchall():
-            row_dict = dict_from_row(row)
-            items.append(ReviewItemSummary(
-                id=row_dict["id"],
-                employee_id=row_dict["employee_id"],
-                employee_name=row_dict["employee_name"],
-                employee_title=row_dict["employee_title"],
-                resource_id=row_dict["access_grant_id"],
-                resource_name=row_dict["resource_name"],
-                resource_sensitivity=SensitivityLevel(row_dict["resource_sensitivity"]),
-                assurance_score=row_dict["assurance_score"],
-                classification=AssuranceClassification(row_dict["classification"]),
-                auto_certify_eligible=bool(row_dict["auto_certify_eligible"]),
-                usage_pattern="Unknown",  # Would need activity join
-                peer_percentage=0.0,  # Would need calculation
-                status=ReviewItemStatus(row_dict["status"]),
-                explanations=[]
-            ))
+        cursor.execute(page_query, params)
+
+        # Plain dicts in ReviewItemSummary shape, built straight from the
+        # cursor's row tuples and encoded by ORJSONResponse
+        items = [
+            {
+                "id": item_id,
+                "employee_id": employee_id,
+                "employee_name": employee_name,
+                "employee_title": employee_title,
+                "resource_id": access_grant_id,
+                "resource_name": resource_name,
+                "resource_sensitivity": _SENSITIVITY_LEVELS[resource_sensitivity],
+                "assurance_score": float(assurance_score),
+                "classification": _CLASSIFICATIONS[classification],
+                "auto_certify_eligible": bool(auto_certify_eligible),
+                "usage_pattern": "Unknown",  # Would need activity join
+                "peer_percentage": 0.0,  # Would need calculation
+                "status": _REVIEW_ITEM_STATUSES[item_status],
+                "explanations": []
+            }
+            for (
+                item_id, employee_id, employee_name, employee_title, access_grant_id,
+                resource_name, resource_sensitivity, assurance_score, classification,
+                auto_certify_eligible, item_status
+            ) in cursor
+        ]
 
         total_pages = (total + page_size - 1) // page_size
 
-        return PaginatedResponse(
-            items=[item.model_dump() for item in items],
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
+        return ORJSONResponse({
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages
+        })
 
 
 @app.get("/api/review-items/{item_id}", response_model=ReviewItemResponse)
-async def get_review_item(item_id: str = Path(...)):
+def get_review_item(item_id: str = Path(...)):
     """Get detailed review item information."""
     with get_db() as conn:
         cursor = conn.cursor()
 
-        # Get review item with joins - use explicit column names to avoid conflicts
-        cursor.execute("""
-            SELECT ri.id as ri_id, ri.campaign_id, ri.access_grant_id, ri.employee_id,
-                   ri.assurance_score, ri.classification, ri.auto_certify_eligible,
-                   ri.clustering_consensus, ri.needs_clustering_review, ri.clustering_disagreement,
-                   ri.status as ri_status, ri.decision, ri.created_at as ri_created_at, ri.updated_at as ri_updated_at,
-                   ri.system_recommendation, ri.peer_group_size, ri.human_review_reason,
-                   e.employee_number, e.email, e.full_name, e.job_title, e.job_code,
-                   e.job_family, e.job_level, e.team_id, e.manager_id, e.location_id,
-                   e.employment_type, e.status as emp_status,
-                   ag.resource_id,
-                   r.system_id, r.resource_type, r.name as resource_name,
-                   r.description as resource_description, r.sensitivity
-            FROM review_items ri
-            JOIN employees e ON ri.employee_id = e.id
-            JOIN access_grants ag ON ri.access_grant_id = ag.id
-            JOIN resources r ON ag.resource_id = r.id
-            WHERE ri.id = ?
-        """, (item_id,))
-
+        cursor.execute(SQL_REVIEW_ITEM_DETAIL, (item_id,))
         row = cursor.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Review item not found")
 
-        row_dict = dict_from_row(row)
-
-        # Build response
-        employee = EmployeeResponse(
-            id=row_dict["employee_id"],
-            employee_number=row_dict["employee_number"],
-            email=row_dict["email"],
-            full_name=row_dict["full_name"],
-            job_title=row_dict["job_title"],
-            job_code=row_dict["job_code"],
-            job_family=row_dict["job_family"],
-            job_level=row_dict["job_level"],
-            team_id=row_dict["team_id"],
-            manager_id=row_dict["manager_id"],
-            location_id=row_dict["location_id"],
-            employment_type=row_dict["employment_type"],
-            status=row_dict["emp_status"]
-        )
-
-        resource = ResourceResponse(
-            id=row_dict["resource_id"],
-            system_id=row_dict["system_id"],
-            resource_type=row_dict["resource_type"],
-            name=row_dict["resource_name"],
-            description=row_dict["resource_description"],
-            sensitivity=SensitivityLevel(row_dict["sensitivity"])
-        )
+        return _review_item_response(dict_from_row(row))
+
+
+def _review_item_response(row_dict: Dict[str, Any]) -> ReviewItemResponse:
+    """Build a ReviewItemResponse from a SQL_REVIEW_ITEM_DETAIL row."""
+    employee = EmployeeResponse(
+        id=row_dict["employee_id"],
+        employee_number=row_dict["employee_number"],
+        email=row_dict["email"],
+        full_name=row_dict["full_name"],
+        job_title=row_dict["job_title"],
+        job_code=row_dict["job_code"],
+        job_family=row_dict["job_family"],
+        job_level=row_dict["job_level"],
+        team_id=row_dict["team_id"],
+        manager_id=row_dict["manager_id"],
+        location_id=row_dict["location_id"],
+        employment_type=row_dict["employment_type"],
+        status=row_dict["emp_status"]
+    )
 
-        # Build assurance score response
-        assurance = AssuranceScoreResponse(
-            overall_score=row_dict["assurance_score"],
-            peer_typicality=0.0,  # Would need to recalculate
-            sensitivity_ceiling=get_sensitivity_ceiling(row_dict["sensitivity"]),
-            usage_factor=0.0,
-            classification=AssuranceClassification(row_dict["classification"]),
-            auto_certify_eligible=bool(row_dict["auto_certify_eligible"]),
-            peers_with_access=0,
-            total_peers=0,
-            peer_percentage=0.0,
-            usage_pattern="Unknown",
-            days_since_last_use=None,
-            explanations=[]
-        )
+    resource = ResourceResponse(
+        id=row_dict["resource_id"],
+        system_id=row_dict["system_id"],
+        resource_type=row_dict["resource_type"],
+        name=row_dict["resource_name"],
+        description=row_dict["resource_description"],
+        sensitivity=SensitivityLevel(row_dict["sensitivity"])
+    )
 
-        decision = json.loads(row_dict["decision"]) if row_dict["decision"] else None
+    # Build assurance score response
+    assurance = AssuranceScoreResponse(
+        overall_score=row_dict["assurance_score"],
+        peer_typicality=0.0,  # Would need to recalculate
+        sensitivity_ceiling=SENSITIVITY_CEILINGS.get(row_dict["sensitivity"], 0.5),
+        usage_factor=0.0,
+        classification=AssuranceClassification(row_dict["classification"]),
+        auto_certify_eligible=bool(row_dict["auto_certify_eligible"]),
+        peers_with_access=0,
+        total_peers=0,
+        peer_percentage=0.0,
+        usage_pattern="Unknown",
+        days_since_last_use=None,
+        explanations=[]
+    )
 
-        return ReviewItemResponse(
-            id=row_dict["ri_id"],
-            campaign_id=row_dict["campaign_id"],
-            access_grant_id=row_dict["access_grant_id"],
-            employee=employee,
-            resource=resource,
-            assurance_score=assurance,
-            status=ReviewItemStatus(row_dict["ri_status"]),
-            clustering_consensus=row_dict["clustering_consensus"],
-            needs_clustering_review=bool(row_dict["needs_clustering_review"]),
-            clustering_disagreement=row_dict["clustering_disagreement"],
-            system_recommendation=row_dict.get("system_recommendation"),
-            peer_group_size=row_dict.get("peer_group_size"),
-            human_review_reason=row_dict.get("human_review_reason"),
-            decision=decision,
-            created_at=datetime.fromisoformat(row_dict["ri_created_at"]),
-            updated_at=datetime.fromisoformat(row_dict["ri_updated_at"]) if row_dict["ri_updated_at"] else None
-        )
+    decision = json_loads(row_dict["decision"]) if row_dict["decision"] else None
+
+    return ReviewItemResponse(
+        id=row_dict["ri_id"],
+        campaign_id=row_dict["campaign_id"],
+        access_grant_id=row_dict["access_grant_id"],
+        employee=employee,
+        resource=resource,
+        assurance_score=assurance,
+        status=ReviewItemStatus(row_dict["ri_status"]),
+        clustering_consensus=row_dict["clustering_consensus"],
+        needs_clustering_review=bool(row_dict["needs_clustering_review"]),
+        clustering_disagreement=row_dict["clustering_disagreement"],
+        system_recommendation=row_dict.get("system_recommendation"),
+        peer_group_size=row_dict.get("peer_group_size"),
+        human_review_reason=row_dict.get("human_review_reason"),
+        decision=decision,
+        created_at=datetime.fromisoformat(row_dict["ri_created_at"]),
+        updated_at=datetime.fromisoformat(row_dict["ri_updated_at"]) if row_dict["ri_updated_at"] else None
+    )
 
 
 def get_sensitivity_ceiling(sensitivity: str) -> float:
     """Get sensitivity ceiling value."""
-    ceilings = {
-        "Critical": 0.0,
-        "Confidential": 0.5,
-        "Internal": 0.85,
-        "Public": 1.0
-    }
-    return ceilings.get(sensitivity, 0.5)
+    return SENSITIVITY_CEILINGS.get(sensitivity, 0.5)
 
 
 # ============================================================================
@@ -809,18 +1123,18 @@ def get_sensitivity_ceiling(sensitivity: str) -> float:
 # ============================================================================
 
 @app.post("/api/review-items/{item_id}/decision", response_model=ReviewItemResponse)
-async def submit_decision(
+def submit_decision(
     item_id: str = Path(...),
     decision: DecisionCreate = None
 ):
     """Submit a decision for a review item."""
-    now = datetime.utcnow()
+    now = datetime.utcnow().isoformat()
 
-    with get_db() as conn:
+    with get_db(write=True) as conn:
         cursor = conn.cursor()
 
-        # Check item exists
-        cursor.execute("SELECT * FROM review_items WHERE id = ?", (item_id,))
+        # Fetch the full item up front, so the response needs no second query
+        cursor.execute(SQL_REVIEW_ITEM_DETAIL, (item_id,))
         row = cursor.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Review item not found")
@@ -828,7 +1142,7 @@ async def submit_decision(
         row_dict = dict_from_row(row)
 
         # Validate state
-        if row_dict["status"] == ReviewItemStatus.AUTO_APPROVED.value:
+        if row_dict["ri_status"] == ReviewItemStatus.AUTO_APPROVED.value:
             raise HTTPException(
                 status_code=400,
                 detail="Cannot modify auto-approved item"
@@ -839,7 +1153,7 @@ async def submit_decision(
             "action": decision.action.value,
             "rationale": decision.rationale,
             "decided_by": "reviewer",  # Would come from auth
-            "decided_at": now.isoformat()
+            "decided_at": now
         }
 
         if decision.action == DecisionAction.MODIFY:
@@ -848,109 +1162,84 @@ async def submit_decision(
             decision_record["delegated_to"] = decision.delegated_to
 
         # Update review item
-        cursor.execute("""
-            UPDATE review_items
-            SET status = ?, decision = ?, updated_at = ?
-            WHERE id = ?
-        """, (
+        decision_json = json_dumps(decision_record)
+        cursor.execute(SQL_DECIDE_REVIEW_ITEM, (
             ReviewItemStatus.DECIDED.value,
-            json.dumps(decision_record),
-            now.isoformat(),
+            decision_json,
+            now,
             item_id
         ))
 
         # Create audit record
         audit_id = str(uuid.uuid4())
-        cursor.execute("""
-            INSERT INTO audit_records (
-                id, review_item_id, action, decision_by, decision_at,
-                rationale, assurance_score, auto_certified, campaign_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        cursor.execute(SQL_INSERT_AUDIT_RECORD, (
             audit_id, item_id, decision.action.value, "reviewer",
-            now.isoformat(), decision.rationale, row_dict["assurance_score"],
+            now, decision.rationale, row_dict["assurance_score"],
             False, row_dict["campaign_id"]
         ))
 
         conn.commit()
 
-    return await get_review_item(item_id)
+    # Respond from the fetched row with the columns just written
+    row_dict["ri_status"] = ReviewItemStatus.DECIDED.value
+    row_dict["decision"] = decision_json
+    row_dict["ri_updated_at"] = now
+    return _review_item_response(row_dict)
 
 
 @app.post("/api/campaigns/{campaign_id}/bulk-decisions", response_model=Dict[str, Any])
-async def submit_bulk_decisions(
+def submit_bulk_decisions(
     campaign_id: str = Path(...),
     bulk: BulkDecisionCreate = None
 ):
     """Submit decisions for multiple review items."""
-    now = datetime.utcnow()
+    now = datetime.utcnow().isoformat()
     success_count = 0
     error_count = 0
     errors = []
 
-    with get_db() as conn:
+    # Every item gets the same decision
+    decision_json = json_dumps({
+        "action": bulk.action.value,
+        "rationale": bulk.rationale,
+        "decided_by": "reviewer",
+        "decided_at": now,
+        "bulk_decision": True
+    })
+    update_params = []
+    audit_params = []
+
+    with get_db(write=True) as conn:
         cursor = conn.cursor()
 
+        # Fetch every requested item that belongs to the campaign at once
+        cursor.execute(SQL_REVIEW_ITEMS_BY_IDS, (campaign_id, json_dumps(bulk.review_item_ids)))
+        found = {item_id: (status, score) for item_id, status, score in cursor.fetchall()}
+
         for item_id in bulk.review_item_ids:
-            try:
-                # Check item exists and belongs to campaign
-                cursor.execute(
-                    "SELECT * FROM review_items WHERE id = ? AND campaign_id = ?",
-                    (item_id, campaign_id)
-                )
-                row = cursor.fetchone()
-
-                if not row:
-                    errors.append({"item_id": item_id, "error": "Not found"})
-                    error_count += 1
-                    continue
-
-                row_dict = dict_from_row(row)
-
-                if row_dict["status"] == ReviewItemStatus.AUTO_APPROVED.value:
-                    errors.append({"item_id": item_id, "error": "Auto-approved item"})
-                    error_count += 1
-                    continue
-
-                # Build decision
-                decision_record = {
-                    "action": bulk.action.value,
-                    "rationale": bulk.rationale,
-                    "decided_by": "reviewer",
-                    "decided_at": now.isoformat(),
-                    "bulk_decision": True
-                }
-
-                # Update
-                cursor.execute("""
-                    UPDATE review_items
-                    SET status = ?, decision = ?, updated_at = ?
-                    WHERE id = ?
-                """, (
-                    ReviewItemStatus.DECIDED.value,
-                    json.dumps(decision_record),
-                    now.isoformat(),
-                    item_id
-                ))
-
-                # Audit
-                audit_id = str(uuid.uuid4())
-                cursor.execute("""
-                    INSERT INTO audit_records (
-                        id, review_item_id, action, decision_by, decision_at,
-                        rationale, assurance_score, auto_certified, campaign_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    audit_id, item_id, bulk.action.value, "reviewer",
-                    now.isoformat(), bulk.rationale, row_dict["assurance_score"],
-                    False, campaign_id
-                ))
-
-                success_count += 1
-
-            except Exception as e:
-                errors.append({"item_id": item_id, "error": str(e)})
+            if item_id not in found:
+                errors.append({"item_id": item_id, "error": "Not found"})
+                error_count += 1
+                continue
+
+            status, assurance_score = found[item_id]
+
+            if status == ReviewItemStatus.AUTO_APPROVED.value:
+                errors.append({"item_id": item_id, "error": "Auto-approved item"})
                 error_count += 1
+                continue
+
+            update_params.append((ReviewItemStatus.DECIDED.value, decision_json, now, item_id))
+            audit_params.append((
+                str(uuid.uuid4()), item_id, bulk.action.value, "reviewer",
+                now, bulk.rationale, assurance_score,
+                False, campaign_id
+            ))
+            success_count += 1
+
+        # One prepared statement per table for every accepted item
+        cursor.executemany(SQL_DECIDE_REVIEW_ITEM, update_params)
+        cursor.executemany(SQL_INSERT_AUDIT_RECORD, audit_params)
 
         conn.commit()
 
@@ -965,23 +1254,49 @@ async def submit_bulk_decisions(
 # Analytics & Weights
 # ============================================================================
 
+# Latest proximity weights and when they expire, loaded on first use and
+# replaced by this worker's update_weights; other workers' updates are
+# picked up once the entry expires
+_weights_cache: Optional[Tuple[float, WeightsResponse]] = None
+_weights_lock = threading.Lock()
+
+# run_analytics responses by (lob, stats_version). Weights are not part of
+# the key: the engine scores with its default weights, not the stored ones
+_analytics_cache: "OrderedDict[Tuple[str, int], Tuple[float, AnalyticsResponse]]" = OrderedDict()
+_analytics_cache_lock = threading.Lock()
+
+
 @app.get("/api/weights", response_model=WeightsResponse)
-async def get_weights():
+def get_weights():
     """Get current proximity weights."""
+    global _weights_cache
+    # Held while loading, so a concurrent update_weights can't be overwritten
+    # by a value read before it committed
+    with _weights_lock:
+        if _weights_cache is None or _weights_cache[0] <= time.monotonic():
+            _weights_cache = (time.monotonic() + WEIGHTS_CACHE_TTL, _load_weights())
+        return _weights_cache[1]
+
+
+def _load_weights() -> WeightsResponse:
+    """Read the latest proximity weights, or the defaults if none are stored."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM proximity_weights ORDER BY updated_at DESC LIMIT 1")
+        cursor.execute("""
+            SELECT structural, functional, behavioral, temporal, updated_at, updated_by
+            FROM proximity_weights ORDER BY updated_at DESC LIMIT 1
+        """)
         row = cursor.fetchone()
 
         if row:
-            row_dict = dict_from_row(row)
+            structural, functional, behavioral, temporal, updated_at, updated_by = row
             return WeightsResponse(
-                structural=row_dict["structural"],
-                functional=row_dict["functional"],
-                behavioral=row_dict["behavioral"],
-                temporal=row_dict["temporal"],
-                last_updated=datetime.fromisoformat(row_dict["updated_at"]) if row_dict["updated_at"] else None,
-                updated_by=row_dict["updated_by"]
+                structural=structural,
+                functional=functional,
+                behavioral=behavioral,
+                temporal=temporal,
+                last_updated=datetime.fromisoformat(updated_at) if updated_at else None,
+                updated_by=updated_by
             )
         else:
             # Return defaults
@@ -996,7 +1311,7 @@ async def get_weights():
 
 
 @app.post("/api/weights/preview", response_model=WeightsPreviewResponse)
-async def preview_weight_changes(weights: WeightsUpdate):
+def preview_weight_changes(weights: WeightsUpdate):
     """Preview impact of weight changes."""
     if not weights.validate_sum():
         raise HTTPException(
@@ -1004,7 +1319,7 @@ async def preview_weight_changes(weights: WeightsUpdate):
             detail="Weights must sum to 1.0"
         )
 
-    current = await get_weights()
+    current = get_weights()
 
     # Calculate impact (simplified)
     impact = {
@@ -1029,7 +1344,7 @@ async def preview_weight_changes(weights: WeightsUpdate):
 
 
 @app.put("/api/weights", response_model=WeightsResponse)
-async def update_weights(weights: WeightsUpdate):
+def update_weights(weights: WeightsUpdate):
     """Update proximity weights."""
     if not weights.validate_sum():
         raise HTTPException(
@@ -1039,7 +1354,7 @@ async def update_weights(weights: WeightsUpdate):
 
     now = datetime.utcnow()
 
-    with get_db() as conn:
+    with get_db(write=True) as conn:
         cursor = conn.cursor()
 
         weight_id = str(uuid.uuid4())
@@ -1055,7 +1370,7 @@ async def update_weights(weights: WeightsUpdate):
         ))
         conn.commit()
 
-    return WeightsResponse(
+    updated = WeightsResponse(
         structural=weights.structural,
         functional=weights.functional,
         behavioral=weights.behavioral,
@@ -1063,17 +1378,38 @@ async def update_weights(weights: WeightsUpdate):
         last_updated=now,
         updated_by="admin"
     )
+    global _weights_cache
+    with _weights_lock:
+        _weights_cache = (time.monotonic() + WEIGHTS_CACHE_TTL, updated)
+    return updated
 
 
 @app.post("/api/analytics/run", response_model=AnalyticsResponse)
-async def run_analytics(
+def run_analytics(
     lob: Optional[str] = Query(default=None, description="Filter by LOB")
 ):
-    """Run analytics engine and return results."""
-    engine = get_engine()
-    result = engine.run_analysis(lob_filter=lob)
+    """
+    Run analytics engine and return results.
+
+    A result is reused for ANALYTICS_CACHE_TTL seconds for the same LOB as
+    long as no employee, resource, grant or campaign has been added or
+    removed (stats_version); its generated_at is when it was actually
+    computed.
+    """
+    with get_db() as conn:
+        stats_version = conn.execute("SELECT version FROM stats_version").fetchone()[0]
+    key = (lob or "", stats_version)
+
+    with _analytics_cache_lock:
+        cached = _analytics_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            _analytics_cache.move_to_end(key)
+            return cached[1]
+
+    with _engine_lock:
+        result = get_engine().run_analysis(lob_filter=lob)
 
-    return AnalyticsResponse(
+    response = AnalyticsResponse(
         generated_at=datetime.utcnow(),
         data={
             "employees_analyzed": result.total_employees,
@@ -1086,107 +1422,87 @@ async def run_analytics(
         }
     )
 
+    with _analytics_cache_lock:
+        _analytics_cache[key] = (time.monotonic() + ANALYTICS_CACHE_TTL, response)
+        _analytics_cache.move_to_end(key)
+        while len(_analytics_cache) > ANALYTICS_CACHE_SIZE:
+            _analytics_cache.popitem(last=False)
+    return response
+
 
 # ============================================================================
 # Employees
 # ============================================================================
 
 @app.get("/api/employees/{employee_id}", response_model=EmployeeResponse)
-async def get_employee(employee_id: str = Path(...)):
+def get_employee(employee_id: str = Path(...)):
     """Get employee details."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM employees WHERE id = ?", (employee_id,))
+        cursor.execute(SQL_EMPLOYEE, (employee_id,))
         row = cursor.fetchone()
 
         if not row:
             raise HTTPException(status_code=404, detail="Employee not found")
 
-        row_dict = dict_from_row(row)
-        return EmployeeResponse(
-            id=row_dict["id"],
-            employee_number=row_dict["employee_number"],
-            email=row_dict["email"],
-            full_name=row_dict["full_name"],
-            job_title=row_dict["job_title"],
-            job_code=row_dict["job_code"],
-            job_family=row_dict["job_family"],
-            job_level=row_dict["job_level"],
-            team_id=row_dict["team_id"],
-            manager_id=row_dict["manager_id"],
-            location_id=row_dict["location_id"],
-            employment_type=row_dict["employment_type"],
-            status=row_dict["status"]
-        )
+        return _employee_response(row)
 
 
 @app.get("/api/employees/{employee_id}/access-summary", response_model=EmployeeAccessSummaryResponse)
-async def get_employee_access_summary(employee_id: str = Path(...)):
+def get_employee_access_summary(employee_id: str = Path(...)):
     """Get employee's access summary with assurance breakdown."""
+    from analytics.assurance import AssuranceConfig
+
+    # Grants unused for longer than this (or never used) count as dormant, as
+    # in the assurance scorer's usage buckets
+    dormant_days = AssuranceConfig.stale_days_threshold
+
     with get_db() as conn:
         cursor = conn.cursor()
 
-        # Get employee
-        cursor.execute("SELECT * FROM employees WHERE id = ?", (employee_id,))
-        emp_row = cursor.fetchone()
-        if not emp_row:
+        # Employee, peer count and grants with resources in one round trip
+        cursor.execute(SQL_EMPLOYEE_ACCESS_SUMMARY, (employee_id,))
+        rows = cursor.fetchall()
+        if not rows:
             raise HTTPException(status_code=404, detail="Employee not found")
 
-        emp_dict = dict_from_row(emp_row)
-        employee = EmployeeResponse(
-            id=emp_dict["id"],
-            employee_number=emp_dict["employee_number"],
-            email=emp_dict["email"],
-            full_name=emp_dict["full_name"],
-            job_title=emp_dict["job_title"],
-            job_code=emp_dict["job_code"],
-            job_family=emp_dict["job_family"],
-            job_level=emp_dict["job_level"],
-            team_id=emp_dict["team_id"],
-            manager_id=emp_dict["manager_id"],
-            location_id=emp_dict["location_id"],
-            employment_type=emp_dict["employment_type"],
-            status=emp_dict["status"]
-        )
-
-        # Get access grants with resources
-        cursor.execute("""
-            SELECT ag.*, r.name as resource_name, r.sensitivity, r.system_id
-            FROM access_grants ag
-            JOIN resources r ON ag.resource_id = r.id
-            WHERE ag.employee_id = ?
-        """, (employee_id,))
+        employee_columns = len(rows[0]) - 11
+        employee = _employee_response(rows[0][:employee_columns])
+        peer_count = rows[0][employee_columns]
 
+        # Counts in the same pass that builds the grant list; classification
+        # comes from the grant's latest review item, if it has been reviewed
         grants = []
-        high_count = 0
-        medium_count = 0
-        low_count = 0
+        classification_counts: Dict[str, int] = {}
         dormant_count = 0
         auto_certify_count = 0
 
-        for row in cursor.fetchall():
-            row_dict = dict_from_row(row)
+        for row in rows:
+            (
+                resource_id, grant_id, resource_name, system_id, sensitivity, granted_date,
+                classification, auto_certify_eligible, total_access_count, days_since_last_use
+            ) = row[employee_columns + 1:]
+            if resource_id is None:
+                continue  # No grant with a resource on this row
+            if classification is not None:
+                classification_counts[classification] = classification_counts.get(classification, 0) + 1
+            auto_certify_count += bool(auto_certify_eligible)
+            if not total_access_count or days_since_last_use is None or days_since_last_use > dormant_days:
+                dormant_count += 1
             grants.append({
-                "id": row_dict["id"],
-                "resource_name": row_dict["resource_name"],
-                "system_id": row_dict["system_id"],
-                "sensitivity": row_dict["sensitivity"],
-                "granted_at": row_dict["granted_at"]
+                "id": grant_id,
+                "resource_name": resource_name,
+                "system_id": system_id,
+                "sensitivity": sensitivity,
+                "granted_at": granted_date
             })
 
-        # Get peer count
-        cursor.execute("""
-            SELECT COUNT(DISTINCT id) FROM employees
-            WHERE job_code = ? AND id != ?
-        """, (emp_dict["job_code"], employee_id))
-        peer_count = cursor.fetchone()[0]
-
         return EmployeeAccessSummaryResponse(
             employee=employee,
             total_grants=len(grants),
-            high_assurance_count=high_count,
-            medium_assurance_count=medium_count,
-            low_assurance_count=low_count,
+            high_assurance_count=classification_counts.get(AssuranceClassification.HIGH.value, 0),
+            medium_assurance_count=classification_counts.get(AssuranceClassification.MEDIUM.value, 0),
+            low_assurance_count=classification_counts.get(AssuranceClassification.LOW.value, 0),
             dormant_access_count=dormant_count,
             auto_certify_eligible=auto_certify_count,
             peer_count=peer_count,
@@ -1199,8 +1515,8 @@ async def get_employee_access_summary(employee_id: str = Path(...)):
 # Audit & Compliance
 # ============================================================================
 
-@app.get("/api/audit", response_model=PaginatedResponse)
-async def list_audit_records(
+@app.get("/api/audit", responses={200: {"model": PaginatedResponse}})
+def list_audit_records(
     campaign_id: Optional[str] = None,
     action: Optional[DecisionAction] = None,
     start_date: Optional[datetime] = None,
@@ -1212,101 +1528,106 @@ async def list_audit_records(
     with get_db() as conn:
         cursor = conn.cursor()
 
-        query = "SELECT * FROM audit_records WHERE 1=1"
+        where = " WHERE 1=1"
         params = []
 
         if campaign_id:
-            query += " AND campaign_id = ?"
+            where += " AND campaign_id = ?"
             params.append(campaign_id)
 
         if action:
-            query += " AND action = ?"
+            where += " AND action = ?"
             params.append(action.value)
 
         if start_date:
-            query += " AND decision_at >= ?"
+            where += " AND decision_at >= ?"
             params.append(start_date.isoformat())
 
         if end_date:
-            query += " AND decision_at <= ?"
+            where += " AND decision_at <= ?"
             params.append(end_date.isoformat())
 
         # Get total
-        count_query = query.replace("SELECT *", "SELECT COUNT(*)")
-        cursor.execute(count_query, params)
+        cursor.execute("SELECT COUNT(*) FROM audit_records" + where, params)
         total = cursor.fetchone()[0]
 
         # Add pagination
-        query += " ORDER BY decision_at DESC LIMIT ? OFFSET ?"
         params.extend([page_size, (page - 1) * page_size])
+        cursor.execute(
+            "SELECT id, review_item_id, action, decision_by, decision_at, rationale,"
+            " assurance_score, auto_certified, campaign_id FROM audit_records"
+            + where + " ORDER BY decision_at DESC LIMIT ? OFFSET ?",
+            params
+        )
 
-        cursor.execute(query, params)
-
-        items = []
-        for row in cursor.fetchall():
-            row_dict = dict_from_row(row)
-            items.append(AuditRecordResponse(
-                id=row_dict["id"],
-                review_item_id=row_dict["review_item_id"],
-                action=row_dict["action"],
-                decision_by=row_dict["decision_by"],
-                decision_at=datetime.fromisoformat(row_dict["decision_at"]),
-                rationale=row_dict["rationale"],
-                assurance_score=row_dict["assurance_score"],
-                auto_certified=bool(row_dict["auto_certified"]),
-                campaign_id=row_dict["campaign_id"]
-            ))
+        # Plain dicts in AuditRecordResponse shape, encoded by ORJSONResponse;
+        # decision_at is stored with isoformat() and passed through as-is
+        items = [
+            {
+                "id": record_id,
+                "review_item_id": review_item_id,
+                "action": action_value,
+                "decision_by": decision_by,
+                "decision_at": decision_at,
+                "rationale": rationale,
+                "assurance_score": float(assurance_score),
+                "auto_certified": bool(auto_certified),
+                "campaign_id": record_campaign_id
+            }
+            for (
+                record_id, review_item_id, action_value, decision_by, decision_at, rationale,
+                assurance_score, auto_certified, record_campaign_id
+            ) in cursor
+        ]
 
         total_pages = (total + page_size - 1) // page_size
 
-        return PaginatedResponse(
-            items=[item.model_dump() for item in items],
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
+        return ORJSONResponse({
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages
+        })
 
 
 @app.post("/api/campaigns/{campaign_id}/compliance-sample", response_model=ComplianceSampleResponse)
-async def create_compliance_sample(
+def create_compliance_sample(
     campaign_id: str = Path(...),
     sample_size: int = Query(default=50, ge=10, le=500)
 ):
     """Create a compliance sample for 2nd line review."""
     now = datetime.utcnow()
 
-    with get_db() as conn:
+    with get_db(write=True) as conn:
         cursor = conn.cursor()
 
         # Check campaign exists
-        cursor.execute("SELECT id FROM campaigns WHERE id = ?", (campaign_id,))
+        cursor.execute(SQL_CAMPAIGN_EXISTS, (campaign_id,))
         if not cursor.fetchone():
             raise HTTPException(status_code=404, detail="Campaign not found")
 
-        # Get random sample of decided items
-        cursor.execute("""
-            SELECT ri.id, ri.assurance_score, ri.classification, ri.decision,
-                   e.full_name as employee_name, r.name as resource_name
-            FROM review_items ri
-            JOIN employees e ON ri.employee_id = e.id
-            JOIN access_grants ag ON ri.access_grant_id = ag.id
-            JOIN resources r ON ag.resource_id = r.id
-            WHERE ri.campaign_id = ? AND ri.status IN ('Decided', 'Auto-Approved')
-            ORDER BY RANDOM()
-            LIMIT ?
-        """, (campaign_id, sample_size))
+        # Get random sample of decided items: sample the ids in Python, then
+        # fetch details for just those, in sample order
+        cursor.execute(SQL_SAMPLE_CANDIDATES, (campaign_id,))
+        candidate_ids = [item_id for (item_id,) in cursor.fetchall()]
+        sampled_ids = random.sample(candidate_ids, min(sample_size, len(candidate_ids)))
+
+        cursor.execute(SQL_SAMPLE_ITEMS, (json_dumps(sampled_ids),))
+        details = {row[0]: row[1:] for row in cursor.fetchall()}
 
         sample_items = []
-        for row in cursor.fetchall():
-            row_dict = dict_from_row(row)
+        for item_id in sampled_ids:
+            if item_id not in details:
+                continue
+            assurance_score, classification, decision, employee_name, resource_name = details[item_id]
             sample_items.append({
-                "review_item_id": row_dict["id"],
-                "employee_name": row_dict["employee_name"],
-                "resource_name": row_dict["resource_name"],
-                "assurance_score": row_dict["assurance_score"],
-                "classification": row_dict["classification"],
-                "decision": json.loads(row_dict["decision"]) if row_dict["decision"] else None,
+                "review_item_id": item_id,
+                "employee_name": employee_name,
+                "resource_name": resource_name,
+                "assurance_score": assurance_score,
+                "classification": classification,
+                "decision": json_loads(decision) if decision else None,
                 "review_status": "pending",
                 "review_notes": None
             })
@@ -1320,7 +1641,7 @@ async def create_compliance_sample(
             ) VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (
             sample_id, campaign_id, len(sample_items), now.isoformat(),
-            "compliance_officer", "pending", json.dumps(sample_items)
+            "compliance_officer", "pending", json_dumps(sample_items)
         ))
         conn.commit()
 
@@ -1341,50 +1662,28 @@ async def create_compliance_sample(
 # Graduation Status
 # ============================================================================
 
-@app.get("/api/graduation-status", response_model=List[GraduationStatusResponse])
-async def list_graduation_status():
+@app.get("/api/graduation-status", responses={200: {"model": List[GraduationStatusResponse]}})
+def list_graduation_status():
     """List graduation status for all categories."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM graduation_status ORDER BY category")
-
-        statuses = []
-        for row in cursor.fetchall():
-            row_dict = dict_from_row(row)
-            statuses.append(GraduationStatusResponse(
-                category=row_dict["category"],
-                status=row_dict["status"],
-                metrics=json.loads(row_dict["metrics"] or "{}"),
-                meets_criteria=bool(row_dict["meets_criteria"]),
-                last_evaluated=datetime.fromisoformat(row_dict["last_evaluated"]),
-                graduated_at=datetime.fromisoformat(row_dict["graduated_at"]) if row_dict["graduated_at"] else None,
-                approved_by=row_dict["approved_by"]
-            ))
+        cursor.execute(f"SELECT {GRADUATION_COLUMNS} FROM graduation_status ORDER BY category")
 
-        return statuses
+        return ORJSONResponse([_graduation_dict(row) for row in cursor])
 
 
-@app.get("/api/graduation-status/{category}", response_model=GraduationStatusResponse)
-async def get_graduation_status(category: str = Path(...)):
+@app.get("/api/graduation-status/{category}", responses={200: {"model": GraduationStatusResponse}})
+def get_graduation_status(category: str = Path(...)):
     """Get graduation status for a specific category."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM graduation_status WHERE category = ?", (category,))
+        cursor.execute(f"SELECT {GRADUATION_COLUMNS} FROM graduation_status WHERE category = ?", (category,))
         row = cursor.fetchone()
 
         if not row:
             raise HTTPException(status_code=404, detail="Category not found")
 
-        row_dict = dict_from_row(row)
-        return GraduationStatusResponse(
-            category=row_dict["category"],
-            status=row_dict["status"],
-            metrics=json.loads(row_dict["metrics"] or "{}"),
-            meets_criteria=bool(row_dict["meets_criteria"]),
-            last_evaluated=datetime.fromisoformat(row_dict["last_evaluated"]),
-            graduated_at=datetime.fromisoformat(row_dict["graduated_at"]) if row_dict["graduated_at"] else None,
-            approved_by=row_dict["approved_by"]
-        )
+        return ORJSONResponse(_graduation_dict(row))
 
 
 # Run with: uvicorn src.api.main:app --reload
@@ -8,7 +8,7 @@ Author: Chiradeep Chhaya
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, TypedDict
 from enum import Enum
 from pydantic import BaseModel, Field
 
@@ -206,6 +206,26 @@ class CampaignResponse(BaseModel):
     created_at: datetime
 
 
+class CampaignRecord(TypedDict):
+    """
+    CampaignResponse as a plain dict, for endpoints returning ORJSONResponse.
+
+    Dates are the ISO 8601 strings stored in SQLite, passed through as-is;
+    they serialize exactly as CampaignResponse's datetimes would.
+    """
+    id: str
+    name: str
+    scope_type: CampaignScopeType
+    scope_filter: Dict[str, Any]
+    auto_approve_threshold: float
+    review_threshold: float
+    start_date: str
+    due_date: str
+    status: CampaignStatus
+    created_by: str
+    created_at: str
+
+
 class CampaignSummaryResponse(BaseModel):
     """Campaign summary with statistics."""
     campaign: CampaignResponse
@@ -0,0 +1,56 @@
+"""
+JSON Responses
+==============
+
+Response class for the API's response-heavy list endpoints. Those endpoints
+build plain dicts and return them through ORJSONResponse, which skips
+response-model validation and jsonable_encoder and encodes with orjson when
+it is installed. json_loads and json_dumps are the matching decoder and
+encoder for JSON stored in TEXT columns.
+
+Author: Chiradeep Chhaya
+"""
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Decoder for JSON columns; accepts str or bytes either way
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def json_dumps(value: Any) -> str:
+    """Compact JSON text for a TEXT column or a json_each() parameter."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(',', ':'))
+
+
+def _default(value: Any) -> Any:
+    """Encode the types orjson does not handle natively."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (falls back to the stdlib encoder)."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(jsonable_encoder(content))
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,26 @@
+"""
+Pytest configuration for the ARAS tests.
+
+Tests marked slow run the full analytics pipeline on the server and are
+skipped unless pytest is given --run-slow.
+
+Author: Chiradeep Chhaya
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow", action="store_true", default=False,
+        help="also run tests marked slow (full analytics runs)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="runs full analytics; use --run-slow to include")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
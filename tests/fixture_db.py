@@ -0,0 +1,159 @@
+"""
+Analytics Fixture Database
+==========================
+
+Builds a small, fully deterministic ARAS database for the analytics tests:
+two LOBs of four teams each, 50 employees, 40 resources, and access
+grants and activity drawn from a seeded generator. The tables hold the
+columns scripts/generate_synthetic_data.py writes that the analytics
+package reads. IDs and dates are fixed, so results never depend on
+the day the tests run.
+
+Author: Chiradeep Chhaya
+"""
+
+import random
+import sqlite3
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+SEED = 20240601
+
+SCHEMA = """
+    CREATE TABLE lobs (id TEXT PRIMARY KEY, name TEXT NOT NULL);
+    CREATE TABLE sub_lobs (id TEXT PRIMARY KEY, lob_id TEXT, name TEXT NOT NULL);
+    CREATE TABLE teams (
+        id TEXT PRIMARY KEY, sub_lob_id TEXT, lob_id TEXT, name TEXT NOT NULL,
+        cost_center_id TEXT
+    );
+    CREATE TABLE employees (
+        id TEXT PRIMARY KEY, employee_number TEXT UNIQUE, email TEXT, full_name TEXT,
+        first_name TEXT, last_name TEXT, team_id TEXT, manager_id TEXT, location_id TEXT,
+        cost_center_id TEXT, job_title TEXT, job_code TEXT, job_family TEXT,
+        job_level INTEGER, employment_type TEXT, hire_date TEXT, role_start_date TEXT,
+        status TEXT
+    );
+    CREATE TABLE resources (
+        id TEXT PRIMARY KEY, system_id TEXT, resource_type TEXT, name TEXT,
+        external_id TEXT, description TEXT, sensitivity TEXT, grants_access_to TEXT
+    );
+    CREATE TABLE access_grants (
+        id TEXT PRIMARY KEY, employee_id TEXT, resource_id TEXT, granted_date TEXT,
+        granted_by TEXT, grant_type TEXT, justification TEXT, last_certified_date TEXT,
+        last_certified_by TEXT, anomaly_type TEXT
+    );
+    CREATE TABLE activity_summaries (
+        id TEXT PRIMARY KEY, employee_id TEXT, resource_id TEXT, access_grant_id TEXT,
+        total_access_count INTEGER, first_accessed TEXT, last_accessed TEXT,
+        access_count_7d INTEGER, access_count_30d INTEGER, access_count_90d INTEGER,
+        days_since_grant INTEGER, days_since_last_use INTEGER
+    );
+"""
+
+LOBS = (("lob_tech", "Technology", ("Engineering", "Data")),
+        ("lob_ops", "Operations", ("Operations", "Finance")))
+SENSITIVITIES = ("Public", "Internal", "Confidential", "Critical")
+
+
+def _insert(conn: sqlite3.Connection, table: str, row: Dict[str, Any]) -> None:
+    columns = ", ".join(row)
+    conn.execute(
+        f"INSERT INTO {table} ({columns}) VALUES ({', '.join('?' * len(row))})",
+        tuple(row.values())
+    )
+
+
+def build_fixture_db(db_path: str) -> None:
+    """
+    Write the fixture database to db_path.
+
+    Args:
+        db_path: Path of a new SQLite database file
+    """
+    rng = random.Random(SEED)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+
+    resources = [f"res_{i:03d}" for i in range(40)]
+    for i, res_id in enumerate(resources):
+        _insert(conn, "resources", {
+            "id": res_id, "system_id": f"sys_{i % 4}", "resource_type": "role",
+            "name": f"Resource {i}", "sensitivity": rng.choice(SENSITIVITIES)
+        })
+
+    employees: List[Dict[str, Any]] = []
+    n_teams = 0
+    for lob_id, lob_name, families in LOBS:
+        _insert(conn, "lobs", {"id": lob_id, "name": lob_name})
+        head: Dict[str, Any] = {"id": f"emp_{len(employees):03d}", "team_id": None, "manager_id": None,
+                "job_family": families[0], "job_level": 6}
+        employees.append(head)
+        for s, family in enumerate(families):
+            sub_lob_id = f"{lob_id}_sub{s}"
+            _insert(conn, "sub_lobs", {"id": sub_lob_id, "lob_id": lob_id, "name": family})
+            sub_lob_bundle = rng.sample(resources, 3)
+            for t in range(2):
+                team_id = f"team_{n_teams}"
+                n_teams += 1
+                _insert(conn, "teams", {
+                    "id": team_id, "sub_lob_id": sub_lob_id, "lob_id": lob_id,
+                    "name": f"{family} team {t}", "cost_center_id": f"cc_{team_id}"
+                })
+                head["team_id"] = head["team_id"] or team_id
+                team_bundle = rng.sample(resources, 6)
+                team_hired = date(2012, 1, 1) + timedelta(days=rng.randint(0, 3000))
+                manager_id = f"emp_{len(employees):03d}"
+                for m in range(6):
+                    employees.append({
+                        "id": f"emp_{len(employees):03d}", "team_id": team_id,
+                        "manager_id": head["id"] if m == 0 else manager_id,
+                        "location_id": f"loc_{n_teams % 3}",
+                        "job_family": family, "job_level": 4 if m == 0 else rng.randint(2, 3),
+                        "hired": team_hired, "bundles": (team_bundle, sub_lob_bundle)
+                    })
+
+    n_grants = 0
+    for i, emp in enumerate(employees):
+        hire = emp.get("hired", date(2008, 1, 1)) + timedelta(days=rng.randint(0, 300))
+        role_start = hire + timedelta(days=rng.randint(0, 300))
+        _insert(conn, "employees", {
+            "id": emp["id"], "employee_number": f"E{10001 + i}",
+            "email": f"{emp['id']}@example.com", "full_name": f"Employee {i}",
+            "first_name": "Employee", "last_name": str(i), "team_id": emp["team_id"],
+            "manager_id": emp["manager_id"], "location_id": emp.get("location_id", "loc_0"),
+            "cost_center_id": f"cc_{emp['team_id']}",
+            "job_title": f"{emp['job_family']} L{emp['job_level']}",
+            "job_code": f"{emp['job_family'][:3].upper()}-{emp['job_level']}",
+            "job_family": emp["job_family"], "job_level": emp["job_level"],
+            "employment_type": "FTE" if rng.random() < 0.8 else "Contractor",
+            "hire_date": hire.isoformat(), "role_start_date": role_start.isoformat(),
+            # One leaver, whose grants every analysis must ignore
+            "status": "Terminated" if i == 17 else "Active"
+        })
+
+        team_bundle, sub_lob_bundle = emp.get("bundles", (rng.sample(resources, 4), []))
+        held = [r for r in team_bundle if rng.random() < 0.95]
+        held += [r for r in sub_lob_bundle if rng.random() < 0.8 and r not in held]
+        held += [r for r in rng.sample(resources, rng.choice((0, 0, 1, 2))) if r not in held]
+        for res_id in held:
+            grant_id = f"grant_{n_grants:04d}"
+            n_grants += 1
+            _insert(conn, "access_grants", {
+                "id": grant_id, "employee_id": emp["id"], "resource_id": res_id,
+                "granted_date": (role_start + timedelta(days=rng.randint(0, 60))).isoformat(),
+                "grant_type": "Standard"
+            })
+            if rng.random() < 0.8:
+                total = rng.choice((0, rng.randint(1, 40), rng.randint(40, 600), rng.randint(40, 600)))
+                _insert(conn, "activity_summaries", {
+                    "id": f"act_{grant_id}", "employee_id": emp["id"], "resource_id": res_id,
+                    "access_grant_id": grant_id, "total_access_count": total,
+                    "access_count_7d": min(total, rng.randint(0, 10)),
+                    "access_count_30d": min(total, rng.randint(0, 120)),
+                    "access_count_90d": min(total, rng.randint(0, 300)),
+                    "days_since_grant": rng.randint(60, 2000),
+                    "days_since_last_use": rng.choice((rng.randint(0, 30), rng.randint(0, 500))) if total else None
+                })
+
+    conn.commit()
+    conn.close()
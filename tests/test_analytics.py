@@ -0,0 +1,134 @@
+"""
+Analytics Regression Tests for ARAS
+===================================
+
+Runs the analytics pipeline on the deterministic fixture database from
+fixture_db.py and compares proximity, clustering, consensus and
+assurance output with tests/analytics_baseline.json, which holds the
+results of the original float64, pure-Python implementation on the same
+database. Clustering partitions are compared up to relabeling.
+
+Author: Chiradeep Chhaya
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.metrics import adjusted_rand_score, silhouette_score
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from analytics.clustering import ClusteringConfig, ClusteringStrategy, _cluster_mean_silhouette
+from analytics.engine import AnalyticsEngine
+from fixture_db import build_fixture_db
+
+BASELINE_PATH = Path(__file__).resolve().parent / "analytics_baseline.json"
+
+# DBSCAN's defaults label every point noise on a database this small
+CLUSTERING_CONFIG = dict(dbscan_eps=0.4, dbscan_min_samples=3)
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("analytics") / "fixture.db"
+    build_fixture_db(str(db_path))
+    config = ClusteringConfig(parallel_strategies=False, **CLUSTERING_CONFIG)
+    engine = AnalyticsEngine(str(db_path), clustering_config=config)
+    engine.load_data()
+    yield engine
+    engine.close()
+
+
+@pytest.fixture(scope="module")
+def result(engine):
+    return engine.run_analysis()
+
+
+def test_proximity_matches_baseline(engine, baseline):
+    employees, access_grants, activity_summaries = engine.load_scoped_data()
+    employee_ids = [e["id"] for e in employees]
+    assert employee_ids == baseline["employee_ids"]
+
+    features = engine.proximity_calculator.extract_features(
+        employees=employees,
+        access_grants=access_grants,
+        activity_summaries=list(activity_summaries.values()),
+        teams=engine._teams,
+        sub_lobs=engine._sub_lobs
+    )
+    matrix = engine.proximity_calculator.calculate_pairwise_proximity_matrix(
+        employee_ids=employee_ids,
+        features=features,
+        block_by_lob=True
+    )
+
+    np.testing.assert_allclose(matrix, np.array(baseline["proximity"]), atol=2e-6)
+
+
+@pytest.mark.parametrize("strategy", list(ClusteringStrategy), ids=lambda s: s.value)
+def test_clustering_matches_baseline(result, baseline, strategy):
+    employee_ids = baseline["employee_ids"]
+    assignments = result.cluster_assignments[strategy]
+
+    labels = [int(assignments[e].cluster_id) for e in employee_ids]
+
+    assert adjusted_rand_score(baseline["clusters"][strategy.value], labels) == 1.0
+
+
+def test_consensus_matches_baseline(result, baseline):
+    expected = baseline["consensus"]
+    assert sorted(result.consensus_results) == sorted(expected)
+
+    for employee_id, consensus in result.consensus_results.items():
+        assert consensus.consensus_score == pytest.approx(expected[employee_id]["consensus_score"], abs=1e-6)
+        assert consensus.peer_count == expected[employee_id]["peer_count"]
+        assert consensus.needs_human_review == expected[employee_id]["needs_human_review"]
+
+
+def test_assurance_matches_baseline(result, baseline):
+    expected = baseline["assurance"]
+    assert sorted(result.assurance_scores) == sorted(expected)
+
+    for grant_id, score in result.assurance_scores.items():
+        assert score.overall_score == pytest.approx(expected[grant_id]["overall_score"], abs=1e-4)
+        assert score.classification == expected[grant_id]["classification"]
+        assert score.auto_certify_eligible == expected[grant_id]["auto_certify_eligible"]
+    assert result.total_grants == len(expected)
+
+
+@pytest.mark.parametrize("strategy", ["kmeans", "hierarchical"])
+def test_float32_silhouette_parity(baseline, strategy):
+    """Silhouette on the float32 distance matrix agrees with float64 to 1e-4."""
+    distance = 1 - np.array(baseline["proximity"])
+    labels = np.array(baseline["clusters"][strategy])
+
+    expected = silhouette_score(distance, labels, metric="precomputed")
+
+    assert _cluster_mean_silhouette(distance.astype(np.float32), labels) == pytest.approx(expected, abs=1e-4)
+
+
+def test_proximity_cache_keeps_newest_entries(tmp_path):
+    cache_dir = tmp_path / "proximity_cache"
+    engine = AnalyticsEngine(
+        str(tmp_path / "unused.db"),
+        proximity_cache_dir=str(cache_dir),
+        proximity_cache_max_entries=2
+    )
+    ids = ["emp_0", "emp_1"]
+    for i, key in enumerate(["a", "b", "c"]):
+        engine._save_cached_proximity(key, ids, np.eye(2, dtype=np.float32))
+        os.utime(cache_dir / f"{key}.npy", (i, i))
+    engine._prune_proximity_cache()
+
+    assert sorted(p.name for p in cache_dir.iterdir()) == ["b.json", "b.npy", "c.json", "c.npy"]
+    assert engine._load_cached_proximity("c", ids) is not None
@@ -7,28 +7,147 @@ Tests for the REST API endpoints.
 Author: Chiradeep Chhaya
 """
 
+import httpx
 import pytest
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import time
+import uuid
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# Issue the workflow's independent reads concurrently; set False to step
+# through them one at a time when debugging
+PARALLELIZE_WORKFLOW = True
+
+WEIGHT_NAMES = ("structural", "functional", "behavioral", "temporal")
+
+# Due date for every campaign the tests create, computed once per process
+DUE_DATE = (datetime.now() + timedelta(days=30)).isoformat()
+
+# Transient server failures retried for idempotent methods; never POST, which
+# could create a campaign twice
+RETRIES = 3
+RETRY_BACKOFF = 0.1  # seconds, doubled after each attempt
+RETRY_STATUSES = frozenset({502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD", "PUT"})
+
+# xdist group for everything that runs or depends on the server's analytics
+# cache. Session fixtures run once per xdist worker, so keeping the warm-up
+# and the campaign writes that bump stats_version on one worker means one
+# unfiltered analytics run per test run, not one per worker
+ANALYTICS_GROUP = "analytics"
+
+
+class RetryTransport(httpx.HTTPTransport):
+    """HTTP transport that retries idempotent requests answered with RETRY_STATUSES."""
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = super().handle_request(request)
+        if request.method not in RETRY_METHODS:
+            return response
+        for attempt in range(RETRIES):
+            if response.status_code not in RETRY_STATUSES:
+                break
+            response.close()
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+            response = super().handle_request(request)
+        return response
+
+
+def make_session() -> httpx.Client:
+    """
+    HTTP client for BASE_URL that keeps connections alive between calls.
+
+    No timeout, since analytics runs take tens of seconds. uvicorn serves
+    HTTP/1.1 only, so connections are pooled rather than multiplexed.
+    Connection failures are retried for every method (nothing was sent),
+    and 502/503/504 answers for idempotent ones.
+    """
+    return httpx.Client(
+        base_url=BASE_URL,
+        timeout=None,
+        transport=RetryTransport(
+            retries=RETRIES,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        )
+    )
+
+
+def new_campaign_data() -> dict:
+    """Campaign creation data with a unique name."""
+    return {
+        "name": f"Test Campaign {uuid.uuid4().hex[:8]}",
+        "scope_type": "manager",
+        "scope_filter": {"lob": "Technology"},
+        "auto_approve_threshold": 80.0,
+        "review_threshold": 50.0,
+        "due_date": DUE_DATE
+    }
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Shared keep-alive session for every test."""
+    session = make_session()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def system_status(client):
+    """Response of one /api/status call, shared by the tests that inspect it."""
+    return client.get("/api/status")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def backend_ready(system_status):
+    """Check once, before any test, that the server is up with employee data loaded."""
+    assert system_status.status_code == 200
+    assert system_status.json()["statistics"]["employees"] > 0
+
+
+@pytest.fixture(scope="session")
+def analytics_warm(client):
+    """
+    Response of one unfiltered analytics run.
+
+    Runs the pipeline once per xdist worker (only tests in ANALYTICS_GROUP
+    use it, so once per run), which also loads the server's analytics
+    engine and proximity caches before campaign activation.
+    """
+    return client.post("/api/analytics/run")
+
+
+@pytest.fixture(scope="session")
+def shared_campaign(client):
+    """
+    Id of one draft campaign for tests that only read it.
+
+    Created once per xdist worker; only ANALYTICS_GROUP tests use it, so its
+    insert lands before the analytics warm-up on the same worker.
+    """
+    resp = client.post("/api/campaigns", json=new_campaign_data())
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
 
 class TestHealthEndpoints:
     """Test health and status endpoints."""
 
-    def test_health(self):
+    @pytest.mark.smoke
+    def test_health(self, client):
         """Test health endpoint."""
-        resp = requests.get(f"{BASE_URL}/api/health")
+        resp = client.get("/api/health")
         assert resp.status_code == 200
         data = resp.json()
         assert data["status"] == "healthy"
         assert "timestamp" in data
 
-    def test_status(self):
+    @pytest.mark.smoke
+    def test_status(self, system_status):
         """Test status endpoint."""
-        resp = requests.get(f"{BASE_URL}/api/status")
+        resp = system_status
         assert resp.status_code == 200
         data = resp.json()
         assert data["status"] == "operational"
@@ -36,12 +155,15 @@ class TestHealthEndpoints:
         assert data["statistics"]["employees"] > 0
 
 
+# Weight updates change global state other weights tests read, so these run
+# on one xdist worker; each update restores the weights afterwards
+@pytest.mark.xdist_group("weights")
 class TestWeightsEndpoints:
     """Test proximity weights endpoints."""
 
-    def test_get_weights(self):
+    def test_get_weights(self, client):
         """Test getting current weights."""
-        resp = requests.get(f"{BASE_URL}/api/weights")
+        resp = client.get("/api/weights")
         assert resp.status_code == 200
         data = resp.json()
         assert "structural" in data
@@ -52,50 +174,42 @@ class TestWeightsEndpoints:
         total = data["structural"] + data["functional"] + data["behavioral"] + data["temporal"]
         assert abs(total - 1.0) < 0.01
 
-    def test_update_weights(self):
-        """Test updating weights."""
-        new_weights = {
-            "structural": 0.20,
-            "functional": 0.40,
-            "behavioral": 0.30,
-            "temporal": 0.10
-        }
-        resp = requests.put(f"{BASE_URL}/api/weights", json=new_weights)
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["structural"] == 0.20
-        assert data["functional"] == 0.40
-
-    def test_invalid_weights(self):
-        """Test that invalid weights are rejected."""
-        bad_weights = {
-            "structural": 0.50,
-            "functional": 0.50,
-            "behavioral": 0.50,
-            "temporal": 0.50
-        }
-        resp = requests.put(f"{BASE_URL}/api/weights", json=bad_weights)
-        assert resp.status_code == 400
-
-
+    @pytest.fixture
+    def restore_weights(self, client):
+        """Put the weights back as they were once the test is done."""
+        data = client.get("/api/weights").json()
+        original = {name: data[name] for name in WEIGHT_NAMES}
+        yield
+        client.put("/api/weights", json=original)
+
+    @pytest.mark.parametrize("payload,expected_status", [
+        ({"structural": 0.20, "functional": 0.40, "behavioral": 0.30, "temporal": 0.10}, 200),
+        ({"structural": 0.50, "functional": 0.50, "behavioral": 0.50, "temporal": 0.50}, 400),
+        ({"structural": 0.25, "functional": 0.25, "behavioral": 0.25, "temporal": 0.25}, 200),
+    ])
+    def test_update_weights(self, client, restore_weights, payload, expected_status):
+        """Test updating weights, and that weights not summing to 1 are rejected."""
+        resp = client.put("/api/weights", json=payload)
+        assert resp.status_code == expected_status
+        if expected_status == 200:
+            data = resp.json()
+            for name in WEIGHT_NAMES:
+                assert data[name] == payload[name]
+            assert abs(sum(data[name] for name in WEIGHT_NAMES) - 1.0) < 0.01
+
+
+@pytest.mark.xdist_group(ANALYTICS_GROUP)
 class TestCampaignEndpoints:
     """Test campaign endpoints."""
 
     @pytest.fixture
     def campaign_data(self):
-        """Campaign creation data."""
-        return {
-            "name": f"Test Campaign {datetime.now().isoformat()}",
-            "scope_type": "manager",
-            "scope_filter": {"lob": "Technology"},
-            "auto_approve_threshold": 80.0,
-            "review_threshold": 50.0,
-            "due_date": (datetime.now() + timedelta(days=30)).isoformat()
-        }
+        """Campaign creation data for tests that create their own campaign."""
+        return new_campaign_data()
 
-    def test_create_campaign(self, campaign_data):
+    def test_create_campaign(self, client, campaign_data):
         """Test campaign creation."""
-        resp = requests.post(f"{BASE_URL}/api/campaigns", json=campaign_data)
+        resp = client.post("/api/campaigns", json=campaign_data)
         assert resp.status_code == 201
         data = resp.json()
         assert data["name"] == campaign_data["name"]
@@ -103,80 +217,71 @@ class TestCampaignEndpoints:
         assert "id" in data
         return data["id"]
 
-    def test_list_campaigns(self, campaign_data):
+    def test_list_campaigns(self, client, shared_campaign):
         """Test listing campaigns."""
-        # Create a campaign first
-        requests.post(f"{BASE_URL}/api/campaigns", json=campaign_data)
-
-        resp = requests.get(f"{BASE_URL}/api/campaigns")
+        resp = client.get("/api/campaigns")
         assert resp.status_code == 200
         data = resp.json()
         assert isinstance(data, list)
         assert len(data) > 0
 
-    def test_get_campaign(self, campaign_data):
+    def test_get_campaign(self, client, shared_campaign):
         """Test getting campaign details."""
-        # Create campaign
-        create_resp = requests.post(f"{BASE_URL}/api/campaigns", json=campaign_data)
-        campaign_id = create_resp.json()["id"]
-
-        # Get campaign
-        resp = requests.get(f"{BASE_URL}/api/campaigns/{campaign_id}")
+        resp = client.get(f"/api/campaigns/{shared_campaign}")
         assert resp.status_code == 200
         data = resp.json()
         assert "campaign" in data
-        assert data["campaign"]["id"] == campaign_id
+        assert data["campaign"]["id"] == shared_campaign
         assert "total_items" in data
 
-    def test_update_campaign(self, campaign_data):
+    def test_update_campaign(self, client, campaign_data):
         """Test updating campaign."""
         # Create campaign
-        create_resp = requests.post(f"{BASE_URL}/api/campaigns", json=campaign_data)
+        create_resp = client.post("/api/campaigns", json=campaign_data)
         campaign_id = create_resp.json()["id"]
 
         # Update
         update_data = {"name": "Updated Campaign Name"}
-        resp = requests.patch(f"{BASE_URL}/api/campaigns/{campaign_id}", json=update_data)
+        resp = client.patch(f"/api/campaigns/{campaign_id}", json=update_data)
         assert resp.status_code == 200
         data = resp.json()
         assert data["name"] == "Updated Campaign Name"
 
-    def test_campaign_not_found(self):
+    def test_campaign_not_found(self, client):
         """Test 404 for non-existent campaign."""
-        resp = requests.get(f"{BASE_URL}/api/campaigns/nonexistent-id")
+        resp = client.get("/api/campaigns/nonexistent-id")
         assert resp.status_code == 404
 
 
 class TestEmployeeEndpoints:
     """Test employee endpoints."""
 
-    def test_get_employee(self):
+    def test_get_employee(self, client):
         """Test getting employee details."""
-        # First get an employee ID from the database
-        status_resp = requests.get(f"{BASE_URL}/api/status")
-        assert status_resp.json()["statistics"]["employees"] > 0
-
-        # We'll need to get an actual employee ID
-        # For now, test 404 case
-        resp = requests.get(f"{BASE_URL}/api/employees/nonexistent")
+        # backend_ready has checked there are employees; /api/status doesn't
+        # expose an id, so for now test the 404 case
+        resp = client.get("/api/employees/nonexistent")
         assert resp.status_code == 404
 
 
+@pytest.mark.xdist_group(ANALYTICS_GROUP)
 class TestAnalyticsEndpoints:
     """Test analytics endpoints."""
 
-    def test_run_analytics(self):
+    @pytest.mark.slow
+    def test_run_analytics(self, analytics_warm):
         """Test running analytics."""
-        resp = requests.post(f"{BASE_URL}/api/analytics/run")
+        resp = analytics_warm
         assert resp.status_code == 200
         data = resp.json()
         assert "data" in data
         assert "employees_analyzed" in data["data"]
         assert data["data"]["employees_analyzed"] > 0
 
-    def test_run_analytics_with_filter(self):
+    @pytest.mark.slow
+    def test_run_analytics_with_filter(self, client):
         """Test running analytics with LOB filter."""
-        resp = requests.post(f"{BASE_URL}/api/analytics/run?lob=Technology")
+        resp = client.post("/api/analytics/run?lob=Technology")
         assert resp.status_code == 200
         data = resp.json()
         assert data["data"]["lob_filter"] == "Technology"
@@ -185,9 +290,9 @@ class TestAnalyticsEndpoints:
 class TestAuditEndpoints:
     """Test audit endpoints."""
 
-    def test_list_audit_records(self):
+    def test_list_audit_records(self, client):
         """Test listing audit records."""
-        resp = requests.get(f"{BASE_URL}/api/audit")
+        resp = client.get("/api/audit")
         assert resp.status_code == 200
         data = resp.json()
         assert "items" in data
@@ -198,77 +303,76 @@ class TestAuditEndpoints:
 class TestGraduationEndpoints:
     """Test graduation status endpoints."""
 
-    def test_list_graduation_status(self):
+    def test_list_graduation_status(self, client):
         """Test listing graduation statuses."""
-        resp = requests.get(f"{BASE_URL}/api/graduation-status")
+        resp = client.get("/api/graduation-status")
         assert resp.status_code == 200
         data = resp.json()
         assert isinstance(data, list)
 
 
 # Integration test
+@pytest.mark.xdist_group(ANALYTICS_GROUP)
 class TestCampaignWorkflow:
     """Test full campaign workflow."""
 
-    def test_full_workflow(self):
+    @pytest.mark.slow
+    @pytest.mark.smoke
+    def test_full_workflow(self, client, analytics_warm):
         """Test complete campaign workflow: create -> activate -> review."""
         # 1. Create campaign
         campaign_data = {
-            "name": f"Integration Test {datetime.now().isoformat()}",
+            "name": f"Integration Test {uuid.uuid4().hex[:8]}",
             "scope_type": "lob",
             "scope_filter": {"lob": "Technology"},
             "auto_approve_threshold": 80.0,
             "review_threshold": 50.0,
-            "due_date": (datetime.now() + timedelta(days=30)).isoformat()
+            "due_date": DUE_DATE
         }
 
-        create_resp = requests.post(f"{BASE_URL}/api/campaigns", json=campaign_data)
+        create_resp = client.post("/api/campaigns", json=campaign_data)
         assert create_resp.status_code == 201
         campaign_id = create_resp.json()["id"]
         print(f"Created campaign: {campaign_id}")
 
         # 2. Verify it's in draft status
-        get_resp = requests.get(f"{BASE_URL}/api/campaigns/{campaign_id}")
+        get_resp = client.get(f"/api/campaigns/{campaign_id}")
         assert get_resp.json()["campaign"]["status"] == "Draft"
 
         # 3. Activate campaign (this runs analytics)
         print("Activating campaign (running analytics)...")
-        activate_resp = requests.post(f"{BASE_URL}/api/campaigns/{campaign_id}/activate")
+        activate_resp = client.post(f"/api/campaigns/{campaign_id}/activate")
         assert activate_resp.status_code == 200
         data = activate_resp.json()
         assert data["campaign"]["status"] == "Active"
         assert data["total_items"] > 0
         print(f"Campaign activated with {data['total_items']} review items")
 
-        # 4. List review items
-        items_resp = requests.get(f"{BASE_URL}/api/campaigns/{campaign_id}/review-items")
+        # 4 and 5. List review items and get campaign progress; independent
+        # reads, so issued together
+        items_url = f"/api/campaigns/{campaign_id}/review-items"
+        progress_url = f"/api/campaigns/{campaign_id}/progress"
+        if PARALLELIZE_WORKFLOW:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                items_future = executor.submit(client.get, items_url)
+                progress_future = executor.submit(client.get, progress_url)
+                items_resp = items_future.result()
+                progress_resp = progress_future.result()
+        else:
+            items_resp = client.get(items_url)
+            progress_resp = client.get(progress_url)
+
         assert items_resp.status_code == 200
         items_data = items_resp.json()
         assert items_data["total"] > 0
         print(f"Found {items_data['total']} review items")
 
-        # 5. Get campaign progress
-        progress_resp = requests.get(f"{BASE_URL}/api/campaigns/{campaign_id}/progress")
         assert progress_resp.status_code == 200
 
         print("Full workflow test passed!")
 
 
 if __name__ == "__main__":
-    # Run quick smoke test
-    print("Running API smoke tests...")
-
-    # Health check
-    resp = requests.get(f"{BASE_URL}/api/health")
-    print(f"Health: {resp.json()}")
-
-    # Status
-    resp = requests.get(f"{BASE_URL}/api/status")
-    print(f"Status: {resp.json()}")
-
-    # Run full workflow test
-    print("\n--- Running Full Workflow Test ---")
-    test = TestCampaignWorkflow()
-    test.test_full_workflow()
-
-    print("\nAll smoke tests passed!")
+    # Run the smoke subset; the workflow is also marked slow, hence --run-slow
+    import sys
+    sys.exit(pytest.main([__file__, "-m", "smoke", "--run-slow", "-q"]))
@@ -0,0 +1,78 @@
+"""
+Clustering Tests for ARAS
+=========================
+
+Checks the optimized k-means auto-k sweep against plain scikit-learn
+KMeans runs on a synthetic proximity matrix.
+
+Author: Chiradeep Chhaya
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from analytics.clustering import ClusteringConfig, MultiStrategyClusterer
+
+
+def label_inertia(distance_matrix: np.ndarray, labels: np.ndarray) -> float:
+    """Sum of squared distances from each row to its cluster's mean row."""
+    centers = np.vstack([
+        distance_matrix[labels == c].mean(axis=0) for c in range(labels.max() + 1)
+    ])
+    return float(((distance_matrix - centers[labels]) ** 2).sum())
+
+
+@pytest.fixture(scope="module")
+def proximity():
+    """Proximity matrix for 120 employees in ten overlapping groups."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(scale=1.2, size=(10, 16))
+    points = np.vstack([c + rng.normal(size=(12, 16)) for c in centers])
+    dist = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    return (1 - dist / dist.max()).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def baseline_sweep(proximity):
+    """Silhouette-selected k and per-k inertia from plain n_init=10 KMeans fits."""
+    distance = 1 - proximity.astype(np.float64)
+    inertia, silhouette = {}, {}
+    for k in range(2, len(distance) // 5 + 1):
+        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10).fit(distance)
+        inertia[k] = kmeans.inertia_
+        silhouette[k] = silhouette_score(distance, kmeans.labels_, metric="precomputed")
+    return max(silhouette, key=lambda k: (silhouette[k], -k)), inertia
+
+
+def test_kmeans_sweep_matches_restart_baseline(proximity, baseline_sweep):
+    """The default sweep picks the baseline k, with no worse a partition."""
+    best_k, inertia = baseline_sweep
+    ids = [f"emp_{i}" for i in range(len(proximity))]
+
+    result = MultiStrategyClusterer().cluster_kmeans(proximity, ids)
+
+    labels = result.cluster_id.astype(np.int64)
+    assert labels.max() + 1 == best_k
+    distance = 1 - proximity.astype(np.float64)
+    assert label_inertia(distance, labels) <= inertia[best_k] * (1 + 1e-4)
+
+
+@pytest.mark.parametrize("k_selection", ["silhouette", "knee"])
+def test_kmeans_sweep_inertia(proximity, baseline_sweep, k_selection):
+    """Whichever k is selected, its sweep fit is no looser than the restart baseline's."""
+    _, inertia = baseline_sweep
+    config = ClusteringConfig(kmeans_k_selection=k_selection)
+    ids = [f"emp_{i}" for i in range(len(proximity))]
+
+    result = MultiStrategyClusterer(config).cluster_kmeans(proximity, ids)
+
+    labels = result.cluster_id.astype(np.int64)
+    distance = 1 - proximity.astype(np.float64)
+    assert label_inertia(distance, labels) <= inertia[labels.max() + 1] * (1 + 1e-4)